@@ -0,0 +1,172 @@
+"""
+Admission control for the /analyze routes.
+
+Each worker runs at most ADMISSION_MAX_INFLIGHT analyses at once. Requests beyond that
+wait in a bounded per-lane queue; when the queue is full, or a request has waited
+ADMISSION_QUEUE_TIMEOUT seconds, it is refused at once with 429 and a Retry-After
+estimated from recent service times, before its body is read. Freed slots go to the
+interactive lane first; the batch lane may hold at most ADMISSION_BATCH_MAX_INFLIGHT
+slots, so a large batch never starves single uploads. A request that runs several
+analyses at once (an /analyze/batch upload) takes one slot per concurrent analysis.
+
+All state lives on the worker's event loop (the middleware in main.py), so nothing
+here needs a lock.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any
+
+from metrics import Counter
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+ADMISSION_MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "8"))
+ADMISSION_BATCH_MAX_INFLIGHT = int(os.getenv("ADMISSION_BATCH_MAX_INFLIGHT", "2"))
+ADMISSION_QUEUE_INTERACTIVE = int(os.getenv("ADMISSION_QUEUE_INTERACTIVE", "16"))
+ADMISSION_QUEUE_BATCH = int(os.getenv("ADMISSION_QUEUE_BATCH", "4"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+
+# Highest priority first.
+LANES = ("interactive", "batch")
+
+ADMISSION_REJECTIONS = Counter(
+    "resumeaix_admission_rejections_total",
+    "Requests refused with 429 by lane and reason (queue_full, timeout).",
+    ("lane", "reason"),
+)
+
+
+class Rejected(Exception):
+    """The request was not admitted; answer 429 with ``retry_after`` seconds."""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"{lane} lane {reason}")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_inflight: int = 8,
+        batch_max_inflight: int = 2,
+        queue_limits: dict[str, int] | None = None,
+        queue_timeout: float = 10.0,
+    ):
+        self.max_inflight = max(1, max_inflight)
+        self.lane_limits = {"interactive": self.max_inflight, "batch": max(1, min(batch_max_inflight, self.max_inflight))}
+        self.queue_limits = {"interactive": 16, "batch": 4, **(queue_limits or {})}
+        self.queue_timeout = queue_timeout
+        self._running = {lane: 0 for lane in LANES}
+        # Per lane, FIFO of (granted future, slots wanted).
+        self._waiters: dict[str, deque[tuple[asyncio.Future, int]]] = {lane: deque() for lane in LANES}
+        # Exponentially weighted mean of how long an admitted request holds its slot.
+        self._service_seconds = 1.0
+        self.stats = {
+            lane: {"admitted": 0, "queued": 0, "rejected": 0, "timeouts": 0, "max_queue": 0} for lane in LANES
+        }
+
+    def _has_slot(self, lane: str, slots: int = 1) -> bool:
+        return (
+            sum(self._running.values()) + slots <= self.max_inflight
+            and self._running[lane] + slots <= self.lane_limits[lane]
+        )
+
+    def slots_for(self, lane: str, wanted: int) -> int:
+        """How many slots a request wanting ``wanted`` concurrent analyses gets (at least 1)."""
+        return max(1, min(wanted, self.lane_limits[lane]))
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained (1..60)."""
+        backlog = sum(self._running.values()) + sum(len(q) for q in self._waiters.values())
+        return max(1, min(60, math.ceil(backlog * self._service_seconds / self.max_inflight)))
+
+    def _reject(self, lane: str, reason: str) -> Rejected:
+        self.stats[lane]["rejected"] += 1
+        if reason == "timeout":
+            self.stats[lane]["timeouts"] += 1
+        ADMISSION_REJECTIONS.inc(lane=lane, reason=reason)
+        return Rejected(lane, reason, self.retry_after())
+
+    async def acquire(self, lane: str, slots: int = 1) -> float:
+        """
+        Take ``slots`` slots in ``lane`` (see slots_for; waiting in its queue if needed);
+        returns when they were granted. Release them with the same ``slots``.
+        """
+        queue = self._waiters[lane]
+        if not queue and self._has_slot(lane, slots):
+            return self._grant(lane, slots)
+        if len(queue) >= self.queue_limits[lane]:
+            raise self._reject(lane, "queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, slots)
+        queue.append(entry)
+        self.stats[lane]["queued"] += 1
+        self.stats[lane]["max_queue"] = max(self.stats[lane]["max_queue"], len(queue))
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout or None)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return waiter.result()
+            queue.remove(entry)
+            waiter.cancel()
+            raise self._reject(lane, "timeout") from None
+        except asyncio.CancelledError:
+            # Client went away while queued: hand back slots granted in the meantime.
+            if waiter.done() and not waiter.cancelled():
+                self.release(lane, waiter.result(), slots)
+            elif entry in queue:
+                queue.remove(entry)
+                waiter.cancel()
+            raise
+
+    def _grant(self, lane: str, slots: int = 1) -> float:
+        self._running[lane] += slots
+        self.stats[lane]["admitted"] += 1
+        return time.monotonic()
+
+    def release(self, lane: str, granted_at: float, slots: int = 1) -> None:
+        self._running[lane] -= slots
+        self._service_seconds = 0.8 * self._service_seconds + 0.2 * (time.monotonic() - granted_at)
+        for next_lane in LANES:
+            queue = self._waiters[next_lane]
+            # In order: a request wanting several slots is not overtaken by smaller ones.
+            while queue and self._has_slot(next_lane, queue[0][1]):
+                waiter, wanted = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(self._grant(next_lane, wanted))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "max_inflight": self.max_inflight,
+            "queue_timeout_seconds": self.queue_timeout,
+            "service_seconds_avg": round(self._service_seconds, 3),
+            "retry_after": self.retry_after(),
+            "lanes": {
+                lane: {
+                    **self.stats[lane],
+                    "running": self._running[lane],
+                    "waiting": len(self._waiters[lane]),
+                    "max_running": self.lane_limits[lane],
+                    "queue_limit": self.queue_limits[lane],
+                }
+                for lane in LANES
+            },
+        }
+
+
+admission_controller = (
+    AdmissionController(
+        max_inflight=ADMISSION_MAX_INFLIGHT,
+        batch_max_inflight=ADMISSION_BATCH_MAX_INFLIGHT,
+        queue_limits={"interactive": ADMISSION_QUEUE_INTERACTIVE, "batch": ADMISSION_QUEUE_BATCH},
+        queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    )
+    if ADMISSION_ENABLED
+    else None
+)
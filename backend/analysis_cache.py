@@ -0,0 +1,151 @@
+"""
+Content-addressed cache for /analyze results.
+
+Entries are keyed by the SHA-256 of the uploaded bytes and of the normalized resume
+text, so a re-uploaded PDF (or a re-export with identical text) skips pdfminer,
+Gemini and JSearch. Tier 1 is an in-process LRU with TTL; tier 2 is an optional
+SQLite file (capped by entry count, oldest dropped first) that survives restarts.
+
+main.py does not store local fallback analyses (see main._cacheable).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "256"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+ANALYSIS_CACHE_DB = os.getenv("ANALYSIS_CACHE_DB", "").strip()
+ANALYSIS_CACHE_DB_SIZE = int(os.getenv("ANALYSIS_CACHE_DB_SIZE", "20000"))
+
+
+def bytes_key(data: bytes) -> str:
+    return "b:" + hashlib.sha256(data).hexdigest()
+
+
+def text_key(text: str) -> str:
+    return "t:" + hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class AnalysisCache:
+    """Two-tier (memory LRU + optional SQLite) cache of analysis payloads."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0, db_path: str = "", db_max_entries: int = 20000):
+        self.max_entries = max(1, max_entries)
+        self.db_max_entries = max(1, db_max_entries)
+        self.ttl = ttl
+        self._mem: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.db_path = db_path
+        self._db: sqlite3.Connection | None = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        if db_path:
+            self._connect()
+
+    def _connect(self) -> None:
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache "
+            "(key TEXT PRIMARY KEY, created REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS analysis_cache_created ON analysis_cache (created)")
+        self._db.commit()
+
+    def after_fork(self) -> None:
+        """Give a forked worker its own lock and SQLite connection (neither survives fork)."""
+        self._lock = threading.Lock()
+        if self.db_path:
+            self._connect()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl > 0 and (time.time() - created) > self.ttl
+
+    def _mem_put(self, key: str, created: float, value: dict[str, Any]) -> None:
+        self._mem[key] = (created, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get(self, *keys: str, count_miss: bool = True) -> dict[str, Any] | None:
+        """
+        Return the first live entry among ``keys`` (memory first, then disk). Pass
+        ``count_miss=False`` for a lookup the caller follows with another one for the
+        same request, so hits and misses are counted once per request.
+        """
+        with self._lock:
+            for key in keys:
+                item = self._mem.get(key)
+                if item is None:
+                    continue
+                created, value = item
+                if self._expired(created):
+                    del self._mem[key]
+                    continue
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+            if self._db is not None:
+                for key in keys:
+                    row = self._db.execute(
+                        "SELECT created, payload FROM analysis_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is None:
+                        continue
+                    created, payload = row
+                    if self._expired(created):
+                        self._db.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                        self._db.commit()
+                        continue
+                    value = json.loads(payload)
+                    self._mem_put(key, created, value)
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                    return value
+            if count_miss:
+                self.stats["misses"] += 1
+            return None
+
+    def set(self, value: dict[str, Any], *keys: str) -> None:
+        """Store ``value`` under every key in ``keys``."""
+        created = time.time()
+        with self._lock:
+            for key in keys:
+                self._mem_put(key, created, value)
+            if self._db is not None:
+                payload = json.dumps(value, ensure_ascii=False)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO analysis_cache (key, created, payload) VALUES (?, ?, ?)",
+                    [(key, created, payload) for key in keys],
+                )
+                (rows,) = self._db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()
+                if rows > self.db_max_entries:
+                    self._db.execute(
+                        "DELETE FROM analysis_cache WHERE key IN "
+                        "(SELECT key FROM analysis_cache ORDER BY created LIMIT ?)",
+                        (rows - self.db_max_entries,),
+                    )
+                self._db.commit()
+            self.stats["sets"] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._mem),
+                "max_entries": self.max_entries,
+                "db_max_entries": self.db_max_entries,
+                "ttl_seconds": self.ttl,
+                "disk_tier": self._db is not None,
+            }
+
+
+analysis_cache = AnalysisCache(ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_DB, ANALYSIS_CACHE_DB_SIZE)
@@ -0,0 +1,110 @@
+"""
+Load test: /analyze latency past saturation, with and without admission control.
+
+Requests arrive open-loop (at a fixed rate, whether or not earlier ones finished) for
+``--seconds`` at multiples of the worker's capacity (ADMISSION_MAX_INFLIGHT / stub
+Gemini latency). Without admission control the backlog grows and latency climbs for
+every request; with it, excess requests get a fast 429 + Retry-After and the p99 of the
+admitted ones stays near the queue bound. The analysis cache is bypassed so every
+request does the full pipeline.
+
+Usage (from backend/):  python benchmarks/bench_admission.py [--delay 0.2] [--seconds 4]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JOB_RERANK_ENABLED", "0")
+os.environ.setdefault("JOB_CACHE_DB", "")
+
+import httpx
+
+import main as app_main
+from admission import AdmissionController
+from corpus import make_text_pdf, synthetic_resume_text
+from stubs import install_gemini_stub
+
+
+async def offered_load(client: httpx.AsyncClient, pdfs: list[bytes], rate: float, seconds: float) -> dict:
+    latencies: list[float] = []
+    rejected: list[float] = []
+    retry_after: list[int] = []
+
+    async def one(i: int) -> None:
+        t0 = time.perf_counter()
+        r = await client.post("/analyze", files={"file": (f"load-{i}.pdf", pdfs[i % len(pdfs)], "application/pdf")})
+        elapsed = time.perf_counter() - t0
+        if r.status_code == 429:
+            rejected.append(elapsed)
+            retry_after.append(int(r.headers["retry-after"]))
+        else:
+            r.raise_for_status()
+            latencies.append(elapsed)
+
+    tasks = []
+    started = time.perf_counter()
+    for i in range(int(rate * seconds)):
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    ms = np.array(latencies) * 1000
+    return {
+        "ok": len(latencies),
+        "rejected": len(rejected),
+        "p50": float(np.percentile(ms, 50)) if len(ms) else 0.0,
+        "p99": float(np.percentile(ms, 99)) if len(ms) else 0.0,
+        "reject_ms": float(np.mean(rejected) * 1000) if rejected else 0.0,
+        "retry_after": max(retry_after, default=0),
+    }
+
+
+async def run(args) -> None:
+    install_gemini_stub(app_main, delay=args.delay)
+    app_main.analysis_cache.get = lambda *keys, **kwargs: None
+    pdfs = [make_text_pdf(synthetic_resume_text(seed, 20)) for seed in range(16)]
+    capacity = args.max_inflight / args.delay
+    print(
+        f"stub Gemini {args.delay * 1000:.0f} ms, max in flight {args.max_inflight}, "
+        f"queue {args.queue}, capacity ~{capacity:.0f} req/s, {args.seconds:g}s per step"
+    )
+    print(f"{'admission':<10} {'load':>5} {'req/s':>6} {'ok':>5} {'429':>5} {'p50_ms':>8} {'p99_ms':>8} {'429_ms':>7} {'retry':>5}")
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        for enabled in (False, True):
+            for multiple in args.loads:
+                app_main.admission_controller = (
+                    AdmissionController(args.max_inflight, 1, {"interactive": args.queue}, args.queue_timeout)
+                    if enabled
+                    else None
+                )
+                rate = capacity * multiple
+                r = await offered_load(client, pdfs, rate, args.seconds)
+                print(
+                    f"{'on' if enabled else 'off':<10} {multiple:>4g}x {rate:>6.0f} {r['ok']:>5} {r['rejected']:>5} "
+                    f"{r['p50']:>8.0f} {r['p99']:>8.0f} {r['reject_ms']:>7.1f} {r['retry_after']:>5}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=0.2, help="stub Gemini latency (s)")
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--max-inflight", type=int, default=8)
+    parser.add_argument("--queue", type=int, default=16)
+    parser.add_argument("--queue-timeout", type=float, default=10.0)
+    parser.add_argument("--loads", type=lambda s: [float(x) for x in s.split(",")], default=[0.5, 1, 2, 4])
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
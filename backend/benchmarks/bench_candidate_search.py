@@ -0,0 +1,116 @@
+"""
+Benchmark: /candidates search queries against a seeded collection (see seed_candidates.py).
+
+For each filter combination it times the first page and a deep page reached by following
+next_cursor, then checks explain(): the winning plan must be an index scan with no
+in-memory SORT, and documents examined must stay close to the page size. Keyset pages
+cost the same at page 1 and page 50; a skip() baseline shows what they replace.
+Needs a real mongod (mongomock has no query planner).
+
+Usage (from backend/):  python benchmarks/bench_candidate_search.py [--mongo-uri URI] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from database import COLLECTION_NAME, DB_NAME, MONGO_URI
+
+PAGE = 20
+DEEP_PAGES = 50
+
+
+def plan_stages(plan: dict) -> list[str]:
+    stages = [plan.get("stage", "")]
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages += plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+
+def check_plan(explain: dict) -> tuple[bool, int, int]:
+    """(uses index without in-memory sort, docs examined, returned) for one query."""
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    stats = explain.get("executionStats", {})
+    ok = "IXSCAN" in stages and "COLLSCAN" not in stages and "SORT" not in stages
+    return ok, stats.get("totalDocsExamined", -1), stats.get("nReturned", -1)
+
+
+def timed(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.95) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mongo-uri", default=MONGO_URI)
+    parser.add_argument("--db", default=DB_NAME)
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from pymongo import MongoClient
+
+    collection = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)[args.db][args.collection]
+    database.ensure_indexes(collection)
+    total = collection.estimated_document_count()
+    month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    cases = {
+        "newest": {},
+        "role": {"role": "Data Scientist"},
+        "skill": {"skills": ["kubernetes"]},
+        "skills+role": {"skills": ["python", "aws"], "role": "Backend Developer"},
+        "role+ats": {"role": "DevOps Engineer", "ats_min": 80, "ats_max": 95},
+        "skill+date": {"skills": ["react"], "uploaded_from": month_ago},
+    }
+    print(f"{total:,} stored candidates, page size {PAGE}\n")
+    print(f"{'query':<12} {'p1_p50':>7} {'p1_p95':>7} {f'p{DEEP_PAGES}_p50':>8} {'skip_p50':>9} {'examined':>9} {'plan':>5}")
+    failures = []
+    for name, filters in cases.items():
+        first = lambda: database.search_candidates(PAGE, target=collection, **filters)
+        p50, p95 = timed(first, args.repeat)
+
+        cursor = None
+        for _ in range(DEEP_PAGES - 1):
+            cursor = database.search_candidates(PAGE, target=collection, cursor=cursor, **filters)["next_cursor"]
+            if cursor is None:
+                break
+        deep = lambda: database.search_candidates(PAGE, target=collection, cursor=cursor, **filters)
+        deep_p50, _ = timed(deep, args.repeat)
+
+        query = database.build_candidate_query(**filters)
+        skip = lambda: list(
+            collection.find(query).sort([("created_at", -1), ("_id", -1)]).skip(PAGE * (DEEP_PAGES - 1)).limit(PAGE)
+        )
+        skip_p50, _ = timed(skip, max(3, args.repeat // 4))
+
+        ok, examined, returned = check_plan(
+            database.search_candidates(PAGE, target=collection, cursor=cursor, explain=True, **filters)
+        )
+        if not ok:
+            failures.append(name)
+        print(
+            f"{name:<12} {p50:>7.2f} {p95:>7.2f} {deep_p50:>8.2f} {skip_p50:>9.2f} "
+            f"{examined:>5}/{returned:<3} {'ok' if ok else 'BAD':>5}"
+        )
+    if failures:
+        print(f"\nexplain(): collection scan or in-memory sort for {failures}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
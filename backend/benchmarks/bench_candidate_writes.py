@@ -0,0 +1,123 @@
+"""
+Benchmark: per-document ``insert_one`` vs the buffered ``CandidateWriter`` (insert_many).
+
+Runs against a real mongod when ``--mongo-uri`` is given, otherwise against an
+in-process mongomock collection. ``--rtt-ms`` adds a simulated network round trip to
+every call on the mongomock collection, which is where batching pays off. Afterwards a
+small queue is filled faster than it drains to show backpressure and the shutdown flush.
+
+Usage (from backend/):  python benchmarks/bench_candidate_writes.py [--docs 5000] [--rtt-ms 1]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import CandidateWriter
+
+
+class RoundTripCollection:
+    """Wrap a collection so every insert call pays one simulated network round trip."""
+
+    def __init__(self, collection, rtt: float):
+        self.collection = collection
+        self.rtt = rtt
+
+    def insert_one(self, doc):
+        time.sleep(self.rtt)
+        return self.collection.insert_one(doc)
+
+    def insert_many(self, docs, ordered=True):
+        time.sleep(self.rtt)
+        return self.collection.insert_many(docs, ordered=ordered)
+
+    def count_documents(self, query):
+        return self.collection.count_documents(query)
+
+    def delete_many(self, query):
+        return self.collection.delete_many(query)
+
+
+def candidate(i: int) -> dict:
+    return {
+        "filename": f"resume_{i}.pdf",
+        "predicted_role": "Data Scientist" if i % 2 else "Backend Developer",
+        "ats_score": 40 + i % 60,
+        "skills": ["python", "sql", "docker", "aws"][: 1 + i % 4],
+    }
+
+
+def target_collection(args):
+    if args.mongo_uri:
+        from pymongo import MongoClient
+
+        collection = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)["bench_db"]["candidates"]
+    else:
+        import mongomock
+
+        collection = mongomock.MongoClient()["bench_db"]["candidates"]
+    return RoundTripCollection(collection, args.rtt_ms / 1000) if args.rtt_ms > 0 else collection
+
+
+def bench_insert_one(collection, n: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        collection.insert_one(candidate(i))
+    return time.perf_counter() - t0
+
+
+def bench_writer(collection, n: int, batch_size: int) -> tuple[float, float, dict]:
+    writer = CandidateWriter(lambda: collection, batch_size=batch_size, flush_seconds=0.05, max_queue=n + 1)
+    t0 = time.perf_counter()
+    for i in range(n):
+        writer.put(candidate(i))
+    accepted = time.perf_counter() - t0
+    writer.close()
+    return accepted, time.perf_counter() - t0, writer.snapshot()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated round trip (mongomock only)")
+    parser.add_argument("--mongo-uri", default="", help="benchmark a real mongod instead of mongomock")
+    args = parser.parse_args()
+    if args.mongo_uri:
+        args.rtt_ms = 0
+    collection = target_collection(args)
+    n = args.docs
+
+    collection.delete_many({})
+    one = bench_insert_one(collection, n)
+    print(f"{'path':<22} {'docs/s':>10} {'caller_ms/doc':>14} {'batches':>8}")
+    print(f"{'insert_one':<22} {n / one:>10,.0f} {one * 1000 / n:>14.3f} {n:>8}")
+    for batch_size in (10, 100, 500):
+        collection.delete_many({})
+        accepted, total, stats = bench_writer(collection, n, batch_size)
+        assert collection.count_documents({}) == n == stats["written"], stats
+        label = f"writer batch={batch_size}"
+        print(f"{label:<22} {n / total:>10,.0f} {accepted * 1000 / n:>14.3f} {stats['batches']:>8}")
+
+    # Backpressure: a 50-slot queue in front of a slow target; producers block instead
+    # of growing memory, and close() still writes everything that was accepted.
+    collection.delete_many({})
+    slow = RoundTripCollection(collection, 0.02)
+    writer = CandidateWriter(lambda: slow, batch_size=25, flush_seconds=0.05, max_queue=50, block_seconds=5)
+    t0 = time.perf_counter()
+    for i in range(500):
+        writer.put(candidate(i))
+    blocked = time.perf_counter() - t0
+    writer.close()
+    stats = writer.snapshot()
+    print(
+        f"\nbackpressure: 500 docs into a 50-slot queue, producer blocked {blocked:.2f}s, "
+        f"written={stats['written']} dropped={stats['dropped']} stored={collection.count_documents({})}"
+    )
+
+
+if __name__ == "__main__":
+    main()
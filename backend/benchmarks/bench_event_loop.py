@@ -0,0 +1,71 @@
+"""
+Benchmark: /health latency while N /analyze requests are in flight.
+
+Gemini is replaced by a stub that sleeps like a slow LLM round trip, so the numbers
+show whether the event loop stays free while pdfminer and the model call run.
+
+Usage (from backend/):  python benchmarks/bench_event_loop.py [--inflight 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+import main as app_main
+from corpus import make_text_pdf, synthetic_resume_text
+
+
+def _slow_gemini(resume_text: str, delay: float = 1.0):
+    time.sleep(delay)
+    return app_main.analyze_resume_fallback(resume_text)
+
+
+async def run(inflight: int, delay: float) -> None:
+    app_main.analyze_resume_with_gemini = lambda text: _slow_gemini(text, delay)
+    pdfs = [make_text_pdf(synthetic_resume_text(seed, 60)) for seed in range(inflight)]
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def analyze(i: int):
+            files = {"file": (f"bench-{i}.pdf", pdfs[i], "application/pdf")}
+            r = await client.post("/analyze", files=files)
+            r.raise_for_status()
+
+        t0 = time.perf_counter()
+        jobs = [asyncio.create_task(analyze(i)) for i in range(inflight)]
+        health_ms: list[float] = []
+        while not all(j.done() for j in jobs):
+            h0 = time.perf_counter()
+            r = await client.get("/health")
+            r.raise_for_status()
+            health_ms.append((time.perf_counter() - h0) * 1000)
+            await asyncio.sleep(0.02)
+        await asyncio.gather(*jobs)
+        wall = time.perf_counter() - t0
+
+    health_ms.sort()
+    p99 = health_ms[min(len(health_ms) - 1, int(len(health_ms) * 0.99))]
+    print(f"{inflight} analyses in flight, stub Gemini {delay:.1f}s, wall {wall:.2f}s")
+    print(
+        f"/health samples={len(health_ms)} median={statistics.median(health_ms):.2f}ms "
+        f"p99={p99:.2f}ms max={health_ms[-1]:.2f}ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--inflight", type=int, default=20)
+    ap.add_argument("--delay", type=float, default=1.0, help="stub Gemini latency (s)")
+    args = ap.parse_args()
+    asyncio.run(run(args.inflight, args.delay))
+
+
+if __name__ == "__main__":
+    main()
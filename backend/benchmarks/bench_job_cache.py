@@ -0,0 +1,115 @@
+"""
+Benchmark: JSearch lookups with and without the stale-while-revalidate job cache.
+
+Requests follow a Zipf distribution over ``--roles`` role names (a few roles dominate,
+as in real traffic) against the local JSearch stub. Simulated time advances by
+``--interval`` seconds per lookup, so entries go stale and refresh in the background.
+Afterwards the upstream is made to fail to show listings still served from the cache, and
+a second cache opened on the same SQLite file shows a restart starting warm.
+
+Usage (from backend/):  python benchmarks/bench_job_cache.py [--lookups 10000] [--delay 0.05]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stubs import start_jsearch_stub
+
+
+class SimClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    ms = np.array(samples) * 1000
+    return float(np.percentile(ms, 50)), float(np.percentile(ms, 99)), float(ms.mean())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--zipf", type=float, default=1.2, help="Zipf exponent of role popularity")
+    parser.add_argument("--delay", type=float, default=0.05, help="stub latency per call (s)")
+    parser.add_argument("--interval", type=float, default=1.0, help="simulated seconds between lookups")
+    parser.add_argument("--ttl", type=float, default=600.0)
+    parser.add_argument("--max-stale", type=float, default=3600.0)
+    parser.add_argument("--baseline", type=int, default=200, help="uncached lookups to time")
+    args = parser.parse_args()
+    server = start_jsearch_stub(args.delay)
+
+    import main as app_main
+    from job_cache import JobListingCache
+
+    rng = np.random.default_rng(0)
+    weights = 1.0 / np.arange(1, args.roles + 1) ** args.zipf
+    picks = rng.choice(args.roles, size=args.lookups, p=weights / weights.sum())
+    roles = [f"Role {i}" for i in picks]
+
+    uncached = []
+    for role in roles[: args.baseline]:
+        t0 = time.perf_counter()
+        app_main._jsearch_request(role)
+        uncached.append(time.perf_counter() - t0)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "job_cache.sqlite3")
+    clock = SimClock()
+    refresher = ThreadPoolExecutor(max_workers=4)
+    cache = JobListingCache(args.ttl, args.max_stale, db_path=db_path, executor=refresher, clock=clock)
+    cached = []
+    for role in roles:
+        clock.now += args.interval
+        t0 = time.perf_counter()
+        jobs = cache.get(role, "India", lambda role=role: app_main._jsearch_request(role))
+        cached.append(time.perf_counter() - t0)
+        assert jobs
+    refresher.shutdown(wait=True)
+    stats = cache.snapshot()
+
+    base_p50, base_p99, base_mean = percentiles(uncached)
+    hit_p50, hit_p99, hit_mean = percentiles(cached)
+    print(
+        f"{args.lookups} lookups over {args.roles} roles (zipf {args.zipf}), stub {args.delay * 1000:.0f} ms, "
+        f"{args.interval:g}s apart, ttl {args.ttl:g}s, max stale {args.max_stale:g}s"
+    )
+    print(f"{'path':<10} {'p50_ms':>8} {'p99_ms':>8} {'mean_ms':>8}")
+    print(f"{'uncached':<10} {base_p50:>8.2f} {base_p99:>8.2f} {base_mean:>8.2f}")
+    print(f"{'cached':<10} {hit_p50:>8.2f} {hit_p99:>8.2f} {hit_mean:>8.2f}")
+    print(
+        f"hit ratio {stats['hit_ratio']:.3f} (fresh {stats['hits']}, stale {stats['stale_hits']}, "
+        f"miss {stats['misses']}), background refreshes {stats['refreshes']}, "
+        f"p99 saved {base_p99 - hit_p99:.2f} ms"
+    )
+
+    # Upstream outage: every role seen so far is still answered, even past max stale.
+    server.shutdown()
+
+    def outage() -> list:
+        raise ConnectionError("JSearch unreachable")
+
+    clock.now += args.max_stale * 2
+    seen = sorted(set(roles))
+    served = sum(1 for role in seen if cache.get(role, "India", outage))
+    print(f"upstream down: {served}/{len(seen)} roles served from cache ({cache.snapshot()['fallbacks']} fallbacks)")
+
+    # Restart: a new process-level cache on the same file answers without the upstream.
+    restarted = JobListingCache(args.ttl, args.max_stale, db_path=db_path, clock=clock)
+    warm = sum(1 for role in seen if restarted.get(role, "India", outage))
+    print(f"restart: {warm}/{len(seen)} roles served, {restarted.snapshot()['disk_hits']} from SQLite")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: latency added by reranking job listings against a resume.
+
+Embeds N synthetic listings (default 100, spread over 5 roles) in one batch and
+scores them with one matrix product via matcher.rank_jobs. Needs the MiniLM model, or
+--random-weights: a randomly initialized model of the same shape (6 layers, 384 wide,
+12 heads, 256-token inputs) with a vocabulary built from the corpus. Encoding cost does
+not depend on the weights, so its timings stand in for the real model's where the
+weights cannot be downloaded; its scores are meaningless.
+
+Usage (from backend/):  python benchmarks/bench_job_rerank.py [--jobs 100] [--random-weights]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matcher
+from corpus import ROLES, SKILL_POOL, synthetic_resume_text
+
+
+def synthetic_jobs(n: int, roles: list[str], seed: int = 0) -> dict[str, list[dict]]:
+    rng = random.Random(seed)
+    grouped: dict[str, list[dict]] = {role: [] for role in roles}
+    for i in range(n):
+        role = roles[i % len(roles)]
+        stack = ", ".join(rng.sample(SKILL_POOL, 5))
+        grouped[role].append(
+            {
+                "employer_name": f"Company {i}",
+                "job_title": f"{rng.choice(['Junior', 'Senior', 'Lead'])} {role}",
+                "job_apply_link": f"https://example.com/{i}",
+                "location": "Bengaluru, IN",
+                "job_employment_type": "Full-time",
+                "job_description": f"We are hiring a {role} with {stack}. " * 8,
+            }
+        )
+    return grouped
+
+
+def random_minilm(words: set[str]):
+    """SentenceTransformer shaped like all-MiniLM-L6-v2, with random weights."""
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    chars = sorted({c for word in words for c in word})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *chars, *(f"##{c}" for c in chars), *sorted(words)]
+    vocab = list(dict.fromkeys(vocab))
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=384,
+        num_hidden_layers=6,
+        num_attention_heads=12,
+        intermediate_size=1536,
+        max_position_embeddings=512,
+    )
+    directory = tempfile.mkdtemp(prefix="bench-minilm-")
+    with open(os.path.join(directory, "vocab.txt"), "w", encoding="utf-8") as fh:
+        fh.write("\n".join(vocab))
+    BertTokenizerFast(os.path.join(directory, "vocab.txt"), do_lower_case=True).save_pretrained(directory)
+    BertModel(config).save_pretrained(directory)
+    encoder = models.Transformer(directory, max_seq_length=256)
+    pooling = models.Pooling(config.hidden_size, "mean")
+    return SentenceTransformer(modules=[encoder, pooling, models.Normalize()])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=100)
+    ap.add_argument("--requests", type=int, default=10)
+    ap.add_argument("--random-weights", action="store_true", help="time a same-shape model with random weights")
+    args = ap.parse_args()
+
+    roles = ROLES + ["Full Stack Developer"]
+    if args.random_weights:
+        texts = [synthetic_resume_text(i, 12) for i in range(args.requests)]
+        texts += [job["job_description"] for jobs in synthetic_jobs(args.jobs, roles).values() for job in jobs]
+        matcher._model = random_minilm({w for text in texts for w in re.findall(r"\w+", text.lower())})
+    matcher.embed_texts(["warmup"])
+    cold, warm = [], []
+    for i in range(args.requests):
+        resume = synthetic_resume_text(i, 12)
+        jobs = synthetic_jobs(args.jobs, roles, seed=i)
+        t0 = time.perf_counter()
+        matcher.rank_jobs(resume, jobs, top_k=5)
+        cold.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        matcher.rank_jobs(resume, jobs, top_k=5)
+        warm.append((time.perf_counter() - t0) * 1000)
+    model = "random-weight MiniLM shape" if args.random_weights else matcher.EMBEDDING_MODEL_NAME
+    print(f"{args.jobs} jobs/request over {len(roles)} roles, {args.requests} requests, {model}, {os.cpu_count()} CPU(s)")
+    print(f"new resume:    median {statistics.median(cold):.1f} ms  max {max(cold):.1f} ms")
+    print(f"cached resume: median {statistics.median(warm):.1f} ms  max {max(warm):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
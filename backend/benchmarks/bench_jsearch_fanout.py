@@ -0,0 +1,43 @@
+"""
+Benchmark: serial vs concurrent JSearch fan-out against a local stub server.
+
+Usage (from backend/):  python benchmarks/bench_jsearch_fanout.py [--delay 0.25]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stubs import start_jsearch_stub
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--delay", type=float, default=0.25, help="stub latency per call (s)")
+    args = ap.parse_args()
+    server = start_jsearch_stub(args.delay)
+
+    import main as app_main
+
+    print(f"stub latency {args.delay * 1000:.0f} ms per call")
+    print(f"{'roles':>5} {'serial_s':>9} {'fanout_s':>9} {'speedup':>8}")
+    for n in (1, 2, 5, 8):
+        roles = [f"Role {i}" for i in range(n)]
+        t0 = time.perf_counter()
+        for role in roles:
+            app_main.fetch_jsearch_jobs(role, 5)
+        serial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        grouped = app_main.fetch_jobs_for_roles(roles, 5)
+        fanout = time.perf_counter() - t0
+        assert all(len(v) == 5 for v in grouped.values())
+        print(f"{n:>5} {serial:>9.3f} {fanout:>9.3f} {serial / fanout:>7.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
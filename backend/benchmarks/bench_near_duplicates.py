@@ -0,0 +1,109 @@
+"""
+Benchmark: near-duplicate lookup latency in the MinHash/LSH index vs a linear scan.
+
+For each index size the index is filled with random signatures plus ``--planted`` real
+resume signatures. It is then queried with lightly edited copies of the planted resumes
+(which should match) and with unseen resumes (which should not). Filler signatures are
+random rather than computed from text, because hashing a million synthetic resumes would
+take minutes and time nothing the lookup does. The linear scan compares the query with
+every stored signature, which is what the index avoids.
+
+Usage (from backend/):  python benchmarks/bench_near_duplicates.py [--sizes 10000,100000,1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import synthetic_resume_text
+from near_duplicates import MINHASH_PERMUTATIONS, NEAR_DUP_THRESHOLD, LSHIndex, minhash_signature, shingles
+
+
+def edited(text: str, rng: random.Random, rate: float) -> str:
+    """Replace about ``rate`` of the words and append a line, like a re-exported resume."""
+    words = text.split(" ")
+    for i in rng.sample(range(len(words)), k=max(1, int(len(words) * rate))):
+        words[i] = rng.choice(["led", "shipped", "owned", "designed", "scaled"])
+    return " ".join(words) + "\nAvailable to join immediately."
+
+
+def timed(fn, queries) -> tuple[list, np.ndarray]:
+    results, ms = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        results.append(fn(query))
+        ms.append((time.perf_counter() - t0) * 1000)
+    return results, np.array(ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--planted", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--edit-rate", type=float, default=0.01, help="share of words changed in a near-duplicate")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    planted_texts = [synthetic_resume_text(seed, 12) for seed in range(args.planted)]
+    t0 = time.perf_counter()
+    planted = np.stack([minhash_signature(text) for text in planted_texts])
+    sig_ms = (time.perf_counter() - t0) * 1000 / args.planted
+    picks = rng.sample(range(args.planted), k=min(args.queries, args.planted))
+    near_texts = [edited(planted_texts[i], rng, args.edit_rate) for i in picks]
+    near = [minhash_signature(text) for text in near_texts]
+    # Recall counts only the edits whose true shingle Jaccard is at or above the threshold.
+    jaccard = []
+    for i, text in zip(picks, near_texts):
+        a, b = shingles(planted_texts[i]), shingles(text)
+        jaccard.append(len(a & b) / len(a | b))
+    qualified = [j >= NEAR_DUP_THRESHOLD for j in jaccard]
+    novel = [minhash_signature(synthetic_resume_text(10**6 + seed, 12)) for seed in range(args.queries)]
+    print(
+        f"{MINHASH_PERMUTATIONS} permutations, threshold {NEAR_DUP_THRESHOLD}, "
+        f"signature {sig_ms:.2f} ms per resume, {args.edit_rate:.0%} of words edited "
+        f"(true Jaccard median {np.median(jaccard):.3f}, {sum(qualified)}/{len(near)} at or above threshold)"
+    )
+    print(
+        f"{'stored':>9} {'build_s':>8} {'lsh_p50_ms':>10} {'lsh_p99_ms':>10} {'scan_p50_ms':>11} "
+        f"{'recall':>7} {'false_pos':>9} {'cands':>6}"
+    )
+
+    fill = np.random.default_rng(0)
+    for size in args.sizes:
+        filler = fill.integers(0, 2**32, size=(size - args.planted, MINHASH_PERMUTATIONS), dtype=np.uint64).astype(np.uint32)
+        index = LSHIndex()
+        t0 = time.perf_counter()
+        index.add_many([None] * len(filler), filler)
+        index.add_many(list(range(args.planted)), planted)
+        build = time.perf_counter() - t0
+        stored = np.concatenate([filler, planted])
+
+        hits, lsh_ms = timed(index.best_match, near + novel)
+        found = [hit is not None and hit[0] == i for hit, i in zip(hits[: len(near)], picks)]
+        recall = sum(f for f, q in zip(found, qualified) if q) / max(1, sum(qualified))
+        false_pos = sum(hit is not None for hit in hits[len(near) :]) / len(novel)
+        candidates = np.mean([len(index.candidates(q)) for q in near + novel])
+
+        def scan(query):
+            similarity = (stored == query).mean(axis=1)
+            best = int(np.argmax(similarity))
+            return best if similarity[best] >= NEAR_DUP_THRESHOLD else None
+
+        _, scan_ms = timed(scan, (near + novel)[:20])
+        print(
+            f"{size:>9,} {build:>8.1f} {np.percentile(lsh_ms, 50):>10.3f} {np.percentile(lsh_ms, 99):>10.3f} "
+            f"{np.percentile(scan_ms, 50):>11.2f} {recall:>7.2%} {false_pos:>9.2%} {candidates:>6.1f}"
+        )
+        del index, stored, filler
+
+
+if __name__ == "__main__":
+    main()
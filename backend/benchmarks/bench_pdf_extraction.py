@@ -0,0 +1,118 @@
+"""
+Benchmark: pdfminer's extract_text (the previous call) vs the pdf_extractor modes.
+
+Documents: a one-page resume, a two-column resume (sidebar drawn after the main column),
+a 4-page resume and a 40-page portfolio. Quality is measured against extract_text:
+skill recall (taxonomy skills found), token recall (multiset overlap) and reading
+order (difflib ratio over the first 3,000 characters). Capped modes are expected to
+lose tokens on long documents; that is the point of the cap. The last table runs the
+40-page document uncapped through main.extract_pdf_text_async: one worker call vs pages
+split across the process pool.
+
+Usage (from backend/):  python benchmarks/bench_pdf_extraction.py [--rounds 3]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import difflib
+import io
+import os
+import sys
+import textwrap
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfminer.high_level import extract_text as pdfminer_extract_text
+
+import pdf_extractor
+from skill_matcher import taxonomy_matcher, tokenize
+from corpus import SKILL_POOL, make_text_pdf, synthetic_resume_text
+
+
+def documents() -> dict[str, bytes]:
+    main_text = "\n".join(
+        "\n".join(textwrap.wrap(line, 65)) or "" for line in synthetic_resume_text(5, 12).splitlines()[7:]
+    )
+    sidebar = "\n".join(["CONTACT", "candidate5@example.com", "", "SKILLS", *SKILL_POOL[:12], "", "LANGUAGES", "English, Hindi"])
+    return {
+        "1-page": make_text_pdf(synthetic_resume_text(1, 4)),
+        "2-column": make_text_pdf(main_text, sidebar=sidebar),
+        "4-page": make_text_pdf(synthetic_resume_text(2, 96)),
+        "40-page": make_text_pdf(synthetic_resume_text(3, 996)),
+    }
+
+
+CONFIGS = {
+    "extract_text (before)": lambda data: pdfminer_extract_text(io.BytesIO(data)),
+    "full, uncapped": lambda data: pdf_extractor.extract_text(data, "full", 0, 0),
+    "fast, uncapped": lambda data: pdf_extractor.extract_text(data, "fast", 0, 0),
+    "none, uncapped": lambda data: pdf_extractor.extract_text(data, "none", 0, 0),
+    "fast, 10 pages/40k (default)": lambda data: pdf_extractor.extract_text(data, "fast", 10, 40_000),
+    "fast, 3 pages": lambda data: pdf_extractor.extract_text(data, "fast", 3, 0),
+}
+
+
+def quality(text: str, reference: str) -> tuple[float, float, float]:
+    matcher = taxonomy_matcher()
+    ref_skills = set(matcher.find(reference))
+    skill_recall = len(ref_skills & set(matcher.find(text))) / len(ref_skills) if ref_skills else 1.0
+    ref_tokens = Counter(tokenize(reference))
+    token_recall = sum((ref_tokens & Counter(tokenize(text))).values()) / max(1, sum(ref_tokens.values()))
+    order = difflib.SequenceMatcher(None, " ".join(text[:3000].split()), " ".join(reference[:3000].split())).ratio()
+    return skill_recall, token_recall, order
+
+
+def timed(fn, data: bytes, rounds: int) -> tuple[float, str]:
+    text = fn(data)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(data)
+    return (time.perf_counter() - t0) / rounds * 1000, text
+
+
+def parallel_table(data: bytes, rounds: int) -> None:
+    import main
+
+    pdf_extractor.PDF_MAX_PAGES = 0
+    pdf_extractor.PDF_TARGET_CHARS = 0
+
+    async def run() -> float:
+        await main.extract_pdf_text_async(data)
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            await main.extract_pdf_text_async(data)
+        return (time.perf_counter() - t0) / rounds * 1000
+
+    print(f"\n40-page, uncapped, {pdf_extractor.PDF_LAYOUT} layout, {main.PDF_PROCESS_WORKERS} pdf workers via extract_pdf_text_async")
+    for label, head_pages in (("one worker call", 0), (f"split after {pdf_extractor.PDF_PARALLEL_PAGES} pages", pdf_extractor.PDF_PARALLEL_PAGES)):
+        pdf_extractor.PDF_PARALLEL_PAGES = head_pages
+        print(f"  {label:<28} {asyncio.run(run()):>9.1f} ms")
+    main._shutdown_pools()
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="pdf process workers (default: PDF_PROCESS_WORKERS)")
+    args = parser.parse_args()
+    if args.workers:
+        import main
+
+        main.PDF_PROCESS_WORKERS = args.workers
+
+    for name, data in documents().items():
+        print(f"\n{name} ({len(data):,} bytes)")
+        print(f"  {'config':<30} {'ms':>9} {'speedup':>8} {'skills':>7} {'tokens':>7} {'order':>6}")
+        base_ms, reference = timed(CONFIGS["extract_text (before)"], data, args.rounds)
+        for label, fn in CONFIGS.items():
+            ms, text = (base_ms, reference) if label.startswith("extract_text") else timed(fn, data, args.rounds)
+            skills, tokens, order = quality(text, reference)
+            print(f"  {label:<30} {ms:>9.1f} {base_ms / ms:>7.1f}x {skills:>7.0%} {tokens:>7.0%} {order:>6.2f}")
+    parallel_table(documents()["40-page"], args.rounds)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,63 @@
+"""
+Benchmark: Gemini prompt size and latency, raw 28k-char cut vs section-aware compaction.
+
+A local stub stands in for Gemini; its latency grows with prompt tokens (fixed
+overhead + per-input-token cost), which is how hosted LLM prefill behaves.
+
+Usage (from backend/):  python benchmarks/bench_prompt_compaction.py [--budget 7000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_compactor import GEMINI_PROMPT_TOKEN_BUDGET, compact_resume_text, estimate_tokens
+from corpus import synthetic_paginated_resume
+
+STUB_BASE_S = 0.05
+STUB_PER_TOKEN_S = 20e-6
+
+
+def stub_model(prompt: str) -> str:
+    time.sleep(STUB_BASE_S + estimate_tokens(prompt) * STUB_PER_TOKEN_S)
+    return "{}"
+
+
+def timed(prompt: str) -> float:
+    t0 = time.perf_counter()
+    stub_model(prompt)
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget", type=int, default=GEMINI_PROMPT_TOKEN_BUDGET, help="token budget for compaction")
+    args = ap.parse_args()
+
+    corpus = [synthetic_paginated_resume(seed, pages) for seed, pages in enumerate([1, 2, 4, 8, 12, 16])]
+    print(f"{'pages':>5} {'raw_tok':>8} {'cut_tok':>8} {'new_tok':>8} {'cut_skills':>10} {'new_skills':>10}"
+          f" {'cut_ms':>7} {'new_ms':>7} {'compact_ms':>10}")
+    saved = []
+    for text, pages in zip(corpus, [1, 2, 4, 8, 12, 16]):
+        skills_line = text.rsplit("SKILLS\n", 1)[1].split("\n", 1)[0]
+        cut = text.strip()[:28000]
+        t0 = time.perf_counter()
+        new = compact_resume_text(text, args.budget)
+        compact_ms = (time.perf_counter() - t0) * 1000
+        cut_ms, new_ms = timed(cut), timed(new)
+        saved.append(1 - len(new) / len(cut))
+        print(
+            f"{pages:>5} {estimate_tokens(text):>8} {estimate_tokens(cut):>8} {estimate_tokens(new):>8} "
+            f"{str(skills_line in cut):>10} {str(skills_line in new):>10} "
+            f"{cut_ms:>7.1f} {new_ms:>7.1f} {compact_ms:>10.2f}"
+        )
+    print(f"median prompt reduction vs 28k cut: {statistics.median(saved) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: PDF report throughput for a single worker.
+
+Cold renders use a distinct analysis per report; warm requests repeat analyses that are
+already in the report cache. Both are measured in-process (render_pdf_report /
+cached_pdf_report) and through POST /report, where rendering runs on the I/O pool.
+
+Usage (from backend/):  python benchmarks/bench_report.py [--reports 300] [--concurrency 8]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+import main
+import report_generator
+from corpus import synthetic_resume_text
+
+
+def analyses(n: int, offset: int = 0) -> list[dict]:
+    out = []
+    for i in range(n):
+        ai = main.analyze_resume_fallback(synthetic_resume_text(i % 50))
+        out.append({**main._summarize_ai(ai), "filename": f"resume-{offset + i}.pdf"})
+    return out
+
+
+def rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:>9,.0f}/s  ({seconds * 1000 / n:.2f} ms/report)"
+
+
+async def post_all(payloads: list[dict], concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    slots = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(payload: dict) -> None:
+            async with slots:
+                r = await client.post("/report", json=payload)
+                r.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(p) for p in payloads))
+        return time.perf_counter() - t0
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    n = args.reports
+
+    cold = analyses(n)
+    report_generator.render_pdf_report(cold[0])
+    t0 = time.perf_counter()
+    for payload in cold:
+        report_generator.render_pdf_report(payload)
+    print(f"render_pdf_report (cold)      {rate(n, time.perf_counter() - t0)}")
+
+    for payload in cold:
+        report_generator.cached_pdf_report(payload)
+    t0 = time.perf_counter()
+    for payload in cold:
+        report_generator.cached_pdf_report(payload)
+    print(f"cached_pdf_report (warm)      {rate(n, time.perf_counter() - t0)}")
+
+    fresh = analyses(n, offset=n)
+    print(f"POST /report cold, c={args.concurrency:<3}     {rate(n, asyncio.run(post_all(fresh, args.concurrency)))}")
+    print(f"POST /report warm, c={args.concurrency:<3}     {rate(n, asyncio.run(post_all(fresh, args.concurrency)))}")
+    print(report_generator.report_cache.snapshot())
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,67 @@
+"""
+Benchmark: bulk re-scoring from stored text vs re-parsing every PDF, in resumes/s.
+
+- reparse: pdf_extractor.extract_text on each resume PDF, then score_resumes (what a
+  re-upload would have to redo before any scoring).
+- stored text: score_resumes on the saved resume_text, inline and in a process pool
+  of --workers (the same split rescore_candidates.rescore uses).
+MongoDB reads and bulk writes are not included; they are the same for both paths.
+
+Usage (from backend/):  python benchmarks/bench_rescoring.py [--resumes 2000] [--workers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_extractor
+from corpus import make_text_pdf, synthetic_resume_text
+from rescore_candidates import _split, score_resumes
+
+
+def rate(n: int, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--reparse", type=int, default=200, help="resumes timed on the PDF path (it is slow)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    texts = [synthetic_resume_text(seed, 12) for seed in range(args.resumes)]
+    pdfs = [make_text_pdf(text) for text in texts[: args.reparse]]
+    batches = [texts[i : i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+
+    reparse = rate(len(pdfs), lambda: score_resumes([pdf_extractor.extract_text(pdf) for pdf in pdfs]))
+    inline = rate(len(texts), lambda: [score_resumes(batch) for batch in batches])
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(score_resumes, [["warmup"]] * args.workers))
+
+        def pooled():
+            for batch in batches:
+                list(pool.map(score_resumes, _split(batch, args.workers)))
+
+        pooled_rate = rate(len(texts), pooled)
+
+    print(f"{args.resumes} resumes, batches of {args.batch_size}, {os.cpu_count()} CPU(s)")
+    print(f"{'path':<28} {'resumes/s':>10} {'speedup':>8}")
+    for name, value in (
+        ("reparse PDF + score", reparse),
+        ("stored text, inline", inline),
+        (f"stored text, {args.workers} workers", pooled_rate),
+    ):
+        print(f"{name:<28} {value:>10,.0f} {value / reparse:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
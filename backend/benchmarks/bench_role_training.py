@@ -0,0 +1,95 @@
+"""
+Benchmark: streaming role-classifier training on a synthetic labeled corpus.
+
+Writes N labeled resumes to a JSONL file (streamed, never held in memory), then runs
+train_role_model.py on it in a fresh process and reports throughput and peak RSS. For
+comparison, the old approach (TfidfVectorizer + LogisticRegression over the whole list
+in memory) runs on a smaller corpus in its own process.
+
+Usage (from backend/):  python benchmarks/bench_role_training.py [--docs 1000000] [--baseline-docs 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from corpus import SKILL_POOL
+
+ROLE_VOCAB = {
+    "Machine Learning Engineer": "python machine learning deep learning tensorflow pytorch nlp computer vision models",
+    "Data Analyst": "excel sql data analysis power bi tableau statistics pandas dashboards reporting",
+    "Full Stack Developer": "html css javascript react node mongodb express api frontend backend",
+    "DevOps Engineer": "docker kubernetes aws ci cd linux terraform pipeline monitoring automation",
+    "Backend Developer": "java spring python django fastapi postgresql redis microservices api",
+    "Data Scientist": "python statistics machine learning pandas numpy experiments modeling sql",
+}
+FILLER = "worked with the team on projects delivered features improved performance wrote documentation".split()
+
+
+def write_corpus(path: str, n: int, seed: int = 3) -> None:
+    rng = random.Random(seed)
+    roles = list(ROLE_VOCAB)
+    vocab = {role: words.split() for role, words in ROLE_VOCAB.items()}
+    with open(path, "w", encoding="utf-8") as fh:
+        for _ in range(n):
+            role = rng.choice(roles)
+            words = rng.choices(vocab[role], k=12) + rng.choices(SKILL_POOL, k=6) + rng.choices(FILLER, k=40)
+            rng.shuffle(words)
+            fh.write(json.dumps({"text": " ".join(words), "role": role}) + "\n")
+
+
+BASELINE = """
+import json, resource, sys, time
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+t0 = time.perf_counter()
+rows = [json.loads(line) for line in open(sys.argv[1], encoding="utf-8")]
+X = TfidfVectorizer().fit_transform([r["text"] for r in rows])
+LogisticRegression(max_iter=200).fit(X, [r["role"] for r in rows])
+elapsed = time.perf_counter() - t0
+print(f"{len(rows):,} docs in {elapsed:.2f}s ({len(rows) / elapsed:,.0f} docs/s), "
+      f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--baseline-docs", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = sorted({args.baseline_docs, args.docs})
+        for n in sizes:
+            path = os.path.join(tmp, f"corpus-{n}.jsonl")
+            t0 = time.perf_counter()
+            write_corpus(path, n)
+            print(f"\n{n:,} docs: corpus written in {time.perf_counter() - t0:.1f}s ({os.path.getsize(path) / 2**20:.0f} MB)")
+            out = subprocess.run(
+                [sys.executable, "train_role_model.py", "--jsonl", path, "--chunk-size", str(args.chunk_size),
+                 "--classes", ",".join(ROLE_VOCAB), "--out-dir", os.path.join(tmp, "models")],
+                cwd=BACKEND, capture_output=True, text=True, check=True,
+            ).stdout
+            print("  streaming (hashing + SGD):", out.strip().splitlines()[-1].strip())
+            if n == args.baseline_docs:
+                out = subprocess.run(
+                    [sys.executable, "-c", BASELINE, path], cwd=BACKEND, capture_output=True, text=True, check=True
+                ).stdout
+                print("  in-memory (tfidf + logreg):", out.strip())
+        artifact = os.path.join(tmp, "models")
+        sizes_mb = [os.path.getsize(os.path.join(artifact, f)) / 2**20 for f in sorted(os.listdir(artifact))]
+        print(f"\nartifact size: {', '.join(f'{mb:.1f} MB' for mb in sizes_mb)}")
+
+
+if __name__ == "__main__":
+    main()
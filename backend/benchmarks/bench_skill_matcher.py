@@ -0,0 +1,58 @@
+"""
+Benchmark: substring-loop skill detection vs the shared SkillMatcher.
+
+Synthetic taxonomies of 20 / 1,000 / 10,000 skills are matched against synthetic
+resumes. The loop is the old ``[s for s in skills if s in text]`` pattern.
+
+Usage (from backend/):  python benchmarks/bench_skill_matcher.py
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher, load_taxonomy
+from corpus import synthetic_resume_text
+
+
+def synthetic_taxonomy(size: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    base = list(load_taxonomy()[0])
+    skills = base[:size]
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    while len(skills) < size:
+        words = ["".join(rng.choices(alphabet, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        skills.append(" ".join(words))
+    return skills
+
+
+def main() -> None:
+    texts = [synthetic_resume_text(seed, 20).lower() for seed in range(50)]
+    print(f"{'skills':>7} {'loop_ms/doc':>12} {'matcher_ms/doc':>15} {'build_ms':>9} {'speedup':>8}")
+    for size in (20, 1_000, 10_000):
+        skills = synthetic_taxonomy(size)
+        t0 = time.perf_counter()
+        matcher = SkillMatcher(skills, synonyms={})
+        build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for text in texts:
+            [s for s in skills if s in text]
+        loop = (time.perf_counter() - t0) / len(texts)
+
+        t0 = time.perf_counter()
+        for text in texts:
+            matcher.find(text)
+        fast = (time.perf_counter() - t0) / len(texts)
+        print(
+            f"{size:>7} {loop * 1000:>12.3f} {fast * 1000:>15.3f} "
+            f"{build * 1000:>9.1f} {loop / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
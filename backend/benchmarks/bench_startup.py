@@ -0,0 +1,86 @@
+"""
+Benchmark: import cost and time-to-first-request for the backend.
+
+1. ``python -X importtime -c "import <module>"`` for main, matcher and database,
+   reporting the cumulative self+children time of the top-level module.
+2. Spawns ``uvicorn main:app`` and measures wall time until /health first answers,
+   optionally with a WARMUP list (e.g. --warmup all) to compare lazy vs eager.
+
+Usage (from backend/):  python benchmarks/bench_startup.py [--warmup matcher,database]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_ms(module: str) -> float | None:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    for line in reversed(proc.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(warmup: str, timeout: float = 120.0) -> float:
+    port = free_port()
+    env = {**os.environ, "WARMUP": warmup}
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError("server did not answer /health")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--warmup", default="", help="WARMUP value for the server run")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    for module in ("main", "matcher", "database"):
+        ms = import_time_ms(module)
+        print(f"import {module:<9} {'failed' if ms is None else f'{ms:8.1f} ms'}")
+    runs = [time_to_first_request(args.warmup) for _ in range(args.runs)]
+    label = args.warmup or "lazy"
+    print(f"time to first /health ({label}): best {min(runs) * 1000:.0f} ms, worst {max(runs) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: old temp-file upload path vs the in-memory path.
+
+The old path wrote each upload into a directory, let pdfminer re-open it by path and
+then deleted it. The new path hands pdfminer a BytesIO. Run the disk variant against
+a tmpfs directory and a real-disk directory to see both costs.
+
+Usage (from backend/):
+    python benchmarks/bench_upload_path.py --dirs /dev/shm ./.bench_uploads
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import extract_pdf_text
+from corpus import make_text_pdf, synthetic_resume_text
+
+
+def disk_path(data: bytes, directory: str) -> str:
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.pdf")
+    try:
+        with open(path, "wb") as buffer:
+            buffer.write(data)
+            buffer.flush()
+            os.fsync(buffer.fileno())
+        return extract_pdf_text(path)
+    finally:
+        os.remove(path)
+
+
+def memory_path(data: bytes) -> str:
+    return extract_pdf_text(data)
+
+
+def bench(label: str, fn, docs: list[bytes], rounds: int) -> None:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for data in docs:
+            fn(data)
+    elapsed = time.perf_counter() - t0
+    n = rounds * len(docs)
+    mb = rounds * sum(map(len, docs)) / (1024 * 1024)
+    print(f"{label:<34} {n / elapsed:>8.1f} docs/s {mb / elapsed:>8.2f} MB/s")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dirs", nargs="+", default=["/dev/shm", "./.bench_uploads"])
+    ap.add_argument("--docs", type=int, default=20)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    docs = [make_text_pdf(synthetic_resume_text(seed, 10 + seed * 3)) for seed in range(args.docs)]
+    bench("memory (BytesIO)", memory_path, docs, args.rounds)
+    for directory in args.dirs:
+        created = not os.path.isdir(directory)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            bench(f"disk ({directory})", lambda d: disk_path(d, directory), docs, args.rounds)
+        finally:
+            if created:
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Synthetic resume fixtures for the benchmarks (no third-party PDF writer needed).
+"""
+from __future__ import annotations
+
+import random
+
+SKILL_POOL = [
+    "python", "java", "javascript", "typescript", "react", "node", "django", "fastapi",
+    "flask", "sql", "postgresql", "mongodb", "redis", "docker", "kubernetes", "aws",
+    "azure", "gcp", "terraform", "linux", "pandas", "numpy", "tensorflow", "pytorch",
+    "machine learning", "deep learning", "data analysis", "power bi", "html", "css",
+]
+ROLES = ["Backend Developer", "Data Scientist", "Frontend Developer", "DevOps Engineer"]
+
+
+def synthetic_resume_text(seed: int = 0, paragraphs: int = 6) -> str:
+    rng = random.Random(seed)
+    skills = rng.sample(SKILL_POOL, k=min(len(SKILL_POOL), 6 + seed % 8))
+    lines = [
+        f"Candidate {seed} Sharma",
+        f"candidate{seed}@example.com | +91 98765{seed % 100000:05d}",
+        "National Institute of Technology",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "EXPERIENCE",
+    ]
+    for p in range(paragraphs):
+        role = rng.choice(ROLES)
+        used = ", ".join(rng.sample(skills, k=min(3, len(skills))))
+        lines.append(f"{role} at Company {p} ({rng.randint(1, 5)} years)")
+        lines.append(f"Built and shipped services using {used}; improved latency by {rng.randint(10, 60)}%.")
+    lines += ["", "PROJECTS", f"Open-source {rng.choice(skills)} toolkit with CI and docs."]
+    return "\n".join(lines)
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_text_pdf(text: str, lines_per_page: int = 50, sidebar: str = "") -> bytes:
+    """Build a minimal multi-page text PDF (Helvetica, one text line per row).
+
+    ``sidebar`` lines go in a narrow right-hand column on page one, drawn after the main
+    column (a two-column layout); keep main lines under ~70 characters so they don't overlap.
+    """
+    rows = text.splitlines() or [""]
+    pages = [rows[i : i + lines_per_page] for i in range(0, len(rows), lines_per_page)]
+    n_pages = len(pages)
+    # Object numbering: 1 catalog, 2 pages, 3 font, then (page, content) pairs.
+    objects: list[bytes] = []
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n_pages))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, page_rows in enumerate(pages):
+        content_id = 5 + 2 * i
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode()
+        )
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 760 Td"]
+        for row in page_rows:
+            ops.append(f"({_pdf_escape(row)}) Tj T*")
+        ops.append("ET")
+        if i == 0 and sidebar:
+            ops += ["BT", "/F1 9 Tf", "12 TL", "440 760 Td"]
+            ops += [f"({_pdf_escape(row)}) Tj T*" for row in sidebar.splitlines()]
+            ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def synthetic_paginated_resume(seed: int = 0, pages: int = 4, filler_lines: int = 45) -> str:
+    """pdfminer-like text: form-feed pages, repeated header/footer, whitespace runs,
+    boilerplate, and the skills section placed last (where a hard cut loses it)."""
+    rng = random.Random(seed)
+    name = f"Candidate {seed} Sharma"
+    skills = rng.sample(SKILL_POOL, k=10)
+    body = [f"{name}", f"candidate{seed}@example.com   |   +91 98765{seed % 100000:05d}", "", "EXPERIENCE"]
+    for i in range(pages * filler_lines):
+        role = rng.choice(ROLES)
+        body.append(
+            f"  •    {role} work item {i}:     delivered   {rng.choice(skills)}   features,"
+            f"       reviewed code and wrote documentation for internal teams.   "
+        )
+    body += ["", "DECLARATION", "I hereby declare that the above information is true to the best of my knowledge."]
+    body += ["", "SKILLS", ", ".join(skills)]
+    per_page = max(1, len(body) // pages + 1)
+    out = []
+    for p in range(pages):
+        chunk = body[p * per_page : (p + 1) * per_page]
+        out.append("\n".join([f"{name} — Curriculum Vitae", "", *chunk, "", f"Page {p + 1} of {pages}"]))
+    return "\f".join(out)
+
+
+def make_docx(text: str) -> bytes:
+    """Build a .docx with one paragraph per line (needs python-docx, as parser.py does)."""
+    import io
+
+    from docx import Document
+
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+# Named sizes used by the benchmark suite: paragraphs of experience per resume.
+CORPUS_SIZES = {"short": 4, "medium": 25, "long": 120}
+
+
+def synthetic_corpus(per_size: int = 3) -> dict[str, list[str]]:
+    return {
+        size: [synthetic_resume_text(seed * 31 + n, paragraphs) for n in range(per_size)]
+        for seed, (size, paragraphs) in enumerate(CORPUS_SIZES.items())
+    }
@@ -0,0 +1,142 @@
+"""
+Measure per-worker memory of the gunicorn server with and without preloading.
+
+Starts `gunicorn -c gunicorn.conf.py main:app` twice (GUNICORN_PRELOAD=0, then 1) with
+WARMUP=matcher so every worker ends up holding the models, optionally sends some
+/analyze traffic, then reads /proc/<pid>/smaps_rollup for the master and each worker.
+RSS counts shared pages in full for every process; PSS splits them between the
+processes that share them, and USS is the memory that only that process holds, so
+PSS/USS are what drop when the workers share the master's copy of the models.
+
+Linux only. Usage (from backend/):
+    python benchmarks/measure_worker_rss.py [--workers 4] [--requests 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from corpus import make_text_pdf, synthetic_resume_text
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def children(pid: int) -> list[int]:
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                # Field 4 is the parent pid; the command name (field 2) may contain spaces.
+                ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def memory_mb(pid: int) -> dict[str, float]:
+    fields: dict[str, float] = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "uss": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def wait_until_settled(master: int, workers: int, timeout: float) -> list[int]:
+    """Worker pids, once all are up and their RSS stopped growing (warmup finished)."""
+    ends_at = time.monotonic() + timeout
+    previous: dict[int, float] = {}
+    while time.monotonic() < ends_at:
+        time.sleep(2)
+        pids = children(master)
+        if len(pids) < workers:
+            continue
+        current = {pid: memory_mb(pid)["rss"] for pid in pids}
+        if previous.keys() == current.keys() and all(abs(current[p] - previous[p]) < 1 for p in pids):
+            return pids
+        previous = current
+    raise TimeoutError("workers did not settle")
+
+
+def run(preload: bool, args) -> dict[str, object]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "GUNICORN_PRELOAD": "1" if preload else "0",
+        "WEB_CONCURRENCY": str(args.workers),
+        "PORT": str(port),
+        "WARMUP": "matcher",
+        "MONGO_ENSURE_INDEXES": "0",
+    }
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL if not args.verbose else None,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        pids = wait_until_settled(master.pid, args.workers, args.timeout)
+        if args.requests:
+            pdf = make_text_pdf(synthetic_resume_text(0, 20))
+            with httpx.Client(base_url=base, timeout=120) as client:
+                for i in range(args.requests):
+                    files = {"file": (f"rss-{i}.pdf", pdf, "application/pdf")}
+                    client.post("/analyze", files=files)
+            pids = wait_until_settled(master.pid, args.workers, args.timeout)
+        workers = [memory_mb(pid) for pid in pids]
+        return {"master": memory_mb(master.pid), "workers": workers}
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=0, help="/analyze calls before measuring")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--verbose", action="store_true", help="show gunicorn's log")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, WARMUP=matcher, {args.requests} /analyze requests before measuring (MB)")
+    print(f"{'preload':<8} {'master_rss':>10} {'worker_rss':>10} {'worker_pss':>10} {'worker_uss':>10} {'total_pss':>10}")
+    for preload in (False, True):
+        result = run(preload, args)
+        workers = result["workers"]
+        n = len(workers)
+        mean = {k: sum(w[k] for w in workers) / n for k in ("rss", "pss", "uss")}
+        total_pss = result["master"]["pss"] + sum(w["pss"] for w in workers)
+        print(
+            f"{'on' if preload else 'off':<8} {result['master']['rss']:>10.1f} {mean['rss']:>10.1f} "
+            f"{mean['pss']:>10.1f} {mean['uss']:>10.1f} {total_pss:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Seed a MongoDB collection with synthetic candidate profiles for the /candidates search.
+
+Documents match what save_candidate stores (filename, candidate_name, predicted_role,
+ats_score, skills, created_at) with upload dates spread over the last year. Search
+indexes are created after loading, which is faster than maintaining them per batch.
+
+Usage (from backend/):  python benchmarks/seed_candidates.py --count 1000000 [--mongo-uri URI] [--drop]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import COLLECTION_NAME, DB_NAME, MONGO_URI, ensure_indexes
+from corpus import ROLES, SKILL_POOL
+
+EXTRA_ROLES = ["Machine Learning Engineer", "Full Stack Developer", "Data Analyst", "QA Engineer"]
+
+
+def synthetic_candidates(count: int, seed: int = 11, days: int = 365):
+    rng = random.Random(seed)
+    roles = ROLES + EXTRA_ROLES
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    step = days * 86400 / max(1, count)
+    for i in range(count):
+        yield {
+            "filename": f"resume_{i}.pdf",
+            "candidate_name": f"Candidate {i}",
+            "predicted_role": rng.choice(roles),
+            "ats_score": min(100, max(0, int(rng.gauss(62, 15)))),
+            "skills": rng.sample(SKILL_POOL, k=rng.randint(3, 9)),
+            "created_at": start + timedelta(seconds=i * step),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--mongo-uri", default=MONGO_URI)
+    parser.add_argument("--db", default=DB_NAME)
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--drop", action="store_true", help="drop the collection first")
+    args = parser.parse_args()
+
+    from pymongo import MongoClient
+
+    collection = MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000)[args.db][args.collection]
+    if args.drop:
+        collection.drop()
+    t0 = time.perf_counter()
+    batch: list[dict] = []
+    for doc in synthetic_candidates(args.count):
+        batch.append(doc)
+        if len(batch) >= args.batch:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+    loaded = time.perf_counter() - t0
+    ensure_indexes(collection)
+    print(
+        f"seeded {args.count:,} candidates in {loaded:.1f}s "
+        f"(+{time.perf_counter() - t0 - loaded:.1f}s indexes) into {args.db}.{args.collection}"
+    )
+
+
+if __name__ == "__main__":
+    main()
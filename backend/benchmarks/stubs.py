@@ -0,0 +1,70 @@
+"""
+Local stand-ins for the external services (JSearch over HTTP, Gemini in-process).
+
+Call ``start_jsearch_stub()`` *before* importing ``main`` so its JSEARCH_URL /
+RAPIDAPI_KEY pick up the stub.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubJSearch(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.25
+    jobs_per_page = 10
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = json.dumps(
+            {
+                "data": [
+                    {
+                        "employer_name": f"Stub Co {i}",
+                        "job_title": "Stub Role",
+                        "job_apply_link": f"https://example.com/{i}",
+                        "job_city": "Pune",
+                        "job_country": "IN",
+                        "job_description": "Build APIs with python, docker and aws. " * 10,
+                    }
+                    for i in range(self.jobs_per_page)
+                ]
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_jsearch_stub(delay: float = 0.25, job_cache: bool = False) -> ThreadingHTTPServer:
+    """
+    Serve the stub on a free local port and point the backend's env at it. main's job
+    listing cache stays off unless ``job_cache`` is set, so every lookup reaches the stub.
+    """
+    handler = type("ConfiguredStubJSearch", (StubJSearch,), {"delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["JSEARCH_URL"] = f"http://127.0.0.1:{server.server_port}/search"
+    os.environ["RAPIDAPI_KEY"] = "bench"
+    os.environ["JOB_CACHE_ENABLED"] = "1" if job_cache else "0"
+    return server
+
+
+def install_gemini_stub(main_module, delay: float = 0.0) -> None:
+    """Replace main.analyze_resume_with_gemini with a local call of fixed latency."""
+
+    def stub(resume_text: str):
+        if delay:
+            time.sleep(delay)
+        return main_module.analyze_resume_fallback(resume_text)
+
+    main_module.analyze_resume_with_gemini = stub
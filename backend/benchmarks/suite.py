@@ -0,0 +1,234 @@
+"""
+Microbenchmark suite for the backend hot paths.
+
+Builds a synthetic corpus of text-based PDF and DOCX resumes (short / medium / long),
+times each hot path with warmup + repeats, and writes JSON results that can be
+compared with an earlier run. Gemini and JSearch are replaced by local stubs.
+
+Usage (from backend/):
+    python benchmarks/suite.py --out bench.json
+    python benchmarks/suite.py --out new.json --compare bench.json --threshold 0.15
+    python benchmarks/suite.py --only parser,fallback
+
+Exit status is 1 when --compare finds a case whose median regressed past the threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from stubs import install_gemini_stub, start_jsearch_stub
+
+# The stub must be running before main reads JSEARCH_URL at import time.
+_jsearch_server = start_jsearch_stub(delay=0.0)
+
+import main
+from corpus import make_docx, make_text_pdf, synthetic_corpus
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "n": repeat,
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+    }
+
+
+def build_cases(workdir: str) -> dict[str, Callable[[], Any]]:
+    corpus = synthetic_corpus()
+    cases: dict[str, Callable[[], Any]] = {}
+
+    def each(fn, items):
+        return lambda: [fn(item) for item in items]
+
+    for size, texts in corpus.items():
+        pdfs = [make_text_pdf(t) for t in texts]
+        pdf_paths, docx_paths = [], []
+        for i, (text, pdf) in enumerate(zip(texts, pdfs)):
+            pdf_path = os.path.join(workdir, f"{size}-{i}.pdf")
+            docx_path = os.path.join(workdir, f"{size}-{i}.docx")
+            with open(pdf_path, "wb") as fh:
+                fh.write(pdf)
+            with open(docx_path, "wb") as fh:
+                fh.write(make_docx(text))
+            pdf_paths.append(pdf_path)
+            docx_paths.append(docx_path)
+
+        cases[f"extract_pdf_text/{size}"] = each(main.extract_pdf_text, pdfs)
+        cases[f"fallback/{size}"] = each(main.analyze_resume_fallback, texts)
+        cases[f"candidate_details/{size}"] = each(main._extract_candidate_details, texts)
+        cases[f"parser.parse_resume_pdf/{size}"] = lambda paths=pdf_paths: [_parser().parse_resume(p) for p in paths]
+        cases[f"parser.parse_resume_docx/{size}"] = lambda paths=docx_paths: [_parser().parse_resume(p) for p in paths]
+        cases[f"report.generate_pdf_report/{size}"] = _report_case(texts, workdir)
+        cases[f"matcher.skill_gap_analysis/{size}"] = _matcher_case("skill_gap_analysis", texts)
+        cases[f"matcher.calculate_similarity/{size}"] = _matcher_case("calculate_similarity", texts)
+        cases[f"matcher.weighted_skill_match/{size}"] = _matcher_case("weighted_skill_match", texts)
+        # End to end with stubbed Gemini/JSearch; every round uses fresh bytes so the
+        # analysis cache never hits.
+        cases[f"pipeline.analyze/{size}"] = _pipeline_case(texts)
+    return cases
+
+
+def _parser():
+    import parser as resume_parser
+
+    return resume_parser
+
+
+_JD = "Looking for a python developer with aws, docker, sql and machine learning experience."
+
+
+_matcher_error: list[str] = []
+
+
+def _load_matcher(need_model: bool = True):
+    """Import matcher (and its model) once; later cases skip fast if that failed."""
+    import matcher
+
+    if not need_model:
+        return matcher
+    if _matcher_error:
+        raise RuntimeError(_matcher_error[0])
+    try:
+        matcher.get_model()
+        return matcher
+    except Exception as exc:
+        _matcher_error.append(f"{type(exc).__name__}: {exc}")
+        raise
+
+
+def _matcher_case(name: str, texts: list[str]) -> Callable[[], Any]:
+    def run():
+        matcher = _load_matcher(need_model=name != "weighted_skill_match")
+
+        if name == "weighted_skill_match":
+            return [matcher.weighted_skill_match(_parser().extract_skills(t), _JD) for t in texts]
+        fn = getattr(matcher, name)
+        return [fn(t, _JD) for t in texts]
+
+    return run
+
+
+def _report_case(texts: list[str], workdir: str) -> Callable[[], Any]:
+    def run():
+        from report_generator import generate_pdf_report
+
+        for i, text in enumerate(texts):
+            payload = {**main.analyze_resume_fallback(text), "filename": f"resume-{i}.pdf"}
+            payload["extracted_skills"] = payload["matched_skills"]
+            generate_pdf_report(payload, os.path.join(workdir, f"report-{i}.pdf"))
+
+    return run
+
+
+def _pipeline_case(texts: list[str]) -> Callable[[], Any]:
+    counter = [0]
+
+    def run():
+        async def go():
+            for text in texts:
+                counter[0] += 1
+                pdf = make_text_pdf(f"{text}\nrun {counter[0]}")
+                await main._analyze_pdf_bytes("bench.pdf", pdf)
+
+        asyncio.run(go())
+
+    return run
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'case':<44} {'base_ms':>10} {'now_ms':>10} {'change':>8}")
+    for name, now in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median_ms" not in base or "median_ms" not in now:
+            continue
+        change = now["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<44} {base['median_ms']:>10.3f} {now['median_ms']:>10.3f} {change * 100:>7.1f}%{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main_cli() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", help="write JSON results here")
+    ap.add_argument("--compare", help="baseline JSON from an earlier run")
+    ap.add_argument("--threshold", type=float, default=0.15, help="allowed median slowdown (0.15 = 15%%)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", default="", help="comma list of case-name prefixes")
+    args = ap.parse_args()
+
+    install_gemini_stub(main, delay=0.0)
+    prefixes = [p.strip() for p in args.only.split(",") if p.strip()]
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, fn in build_cases(workdir).items():
+            if prefixes and not any(name.startswith(p) for p in prefixes):
+                continue
+            try:
+                results[name] = measure(fn, args.repeat)
+                print(f"{name:<44} median {results[name]['median_ms']:>10.3f} ms")
+            except Exception as exc:
+                # e.g. matcher without sentence-transformers / model files
+                results[name] = {"skipped": f"{type(exc).__name__}: {exc}"[:200]}
+                print(f"{name:<44} skipped ({type(exc).__name__})")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) past {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
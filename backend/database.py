@@ -1,40 +1,260 @@
+import base64
+import json
 import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import PyMongoError
 
 # ======================================================
 # 🔐 DATABASE CONNECTION CONFIGURATION
 # ======================================================
-# It will use your Cloud DB if you set an environment variable, 
+# It will use your Cloud DB if you set an environment variable,
 # otherwise, it safely falls back to your local MongoDB for testing.
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-# Inside database.py, make sure you have something like this:
-from pymongo import MongoClient
-
-client = MongoClient("mongodb://localhost:27017/")
-db = client["resume_scanner_db"]
-collection = db["candidates"]
-roles_collection = db["roles"] # ADD THIS LINE
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "300000"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
 
 DB_NAME = "careermatch_ai_db"
 COLLECTION_NAME = "candidates"
+# Role documents predate DB_NAME and still live in the old database (same server).
+ROLES_DB_NAME = os.getenv("MONGO_ROLES_DB", "resume_scanner_db")
+
+# save_candidate queues documents for a background writer that flushes them with
+# insert_many once DB_WRITE_BATCH_SIZE are waiting or DB_WRITE_FLUSH_SECONDS passed.
+# When DB_WRITE_QUEUE_SIZE documents are pending, callers block for up to
+# DB_WRITE_BLOCK_SECONDS (backpressure) and the document is dropped after that.
+# No caller waits on the writer longer than that, including link_duplicate's flush.
+DB_BULK_WRITES = os.getenv("DB_BULK_WRITES", "1").strip().lower() not in ("0", "false", "no")
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "100"))
+DB_WRITE_FLUSH_SECONDS = float(os.getenv("DB_WRITE_FLUSH_SECONDS", "0.5"))
+DB_WRITE_QUEUE_SIZE = int(os.getenv("DB_WRITE_QUEUE_SIZE", "5000"))
+DB_WRITE_BLOCK_SECONDS = float(os.getenv("DB_WRITE_BLOCK_SECONDS", "2"))
+
+# The client is created on first use, never at import: importing this module must not
+# block (or hang) when MongoDB is absent. `client`, `db`, `collection` and
+# `roles_collection` stay available as lazy module attributes.
+_client = None
+_writer = None
+_client_lock = threading.Lock()
+# Result of the last ping(): a client object alone does not mean the server is reachable.
+_reachable = False
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                print("[DB] Initializing database connection...")
+                # One pooled client per process, shared by every thread. The
+                # selection timeout keeps it from hanging forever if the DB is offline.
+                _client = MongoClient(
+                    MONGO_URI,
+                    serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+                )
+    return _client
 
-print("[DB] Initializing database connection...")
 
-try:
-    # Set a 5-second timeout so it doesn't hang forever if the DB is offline
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-    
-    # Force a ping to confirm the connection is actually alive
-    client.admin.command('ping')
-    print("[DB] Connected to MongoDB.")
-    
-except ConnectionFailure:
-    print("[DB] CRITICAL: Failed to connect to MongoDB. Use MONGO_URI or start local MongoDB.")
+def get_collection():
+    return get_client()[DB_NAME][COLLECTION_NAME]
+
+
+def get_roles_collection():
+    return get_client()[ROLES_DB_NAME]["roles"]
+
+
+def ping():
+    """Force a round trip to confirm the connection is actually alive."""
+    global _reachable
+    try:
+        get_client().admin.command('ping')
+        _reachable = True
+        print("[DB] Connected to MongoDB.")
+        return True
+    except PyMongoError:
+        _reachable = False
+        print("[DB] CRITICAL: Failed to connect to MongoDB. Use MONGO_URI or start local MongoDB.")
+        return False
+
+
+def is_connected():
+    """True when the last ping() reached the server (never pings itself)."""
+    return _client is not None and _reachable
+
+
+def __getattr__(name):
+    if name == "client":
+        return get_client()
+    if name == "db":
+        return get_client()[DB_NAME]
+    if name == "collection":
+        return get_collection()
+    if name == "roles_collection":
+        return get_roles_collection()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ======================================================
+# 📦 BUFFERED BULK WRITER
+# ======================================================
+class CandidateWriter:
+    """Background thread that groups queued documents into insert_many batches."""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        get_target=None,
+        batch_size: int = 100,
+        flush_seconds: float = 0.5,
+        max_queue: int = 5000,
+        block_seconds: float = 2.0,
+    ):
+        self.get_target = get_target
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.block_seconds = block_seconds
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "failed": 0, "dropped": 0}
+        self._thread = threading.Thread(target=self._run, name="candidate-writer", daemon=True)
+        self._thread.start()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def put(self, doc: dict) -> bool:
+        """Queue ``doc``; blocks while the queue is full, False if it stays full or we're closed."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put(doc, timeout=self.block_seconds)
+        except queue.Full:
+            self._count("dropped")
+            print("[DB] Write queue full; candidate dropped.")
+            return False
+        self._count("queued")
+        return True
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is self._STOP:
+                self._queue.task_done()
+                return
+            batch = [first]
+            stop = False
+            ends_at = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = ends_at - time.monotonic()
+                try:
+                    doc = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if doc is self._STOP:
+                    stop = True
+                    break
+                batch.append(doc)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[dict]) -> None:
+        try:
+            # Unordered: one bad document doesn't stop the rest of the batch.
+            target = self.get_target() if self.get_target is not None else get_collection()
+            result = target.insert_many(batch, ordered=False)
+            self._count("written", len(result.inserted_ids))
+            self._count("failed", len(batch) - len(result.inserted_ids))
+        except PyMongoError as e:
+            written = (getattr(e, "details", None) or {}).get("nInserted", 0)
+            self._count("written", written)
+            self._count("failed", len(batch) - written)
+            print(f"[DB] Bulk insert of {len(batch)} failed: {e}")
+        except Exception as e:
+            self._count("failed", len(batch))
+            print(f"[DB] Bulk insert of {len(batch)} failed: {e}")
+        self._count("batches")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued document has been written (or has failed); False on timeout."""
+        # Queue.join() with a deadline: same condition and counter it waits on.
+        ends_at = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if ends_at is None else ends_at - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting documents, write out what is queued and stop the thread.
+        Waits at most ``timeout`` seconds in total; False if documents were left behind
+        (a full queue behind a stalled database), which the daemon thread then abandons.
+        """
+        if self._closed:
+            return not self._thread.is_alive()
+        self._closed = True
+        ends_at = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            print(f"[DB] Write queue still full on close; {self._queue.qsize()} candidates not written.")
+            return False
+        self._thread.join(None if ends_at is None else max(0.0, ends_at - time.monotonic()))
+        if self._thread.is_alive():
+            print(f"[DB] Writer did not finish within {timeout}s; {self._queue.qsize()} candidates not written.")
+            return False
+        return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _client_lock:
+            if _writer is None:
+                _writer = CandidateWriter(
+                    batch_size=DB_WRITE_BATCH_SIZE,
+                    flush_seconds=DB_WRITE_FLUSH_SECONDS,
+                    max_queue=DB_WRITE_QUEUE_SIZE,
+                    block_seconds=DB_WRITE_BLOCK_SECONDS,
+                )
+    return _writer
+
+
+def close(timeout: float | None = 10.0):
+    """Flush pending candidate writes and close the client (call on shutdown)."""
+    global _writer, _client, _reachable
+    if _writer is not None:
+        _writer.close(timeout)
+        _writer = None
+    if _client is not None:
+        _client.close()
+        _client = None
+    _reachable = False
 
-# Connect to the specific database and collection
-db = client[DB_NAME]
-collection = db[COLLECTION_NAME]
 
 # ======================================================
 # 💾 DATA STORAGE FUNCTIONS
@@ -43,11 +263,186 @@ def save_candidate(data: dict):
     """
     Saves the analyzed resume profile securely to the database.
     This tracks the filename, skills, predicted role, and ATS score.
+    With bulk writes on (the default) the profile is queued and written in a
+    batch shortly after; True means it was accepted.
     """
+    data.setdefault("created_at", datetime.now(timezone.utc))
+    if DB_BULK_WRITES:
+        return get_writer().put(data)
     try:
-        result = collection.insert_one(data)
-        print(f"[DB] Profile saved with ID: {result.inserted_id}")
+        get_collection().insert_one(data)
         return True
     except Exception as e:
         print(f"[DB] Error: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+# ======================================================
+# 🔎 CANDIDATE SEARCH
+# ======================================================
+# Results are newest first and paged by (created_at, _id) keyset, never skip().
+# Every index follows equality -> sort -> range, so a filtered page is one bounded
+# index scan whatever the collection size; ats_score is the trailing range key.
+CANDIDATE_INDEXES = {
+    "candidates_recent": [("created_at", DESCENDING), ("_id", DESCENDING), ("ats_score", ASCENDING)],
+    "candidates_role_recent": [
+        ("predicted_role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING), ("ats_score", ASCENDING),
+    ],
+    "candidates_skills_recent": [
+        ("skills", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING), ("ats_score", ASCENDING),
+    ],
+}
+SEARCH_FIELDS = ("filename", "candidate_name", "predicted_role", "ats_score", "skills", "created_at")
+SEARCH_MAX_LIMIT = 100
+_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+_indexes_ready = False
+
+
+def ensure_indexes(target=None):
+    """Create the search indexes; safe to call repeatedly (existing indexes are kept)."""
+    global _indexes_ready
+    for name, keys in {**CANDIDATE_INDEXES, **DEDUPE_INDEXES}.items():
+        (target if target is not None else get_collection()).create_index(keys, name=name)
+    if target is None:
+        _indexes_ready = True
+
+
+def encode_cursor(doc: dict) -> str:
+    raw = json.dumps([doc["created_at"].isoformat(), str(doc["_id"])]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, oid = json.loads(raw)
+        return datetime.fromisoformat(created_at), ObjectId(oid)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def build_candidate_query(
+    skills=None,
+    role=None,
+    ats_min=None,
+    ats_max=None,
+    uploaded_from=None,
+    uploaded_to=None,
+    cursor=None,
+) -> dict:
+    """Mongo filter for a search page (pure: no database access)."""
+    query: dict = {}
+    if role:
+        query["predicted_role"] = role
+    skills = [s.strip().lower() for s in skills or [] if s and s.strip()]
+    if skills:
+        query["skills"] = {"$all": skills} if len(skills) > 1 else skills[0]
+    ats = {}
+    if ats_min is not None:
+        ats["$gte"] = ats_min
+    if ats_max is not None:
+        ats["$lte"] = ats_max
+    if ats:
+        query["ats_score"] = ats
+    created = {}
+    if uploaded_from is not None:
+        created["$gte"] = uploaded_from
+    if uploaded_to is not None:
+        created["$lt"] = uploaded_to
+    if cursor:
+        # The top-level bound keeps the scan on the index; the $or only drops the
+        # rows of the boundary timestamp that were already returned.
+        created_at, oid = decode_cursor(cursor)
+        created["$lte"] = created_at
+        query["$or"] = [{"created_at": {"$lt": created_at}}, {"_id": {"$lt": oid}}]
+    if created:
+        query["created_at"] = created
+    return query
+
+
+def _hint_for(query_filters: dict) -> str:
+    if query_filters.get("skills"):
+        return "candidates_skills_recent"
+    if query_filters.get("role"):
+        return "candidates_role_recent"
+    return "candidates_recent"
+
+
+def search_candidates(limit: int = 20, target=None, explain: bool = False, **filters):
+    """
+    One page of stored profiles, newest first.
+    Returns {"items", "next_cursor"}; pass next_cursor back as ``cursor`` for the next page.
+    With ``explain`` the query plan is returned instead.
+    """
+    if target is None:
+        if not _indexes_ready:
+            ensure_indexes()
+        target = get_collection()
+    limit = max(1, min(SEARCH_MAX_LIMIT, int(limit)))
+    projection = {field: 1 for field in SEARCH_FIELDS}
+    # Fetch one extra row to know whether another page exists.
+    cursor = (
+        target.find(build_candidate_query(**filters), projection)
+        .sort(_SORT)
+        .hint(_hint_for(filters))
+        .limit(limit + 1)
+    )
+    if explain:
+        return cursor.explain()
+    docs = list(cursor)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    items = []
+    for doc in docs:
+        item = {field: doc.get(field) for field in SEARCH_FIELDS if field in doc}
+        item["id"] = str(doc["_id"])
+        if isinstance(item.get("created_at"), datetime):
+            item["created_at"] = item["created_at"].isoformat()
+        items.append(item)
+    return {"items": items, "next_cursor": encode_cursor(docs[-1]) if has_more else None}
+
+
+# ======================================================
+# 🧬 NEAR-DUPLICATE LOOKUP
+# ======================================================
+# Profiles carry their MinHash signature ("minhash", raw uint32 bytes) and LSH band
+# keys ("lsh_bands", see near_duplicates.py). The multikey index turns "shares a band"
+# into index lookups, so the cost follows the number of matches, not the collection.
+DEDUPE_INDEXES = {"candidates_lsh_bands": [("lsh_bands", ASCENDING)]}
+DEDUPE_FIELDS = ("minhash", "analysis", "analysis_source", "filename", "created_at")
+DEDUPE_MAX_CANDIDATES = 50
+
+
+def find_near_duplicates(band_keys, limit: int = DEDUPE_MAX_CANDIDATES, target=None):
+    """Stored profiles sharing at least one band key (candidates only: verify the signatures)."""
+    if target is None:
+        if not _indexes_ready:
+            ensure_indexes()
+        target = get_collection()
+    projection = {field: 1 for field in DEDUPE_FIELDS}
+    return list(target.find({"lsh_bands": {"$in": list(band_keys)}}, projection).limit(limit))
+
+
+def link_duplicate(candidate_id, filename: str, similarity: float, target=None):
+    """Count a near-duplicate upload on the original profile instead of storing a new one."""
+    update = {
+        "$inc": {"duplicate_uploads": 1},
+        "$set": {
+            "last_duplicate_at": datetime.now(timezone.utc),
+            "last_duplicate_filename": filename,
+            "last_duplicate_similarity": round(similarity, 4),
+        },
+    }
+    try:
+        target = target if target is not None else get_collection()
+        result = target.update_one({"_id": ObjectId(candidate_id)}, update)
+        if not result.matched_count and DB_BULK_WRITES and _writer is not None:
+            # The original may still be queued in the bulk writer (a quick re-upload).
+            # Wait for it no longer than save_candidate would block, then give up.
+            if _writer.flush(DB_WRITE_BLOCK_SECONDS):
+                result = target.update_one({"_id": ObjectId(candidate_id)}, update)
+        return bool(result.matched_count)
+    except (PyMongoError, InvalidId) as e:
+        print(f"[DB] Error: {e}")
+        return False
@@ -0,0 +1,192 @@
+"""
+Gateway in front of the (blocking) Gemini client.
+
+- Identical prompts already in flight share one upstream call (request coalescing).
+- A token bucket caps the call rate and a semaphore caps concurrent calls.
+- Retryable failures (429 / 5xx / timeouts) back off with full jitter, but never past
+  the per-call deadline.
+Calls run on main's dedicated Gemini threads (main._run_gemini), so everything here is
+thread-based and a wait only ever blocks one of those threads.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+GEMINI_RATE_PER_SEC = float(os.getenv("GEMINI_RATE_PER_SEC", "2"))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_DEADLINE = float(os.getenv("GEMINI_DEADLINE", "45"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+
+_RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class GatewayTimeout(TimeoutError):
+    """No rate token / concurrency slot became free before the deadline."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        return code in _RETRYABLE_CODES
+    return isinstance(exc, (TimeoutError, ConnectionError))
+
+
+def prompt_key(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8", errors="replace")).hexdigest()
+
+
+class GeminiGateway:
+    def __init__(
+        self,
+        rate_per_sec: float = 2.0,
+        burst: int = 5,
+        max_concurrency: int = 4,
+        deadline: float = 45.0,
+        max_retries: int = 3,
+        base_backoff: float = 0.5,
+        max_backoff: float = 8.0,
+    ):
+        self.rate = rate_per_sec
+        self.burst = max(1, burst)
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._inflight: dict[str, Future] = {}
+        self.stats = {
+            "calls": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "in_flight": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "waits": 0,
+        }
+
+    def call(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` through the gateway; concurrent calls with the same key share one result."""
+        with self._lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                shared = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.stats["coalesced"] += 1
+                leader = False
+        if not leader:
+            return shared.result(timeout=self.deadline)
+        try:
+            result = self._call_with_retries(fn)
+            shared.set_result(result)
+            return result
+        except BaseException as exc:
+            shared.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _call_with_retries(self, fn: Callable[[], Any]) -> Any:
+        ends_at = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._acquire(ends_at)
+            try:
+                with self._lock:
+                    self.stats["calls"] += 1
+                    self.stats["in_flight"] += 1
+                return fn()
+            except Exception as exc:
+                delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2**attempt))
+                if (
+                    attempt >= self.max_retries
+                    or not is_retryable(exc)
+                    or time.monotonic() + delay >= ends_at
+                ):
+                    with self._lock:
+                        self.stats["failures"] += 1
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.stats["retries"] += 1
+            finally:
+                with self._lock:
+                    self.stats["in_flight"] -= 1
+                self._slots.release()
+            time.sleep(delay)
+
+    def _acquire(self, ends_at: float) -> None:
+        """Wait for a rate token and a concurrency slot (in that order) or raise GatewayTimeout."""
+        started = time.monotonic()
+        with self._lock:
+            self.stats["queue_depth"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.stats["queue_depth"])
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    if self.rate > 0:
+                        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                    else:
+                        self._tokens = float(self.burst)
+                    self._refilled_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    wait = (1 - self._tokens) / self.rate
+                if now + wait >= ends_at:
+                    self._timed_out()
+                time.sleep(wait)
+            if not self._slots.acquire(timeout=max(0.0, ends_at - time.monotonic())):
+                self._timed_out()
+        finally:
+            waited_ms = (time.monotonic() - started) * 1000
+            with self._lock:
+                self.stats["queue_depth"] -= 1
+                self.stats["waits"] += 1
+                self.stats["wait_ms_total"] += waited_ms
+                self.stats["wait_ms_max"] = max(self.stats["wait_ms_max"], waited_ms)
+
+    def _timed_out(self) -> None:
+        with self._lock:
+            self.stats["timeouts"] += 1
+        raise GatewayTimeout("Gemini gateway deadline exceeded while queued")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        waits = stats.pop("waits")
+        total = stats.pop("wait_ms_total")
+        stats["wait_ms_avg"] = round(total / waits, 2) if waits else 0.0
+        stats["wait_ms_max"] = round(stats["wait_ms_max"], 2)
+        stats.update(
+            rate_per_sec=self.rate,
+            burst=self.burst,
+            deadline_seconds=self.deadline,
+            max_retries=self.max_retries,
+        )
+        return stats
+
+
+gemini_gateway = GeminiGateway(
+    rate_per_sec=GEMINI_RATE_PER_SEC,
+    burst=GEMINI_BURST,
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+    deadline=GEMINI_DEADLINE,
+    max_retries=GEMINI_MAX_RETRIES,
+)
@@ -0,0 +1,55 @@
+"""
+Production server: gunicorn pre-fork master + uvicorn workers.
+
+The master imports main.py and loads the MiniLM weights and role classifier once
+(main.preload_for_fork), then forks WEB_CONCURRENCY workers that share those pages
+copy-on-write instead of each loading its own copy. Workers are recycled after
+WORKER_MAX_REQUESTS requests or WORKER_MAX_LIFETIME seconds (both jittered so they do
+not restart together), and a stopping worker gets GRACEFUL_TIMEOUT seconds to finish
+in-flight requests. `kill -HUP <master>` replaces every worker gracefully.
+
+Usage (from backend/):  gunicorn -c gunicorn.conf.py main:app
+Development keeps `python main.py` (single process, auto-reload).
+"""
+import os
+import random
+import signal
+import threading
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+worker_class = "uvicorn_worker.UvicornWorker"
+# 0 disables preloading (every worker imports the app and loads models itself).
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").strip().lower() not in ("0", "false", "no")
+max_requests = int(os.getenv("WORKER_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+# Seconds (0 = unbounded); each worker adds up to 10% random jitter.
+WORKER_MAX_LIFETIME = float(os.getenv("WORKER_MAX_LIFETIME", "21600"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# /analyze can legitimately take a while (Gemini + JSearch); only kill truly stuck workers.
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+keepalive = 5
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before any worker is forked.
+    if preload_app:
+        import main
+
+        main.preload_for_fork()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import main
+
+        main.after_fork()
+
+
+def post_worker_init(worker):
+    if WORKER_MAX_LIFETIME > 0:
+        lifetime = WORKER_MAX_LIFETIME * (1 + random.uniform(0, 0.1))
+        # SIGTERM = uvicorn's graceful shutdown; the master then forks a replacement.
+        timer = threading.Timer(lifetime, os.kill, (os.getpid(), signal.SIGTERM))
+        timer.daemon = True
+        timer.start()
@@ -0,0 +1,303 @@
+"""
+Stale-while-revalidate store for JSearch job listings.
+
+Listings are keyed by the normalized (role, location) pair, so "Data Scientist" and
+" data  scientist" share one entry. A lookup younger than JOB_CACHE_TTL is served as
+is; an older one (up to JOB_CACHE_MAX_STALE) is served at once while a single
+background refresh replaces it. Past JOB_CACHE_MAX_STALE the caller waits for the
+upstream, and if that fails the old listings are still returned rather than nothing.
+
+An empty listing is only kept for JOB_CACHE_EMPTY_TTL (fresh, never served stale), so
+a transient upstream hiccup that returned no jobs is retried soon.
+
+Tier 1 is an in-process LRU capped by entry count and by the approximate size of the
+stored JSON; tier 2 is a SQLite file (capped by entry count) that survives restarts,
+so a fresh worker starts warm. Every worker process of a deployment opens the same
+file (the default path is keyed by the backend directory, so two deployments on one
+host do not mix): SQLite serializes their writes, in WAL mode so readers never wait,
+and a write that still fails after JOB_CACHE_DB_TIMEOUT only costs the disk copy of
+that entry. The file is opened on first use, one connection per thread, outside the
+memory tier's lock; if it cannot be opened the cache runs memory-only.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable
+
+from metrics import Counter
+
+JOB_CACHE_ENABLED = os.getenv("JOB_CACHE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+# Seconds a listing is fresh, and seconds it may still be served while it refreshes.
+JOB_CACHE_TTL = float(os.getenv("JOB_CACHE_TTL", "3600"))
+JOB_CACHE_MAX_STALE = float(os.getenv("JOB_CACHE_MAX_STALE", "86400"))
+JOB_CACHE_SIZE = int(os.getenv("JOB_CACHE_SIZE", "1000"))
+JOB_CACHE_MAX_BYTES = int(os.getenv("JOB_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Empty = memory only. Shared by all workers of one deployment (see above).
+_deployment = hashlib.sha1(os.path.dirname(os.path.abspath(__file__)).encode("utf-8")).hexdigest()[:8]
+JOB_CACHE_DB = os.getenv(
+    "JOB_CACHE_DB", os.path.join(tempfile.gettempdir(), f"resumeaix_job_cache-{_deployment}.sqlite3")
+).strip()
+JOB_CACHE_DB_SIZE = int(os.getenv("JOB_CACHE_DB_SIZE", "20000"))
+# Seconds a write waits for another worker's SQLite write lock before giving up.
+JOB_CACHE_DB_TIMEOUT = float(os.getenv("JOB_CACHE_DB_TIMEOUT", "1"))
+JOB_CACHE_EMPTY_TTL = float(os.getenv("JOB_CACHE_EMPTY_TTL", "300"))
+
+JOB_CACHE_LOOKUPS = Counter(
+    "resumeaix_job_cache_lookups_total",
+    "Job listing lookups by outcome (hit, stale, miss, fallback).",
+    ("result",),
+)
+
+Jobs = list[dict[str, Any]]
+
+
+def _normalize(value: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9+#.]+", str(value).lower()))
+
+
+def listing_key(role: str, location: str) -> str:
+    return f"{_normalize(role)}|{_normalize(location)}"
+
+
+class JobListingCache:
+    """Two-tier (memory LRU + optional SQLite) stale-while-revalidate job listing cache."""
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_stale: float = 86400.0,
+        max_entries: int = 1000,
+        max_bytes: int = 32 * 1024 * 1024,
+        db_path: str = "",
+        db_max_entries: int = 20000,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.time,
+        empty_ttl: float = 300.0,
+        db_timeout: float = 1.0,
+    ):
+        self.ttl = max(0.0, ttl)
+        self.max_stale = max(self.ttl, max_stale)
+        self.empty_ttl = max(0.0, min(empty_ttl, self.ttl))
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.db_max_entries = max(1, db_max_entries)
+        self.executor = executor
+        self.clock = clock
+        # key -> (fetched_at, jobs, approximate size in bytes)
+        self._mem: OrderedDict[str, tuple[float, Jobs, int]] = OrderedDict()
+        self._bytes = 0
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+        self.db_path = db_path
+        self.db_timeout = db_timeout
+        # SQLite connections are per thread and opened lazily; see _connection.
+        self._local = threading.local()
+        self._db_failed = False
+        self._schema_ready = False
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "fallbacks": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "store_failures": 0,
+            "evictions": 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """This thread's SQLite connection, opened on first use; None = memory only."""
+        if not self.db_path or self._db_failed:
+            return None
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            return db
+        try:
+            # Other workers may hold the write lock briefly; wait up to db_timeout for it.
+            db = sqlite3.connect(self.db_path, timeout=self.db_timeout)
+            if not self._schema_ready:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS job_cache "
+                    "(key TEXT PRIMARY KEY, fetched REAL NOT NULL, payload TEXT NOT NULL)"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS job_cache_fetched ON job_cache (fetched)")
+                db.commit()
+                self._schema_ready = True
+        except (sqlite3.Error, OSError) as exc:
+            # Unwritable directory, corrupt file...: keep serving from memory.
+            self._db_failed = True
+            print(f"[job-cache] {self.db_path} unavailable, memory only: {exc!r}", file=sys.stderr)
+            return None
+        self._local.db = db
+        return db
+
+    def after_fork(self) -> None:
+        """Give a forked worker its own lock and SQLite connections (neither survives fork)."""
+        self._lock = threading.Lock()
+        self._refreshing.clear()
+        self._local = threading.local()
+
+    def _mem_put(self, key: str, fetched: float, jobs: Jobs, size: int) -> None:
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._mem[key] = (fetched, jobs, size)
+        self._bytes += size
+        while len(self._mem) > 1 and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, evicted) = self._mem.popitem(last=False)
+            self._bytes -= evicted
+            self.stats["evictions"] += 1
+
+    def _lookup(self, key: str) -> tuple[float, Jobs] | None:
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                self._mem.move_to_end(key)
+                return item[0], item[1]
+        db = self._connection()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT fetched, payload FROM job_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        fetched, payload = row
+        jobs = json.loads(payload)
+        with self._lock:
+            self._mem_put(key, fetched, jobs, len(payload))
+            self.stats["disk_hits"] += 1
+        return fetched, jobs
+
+    def put(self, role: str, location: str, jobs: Jobs) -> None:
+        self._store(listing_key(role, location), jobs)
+
+    def _store(self, key: str, jobs: Jobs) -> None:
+        fetched = self.clock()
+        payload = json.dumps(jobs, ensure_ascii=False)
+        with self._lock:
+            self._mem_put(key, fetched, jobs, len(payload))
+        # Outside self._lock: a write waiting on another worker must not hold up lookups.
+        db = self._connection()
+        if db is None:
+            return
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO job_cache (key, fetched, payload) VALUES (?, ?, ?)",
+                (key, fetched, payload),
+            )
+            (rows,) = db.execute("SELECT COUNT(*) FROM job_cache").fetchone()
+            if rows > self.db_max_entries:
+                db.execute(
+                    "DELETE FROM job_cache WHERE key IN "
+                    "(SELECT key FROM job_cache ORDER BY fetched LIMIT ?)",
+                    (rows - self.db_max_entries,),
+                )
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+
+    def _refresh(self, key: str, fetch: Callable[[], Jobs]) -> None:
+        try:
+            jobs = fetch()
+            with self._lock:
+                self.stats["refreshes"] += 1
+            self._store_or_count(key, jobs)
+        except Exception:
+            # The stale entry stays in place; the next lookup past TTL retries.
+            with self._lock:
+                self.stats["refresh_failures"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store_or_count(self, key: str, jobs: Jobs) -> None:
+        try:
+            self._store(key, jobs)
+        except Exception:
+            # The listings were fetched; failing to cache them must not lose them.
+            with self._lock:
+                self.stats["store_failures"] += 1
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Jobs]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        try:
+            if self.executor is None:
+                threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+            else:
+                self.executor.submit(self._refresh, key, fetch)
+        except RuntimeError:  # executor already shut down
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, role: str, location: str, fetch: Callable[[], Jobs]) -> Jobs:
+        """
+        Listings for (role, location). ``fetch`` calls the upstream and raises on failure;
+        it runs inline on a miss and in the background for a stale entry. Raises only
+        when the upstream fails and nothing is cached for the key.
+        """
+        key = listing_key(role, location)
+        cached = self._lookup(key)
+        if cached is not None:
+            fetched, jobs = cached
+            age = self.clock() - fetched
+            # An empty result is fresh only briefly and never served stale.
+            if age < (self.ttl if jobs else self.empty_ttl):
+                self._count("hit")
+                return jobs
+            if jobs and age < self.max_stale:
+                self._count("stale")
+                self._schedule_refresh(key, fetch)
+                return jobs
+        try:
+            jobs = fetch()
+        except Exception:
+            if cached is None:
+                self._count("miss")
+                raise
+            self._count("fallback")
+            return cached[1]
+        self._count("miss")
+        self._store_or_count(key, jobs)
+        return jobs
+
+    def _count(self, result: str) -> None:
+        field = {"hit": "hits", "stale": "stale_hits", "miss": "misses", "fallback": "fallbacks"}[result]
+        with self._lock:
+            self.stats[field] += 1
+        JOB_CACHE_LOOKUPS.inc(result=result)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            served = self.stats["hits"] + self.stats["stale_hits"]
+            lookups = served + self.stats["misses"] + self.stats["fallbacks"]
+            return {
+                **self.stats,
+                "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+                "entries": len(self._mem),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "max_stale_seconds": self.max_stale,
+                "empty_ttl_seconds": self.empty_ttl,
+                "refreshing": len(self._refreshing),
+                "disk_tier": bool(self.db_path) and not self._db_failed,
+            }
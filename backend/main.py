@@ -3,13 +3,20 @@ ResumeAIX — FastAPI backend: PDF → pdfminer → Gemini 2.5 Flash (google-gen
 """
 from __future__ import annotations
 
+import asyncio
+import gc
+import io
 import json
+import multiprocessing
 import os
 import re
-import shutil
 import sys
-import uuid
-from typing import Any
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, BinaryIO
 
 # Windows consoles often default to cp1252; printing Unicode (or logging) can raise UnicodeEncodeError.
 if hasattr(sys.stdout, "reconfigure"):
@@ -30,18 +37,138 @@ def _log(msg: object) -> None:
         pass
 
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import Body, FastAPI, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from google import genai
-from google.genai import types
-from pdfminer.high_level import extract_text as pdfminer_extract_text
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from admission import Rejected, admission_controller
+from analysis_cache import analysis_cache, bytes_key, text_key
+from gemini_gateway import gemini_gateway, prompt_key
+from job_cache import (
+    JOB_CACHE_DB,
+    JOB_CACHE_DB_SIZE,
+    JOB_CACHE_DB_TIMEOUT,
+    JOB_CACHE_EMPTY_TTL,
+    JOB_CACHE_ENABLED,
+    JOB_CACHE_MAX_BYTES,
+    JOB_CACHE_MAX_STALE,
+    JOB_CACHE_SIZE,
+    JOB_CACHE_TTL,
+    JobListingCache,
+)
+from near_duplicates import (
+    NEAR_DUP_ENABLED,
+    NEAR_DUP_INDEX_SIZE,
+    NEAR_DUP_THRESHOLD,
+    LSHIndex,
+    estimated_jaccard,
+    minhash_signature,
+    signature_bytes,
+    signature_from_bytes,
+    stored_band_keys,
+)
+import pdf_extractor
+from metrics import (
+    GEMINI_FALLBACKS,
+    HTTP_REQUEST_SECONDS,
+    JSEARCH_ERRORS,
+    PDF_PAGES,
+    UPLOAD_BYTES,
+    begin_request_timings,
+    render_prometheus,
+    server_timing_header,
+    stage,
+)
+from prompt_compactor import GEMINI_PROMPT_TOKEN_BUDGET, compact_resume_text
+from role_scoring import ROLE_KEYWORDS, RoleScorer, keyword_ats_score
 
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "").strip()
 RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST", "jsearch.p.rapidapi.com").strip()
-_genai_client = genai.Client(api_key=GEMINI_API_KEY) if GEMINI_API_KEY else None
+JSEARCH_URL = os.getenv("JSEARCH_URL", "https://jsearch.p.rapidapi.com/search").strip()
+# Per-role socket timeout and overall budget for one fan-out across all roles (seconds).
+JSEARCH_TIMEOUT = float(os.getenv("JSEARCH_TIMEOUT", "8"))
+JSEARCH_DEADLINE = float(os.getenv("JSEARCH_DEADLINE", "12"))
+JSEARCH_MAX_WORKERS = int(os.getenv("JSEARCH_MAX_WORKERS", "8"))
+JSEARCH_LOCATION = os.getenv("JSEARCH_LOCATION", "India").strip()
+JSEARCH_COUNTRY = os.getenv("JSEARCH_COUNTRY", "in").strip()
+# pdfminer runs in a process pool (0 = run it in the I/O thread pool instead);
+# Gemini / JSearch blocking calls run in a bounded thread pool off the event loop.
+# Jobs are reranked against the resume with the MiniLM model from matcher.py: each role
+# fetches a pool of JOB_RERANK_POOL listings and keeps the best JOBS_PER_ROLE.
+JOB_RERANK_ENABLED = os.getenv("JOB_RERANK_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+JOB_RERANK_POOL = int(os.getenv("JOB_RERANK_POOL", "10"))
+# After a failed model load, rerank is skipped for this many seconds, doubling per
+# consecutive failure up to JOB_RERANK_RETRY_MAX, then the load is tried again.
+JOB_RERANK_RETRY_SECONDS = float(os.getenv("JOB_RERANK_RETRY_SECONDS", "30"))
+JOB_RERANK_RETRY_MAX = float(os.getenv("JOB_RERANK_RETRY_MAX", "600"))
+JOBS_PER_ROLE = int(os.getenv("JOBS_PER_ROLE", "5"))
+JOB_DESCRIPTION_CHARS = 600
+# Comma list of resources to load at startup: "gemini", "pdf", "matcher", "database",
+# "rerank" (or "all"). Empty = everything loads lazily on first use, except that the
+# rerank embedding model always loads at startup while JOB_RERANK_ENABLED is on.
+WARMUP = {x.strip().lower() for x in os.getenv("WARMUP", "").split(",") if x.strip()}
+if "all" in WARMUP:
+    WARMUP = {"gemini", "pdf", "matcher", "database"}
+if JOB_RERANK_ENABLED and "matcher" not in WARMUP:
+    WARMUP.add("rerank")
+# Store every analyzed profile in MongoDB (database.save_candidate); near-duplicate
+# uploads then also match profiles stored by other workers and earlier runs.
+SAVE_CANDIDATES = os.getenv("SAVE_CANDIDATES", "0").strip().lower() in ("1", "true", "yes")
+# Keep the extracted text with each stored profile so rescore_candidates.py can
+# recompute scores after a skill-list change without the original PDFs.
+STORE_RESUME_TEXT = os.getenv("STORE_RESUME_TEXT", "1").strip().lower() not in ("0", "false", "no")
+# Create the /candidates search indexes in the background at startup (idempotent).
+# Defaults to SAVE_CANDIDATES so a worker that never stores profiles opens no client.
+_ensure_indexes_default = "1" if SAVE_CANDIDATES else "0"
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", _ensure_indexes_default).strip().lower() not in ("0", "false", "no")
+PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+# The pool starts after the Gemini / JSearch / database threads, so its workers must not
+# be forked from this process (a child could inherit a lock another thread held).
+# "forkserver" forks them from a clean single-threaded server; "spawn" where unavailable.
+PDF_START_METHOD = os.getenv(
+    "PDF_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+).strip().lower()
+ANALYZE_IO_WORKERS = int(os.getenv("ANALYZE_IO_WORKERS", "16"))
+# Analyses one /analyze/batch request runs at once; each takes an admission slot, so
+# with admission control on this is capped by ADMISSION_BATCH_MAX_INFLIGHT.
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+# Uploads never touch UPLOAD_DIR: Starlette spools large multipart parts, we read them
+# into memory in chunks and hand pdfminer a BytesIO. Caps are enforced while reading.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# Uncompressed bytes a batch's ZIP archives may expand to (checked before decompressing).
+MAX_BATCH_EXPANDED_BYTES = int(os.getenv("MAX_BATCH_EXPANDED_BYTES", str(MAX_BATCH_UPLOAD_BYTES)))
+UPLOAD_CHUNK_BYTES = 256 * 1024
+# Fallback analyses that start within FALLBACK_BATCH_WINDOW_MS of each other (e.g. the
+# items of a batch upload) are scored together, up to FALLBACK_BATCH_MAX at a time.
+FALLBACK_BATCH_MAX = int(os.getenv("FALLBACK_BATCH_MAX", "64"))
+FALLBACK_BATCH_WINDOW_MS = float(os.getenv("FALLBACK_BATCH_WINDOW_MS", "2"))
+# Gemini calls get their own threads: gateway rate/slot waits can last up to
+# GEMINI_DEADLINE and must not starve the fallback, jobs, rerank and store stages.
+GEMINI_IO_WORKERS = int(os.getenv("GEMINI_IO_WORKERS", "16"))
+# Per-request HTTP timeout (seconds) so a hung call cannot hold a gateway slot forever.
+GEMINI_HTTP_TIMEOUT = float(os.getenv("GEMINI_HTTP_TIMEOUT", "30"))
+# google-genai adds ~0.6 s to import time, so the client is built on first use (or warmup).
+_genai_client = None
+
+
+def _get_genai_client():
+    global _genai_client
+    if _genai_client is None and GEMINI_API_KEY:
+        from google import genai
+        from google.genai import types
+
+        _genai_client = genai.Client(
+            api_key=GEMINI_API_KEY,
+            http_options=types.HttpOptions(timeout=int(GEMINI_HTTP_TIMEOUT * 1000)),
+        )
+    return _genai_client
 
 ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -53,6 +180,102 @@ ALLOWED_ORIGINS = [
 ]
 
 app = FastAPI(title="ResumeAIX API", version="2.0")
+
+
+def _admission_lane(request: Request) -> str | None:
+    """Lane for an analysis request (None = not admission-controlled)."""
+    path = request.url.path.rstrip("/")
+    if request.method != "POST":
+        return None
+    if path.endswith("/analyze/batch"):
+        return "batch"
+    if path.endswith(("/analyze", "/analyze/stream")):
+        # Clients may volunteer background work into the batch lane, never the reverse.
+        return "batch" if request.headers.get("x-priority", "").strip().lower() == "batch" else "interactive"
+    return None
+
+
+def _batch_concurrency() -> int:
+    """Analyses one /analyze/batch request runs at once; it holds that many batch-lane slots."""
+    if admission_controller is None:
+        return max(1, BATCH_CONCURRENCY)
+    return admission_controller.slots_for("batch", BATCH_CONCURRENCY)
+
+
+@app.middleware("http")
+async def _admit_analysis(request: Request, call_next):
+    """Bound the analyses in flight per worker; refuse with 429 before the body is read."""
+    lane = _admission_lane(request) if admission_controller is not None else None
+    if lane is None:
+        return await call_next(request)
+    slots = _batch_concurrency() if request.url.path.rstrip("/").endswith("/analyze/batch") else 1
+    try:
+        with stage("queue"):
+            granted_at = await admission_controller.acquire(lane, slots)
+    except Rejected as exc:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": f"Server busy ({exc.lane} queue {exc.reason}); retry in {exc.retry_after}s."},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    try:
+        response = await call_next(request)
+    except BaseException:
+        admission_controller.release(lane, granted_at, slots)
+        raise
+    # Batch and SSE bodies are still being produced here: hold the slot until they end.
+    body = response.body_iterator
+
+    async def release_when_sent():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            admission_controller.release(lane, granted_at, slots)
+
+    response.body_iterator = release_when_sent()
+    return response
+
+
+@app.middleware("http")
+async def _reject_oversized_uploads(request: Request, call_next):
+    """Refuse oversized bodies from Content-Length before the multipart form is parsed."""
+    if request.method == "POST" and request.url.path.rstrip("/").endswith("/analyze/batch"):
+        limit = MAX_BATCH_UPLOAD_BYTES
+    elif request.method == "POST" and request.url.path.rstrip("/").endswith(("/analyze", "/analyze/stream")):
+        limit = MAX_UPLOAD_BYTES + 64 * 1024  # multipart framing overhead
+    else:
+        limit = 0
+    length = request.headers.get("content-length", "")
+    if limit and length.isdigit() and int(length) > limit:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload too large; the limit is {limit:,} bytes."},
+        )
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def _observe_request(request: Request, call_next):
+    """Record request latency per route and report pipeline stage timings as Server-Timing."""
+    timings = begin_request_timings()
+    started = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    # Streamed bodies (batch / SSE) are still running here: their header and latency
+    # cover the work done before the first byte.
+    response.headers["Server-Timing"] = server_timing_header(timings, elapsed)
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(
+        elapsed,
+        route=getattr(route, "path", "unmatched"),
+        method=request.method,
+        status=response.status_code,
+    )
+    return response
+
+
+# Added last so CORS stays outermost and 413s still carry CORS headers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
@@ -61,9 +284,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 ATS_JSON_SCHEMA = {
     "type": "object",
     "properties": {
@@ -107,10 +327,14 @@ def _normalize_resume_text(text: str) -> str:
     return text.encode("utf-8", errors="replace").decode("utf-8", errors="replace").strip()
 
 
-def extract_pdf_text(path: str) -> str:
+def _pdfminer_text(source: str | bytes | BinaryIO) -> str:
+    """Path/bytes/file in, plain str out."""
+    return _normalize_resume_text(pdf_extractor.extract_text(source) or "")
+
+
+def extract_pdf_text(source: str | bytes | BinaryIO) -> str:
     try:
-        raw = pdfminer_extract_text(path) or ""
-        return _normalize_resume_text(raw)
+        return _pdfminer_text(source)
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -118,10 +342,126 @@ def extract_pdf_text(path: str) -> str:
         )
 
 
+_io_pool = ThreadPoolExecutor(max_workers=ANALYZE_IO_WORKERS, thread_name_prefix="analyze-io")
+_gemini_pool = ThreadPoolExecutor(max_workers=GEMINI_IO_WORKERS, thread_name_prefix="gemini")
+_pdf_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor | ThreadPoolExecutor:
+    global _pdf_pool
+    if PDF_PROCESS_WORKERS <= 0:
+        return _io_pool
+    if _pdf_pool is None:
+        context = multiprocessing.get_context(PDF_START_METHOD)
+        if PDF_START_METHOD == "forkserver":
+            # Workers fork from a server that already imported pdfminer, not from main.
+            context.set_forkserver_preload(["pdf_extractor"])
+        _pdf_pool = ProcessPoolExecutor(max_workers=PDF_PROCESS_WORKERS, mp_context=context)
+    return _pdf_pool
+
+
+async def _run_io(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_io_pool, fn, *args)
+
+
+async def _run_gemini(resume_text: str) -> dict[str, Any]:
+    return await asyncio.get_running_loop().run_in_executor(_gemini_pool, analyze_resume_with_gemini, resume_text)
+
+
+class _MicroBatcher:
+    """Collects concurrent single-item calls into one ``fn(items) -> results`` call on the I/O pool."""
+
+    def __init__(self, fn, max_batch: int, window: float):
+        self.fn = fn
+        self.max_batch = max(1, max_batch)
+        self.window = max(0.0, window)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # The loop only keeps weak references to tasks; hold running batches until done.
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # A new event loop (restart / test client): nothing queued on the old one survives.
+            self._loop, self._pending, self._timer, self._running = loop, [], None, set()
+        fut = loop.create_future()
+        self._pending.append((item, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await _run_io(self.fn, [item for item, _ in batch])
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+async def extract_pdf_text_async(data: bytes) -> str:
+    """Non-blocking extract_pdf_text: pdfminer runs in the bounded process pool."""
+    global _pdf_pool
+    try:
+        pool = _get_pdf_pool()
+        if pdf_extractor.PDF_PARALLEL_PAGES <= 0 or not isinstance(pool, ProcessPoolExecutor):
+            # pdf_extractor, not a main.py function: the workers never import this module.
+            text = await asyncio.get_running_loop().run_in_executor(pool, pdf_extractor.extract_text, data)
+            return _normalize_resume_text(text or "")
+        return _normalize_resume_text(await _extract_pages_in_parallel(pool, data))
+    except BrokenProcessPool:
+        # A worker died (OOM / segfault in a hostile PDF); start a fresh pool next time.
+        _pdf_pool = None
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"PDF read error: {type(e).__name__}",
+        )
+
+
+async def _extract_pages_in_parallel(pool: ProcessPoolExecutor, data: bytes) -> str:
+    """Extract the first PDF_PARALLEL_PAGES pages; split any remaining pages across the workers."""
+    loop = asyncio.get_running_loop()
+    head_pages = pdf_extractor.PDF_PARALLEL_PAGES
+    head, total = await loop.run_in_executor(pool, pdf_extractor.extract_page_range, data, 0, head_pages)
+    last = min(total, pdf_extractor.PDF_MAX_PAGES) if pdf_extractor.PDF_MAX_PAGES else total
+    target = pdf_extractor.PDF_TARGET_CHARS
+    if last <= head_pages or (target and len(head) >= target):
+        return head
+    ranges = pdf_extractor.split_pages(head_pages, last, PDF_PROCESS_WORKERS)
+    parts = await asyncio.gather(
+        *(loop.run_in_executor(pool, pdf_extractor.extract_page_range, data, first, end) for first, end in ranges)
+    )
+    # Page by page, so the result stops where a sequential extraction would have.
+    return pdf_extractor.join_pages([head, *(part for part, _ in parts)], target)
+
+
 def analyze_resume_with_gemini(resume_text: str) -> dict[str, Any]:
-    if _genai_client is None:
+    client = _get_genai_client()
+    if client is None:
         raise RuntimeError("GEMINI_API_KEY missing")
-    truncated = _normalize_resume_text(resume_text)[:28000]
+    from google.genai import types
+
+    truncated = compact_resume_text(_normalize_resume_text(resume_text), GEMINI_PROMPT_TOKEN_BUDGET)
     system = """
 You are an expert Career Counselor for Indian job seekers.
 Analyze the resume text deeply and return ONLY valid JSON.
@@ -140,8 +480,9 @@ The output must be concrete and personalized (not generic).
         "6) Avoid boilerplate.\n"
         f"\n--- RESUME ---\n{truncated}\n--- END ---\n"
     )
-    try:
-        response = _genai_client.models.generate_content(
+
+    def generate() -> dict[str, Any]:
+        response = client.models.generate_content(
             model="gemini-2.5-flash",
             contents=user,
             config=types.GenerateContentConfig(
@@ -151,8 +492,12 @@ The output must be concrete and personalized (not generic).
             ),
         )
         raw = response.text
-        data = json.loads(raw)
-        return data
+        return json.loads(raw)
+
+    try:
+        # Identical in-flight prompts share one call; rate, concurrency and retries are
+        # enforced by the gateway.
+        return gemini_gateway.call(prompt_key("gemini-2.5-flash", user), generate)
     except Exception as e:
         _log(f"[Gemini] {type(e).__name__}: {e!r}")
         safe_detail = str(e).encode("ascii", "backslashreplace").decode("ascii")
@@ -162,71 +507,27 @@ The output must be concrete and personalized (not generic).
         )
 
 
+_role_scorer = RoleScorer(ROLE_KEYWORDS)
+
+
 def analyze_resume_fallback(resume_text: str) -> dict[str, Any]:
     """Local heuristic ATS analysis used when Gemini key is unavailable."""
-    text = _normalize_resume_text(resume_text).lower()
-    role_keywords: dict[str, list[str]] = {
-        "Data Scientist": [
-            "python",
-            "pandas",
-            "numpy",
-            "scikit",
-            "machine learning",
-            "tensorflow",
-            "pytorch",
-            "sql",
-            "statistics",
-            "power bi",
-        ],
-        "Backend Developer": [
-            "python",
-            "fastapi",
-            "django",
-            "flask",
-            "api",
-            "sql",
-            "postgresql",
-            "redis",
-            "docker",
-            "aws",
-        ],
-        "Frontend Developer": [
-            "javascript",
-            "typescript",
-            "react",
-            "next.js",
-            "html",
-            "css",
-            "redux",
-            "tailwind",
-            "webpack",
-            "api",
-        ],
-        "DevOps Engineer": [
-            "docker",
-            "kubernetes",
-            "jenkins",
-            "github actions",
-            "terraform",
-            "aws",
-            "azure",
-            "gcp",
-            "linux",
-            "monitoring",
-        ],
-    }
+    return analyze_resumes_fallback([resume_text])[0]
+
+
+def analyze_resumes_fallback(resume_texts: list[str]) -> list[dict[str, Any]]:
+    """analyze_resume_fallback for many resumes; roles are scored in one matrix product."""
+    texts = [_normalize_resume_text(t).lower() for t in resume_texts]
+    return [_fallback_payload(ranking) for ranking in _role_scorer.top_k(texts, k=4)]
 
-    ranking: list[tuple[str, list[str], int]] = []
-    for role, keywords in role_keywords.items():
-        matched = [k for k in keywords if k in text]
-        ranking.append((role, matched, len(keywords)))
-    ranking.sort(key=lambda item: len(item[1]), reverse=True)
-    best_role, best_match, best_total = ranking[0]
-    recommended_roles = [r[0] for r in ranking[:4]]
-
-    missing = [k for k in role_keywords.get(best_role, []) if k not in best_match]
-    ratio = (len(best_match) / max(1, best_total)) * 100
-    ats_score = int(max(35, min(95, round(40 + ratio * 0.55))))
+
+def _fallback_payload(ranking: list[dict[str, Any]]) -> dict[str, Any]:
+    best_role, best_match = ranking[0]["role"], ranking[0]["matched"]
+    best_total = len(ROLE_KEYWORDS[best_role])
+    recommended_roles = [r["role"] for r in ranking]
+
+    missing = [k for k in ROLE_KEYWORDS.get(best_role, []) if k not in best_match]
+    ats_score = keyword_ats_score(len(best_match), best_total)
     roadmap = [
         {
             "step": 1,
@@ -261,9 +562,135 @@ def analyze_resume_fallback(resume_text: str) -> dict[str, Any]:
         "missing_skills": missing[:12],
         "learning_roadmap": roadmap,
         "custom_suggestion": suggestion,
+        "role_scores": [{"role": r["role"], "score": r["score"]} for r in ranking],
     }
 
 
+_fallback_batcher = _MicroBatcher(analyze_resumes_fallback, FALLBACK_BATCH_MAX, FALLBACK_BATCH_WINDOW_MS / 1000)
+
+
+# Recent analyses of this worker, by MinHash signature; stored profiles are looked up
+# through database.find_near_duplicates when SAVE_CANDIDATES is on.
+_near_dup_index = LSHIndex(max_entries=NEAR_DUP_INDEX_SIZE) if NEAR_DUP_ENABLED else None
+
+
+def _find_near_duplicate(text: str) -> tuple[Any, dict[str, Any] | None]:
+    """(signature, match); match = {"analysis", "candidate_id", "source", "similarity"} of the closest earlier resume."""
+    signature = minhash_signature(text)
+    if signature is None:
+        return None, None
+    found = _near_dup_index.best_match(signature, NEAR_DUP_THRESHOLD)
+    if found is not None:
+        payload, similarity = found
+        return signature, {**payload, "similarity": similarity}
+    if not SAVE_CANDIDATES:
+        return signature, None
+    best = None
+    try:
+        import database
+
+        for doc in database.find_near_duplicates(stored_band_keys(signature)):
+            stored = signature_from_bytes(doc.get("minhash") or b"")
+            if len(stored) != len(signature) or not doc.get("analysis"):
+                continue
+            similarity = estimated_jaccard(signature, stored)
+            if similarity >= NEAR_DUP_THRESHOLD and (best is None or similarity > best["similarity"]):
+                best = {
+                    "analysis": doc["analysis"],
+                    "candidate_id": str(doc["_id"]),
+                    "source": doc.get("analysis_source"),
+                    "similarity": similarity,
+                }
+    except Exception as exc:
+        _log(f"[dedupe] stored-profile lookup skipped: {type(exc).__name__}: {exc!r}")
+    if best is not None:
+        _near_dup_index.add({k: best[k] for k in ("analysis", "candidate_id", "source")}, signature)
+    return signature, best
+
+
+def _remember_analysis(
+    filename: str,
+    text: str,
+    source: str,
+    signature: Any,
+    summary: dict[str, Any],
+    details: dict[str, str],
+    duplicate: dict[str, Any] | None,
+) -> None:
+    """Index a new analysis for near-duplicate lookups and store its profile, or link a duplicate to the original."""
+    if duplicate is not None:
+        if SAVE_CANDIDATES and duplicate.get("candidate_id"):
+            import database
+
+            database.link_duplicate(duplicate["candidate_id"], filename, duplicate["similarity"])
+        return
+    candidate_id = None
+    if SAVE_CANDIDATES:
+        import database
+        from bson import ObjectId
+
+        # Client-side id, so the in-memory index can point at the profile before the
+        # buffered writer has inserted it.
+        candidate_id = ObjectId()
+        doc = {
+            "_id": candidate_id,
+            "filename": filename,
+            "candidate_name": details.get("candidate_name", "Not found"),
+            "predicted_role": summary["predicted_role"],
+            "ats_score": summary["ats_score"],
+            "skills": sorted({s.lower() for s in summary["matched_skills"]}),
+            "analysis": summary,
+            # "gemini" or "fallback": rescore_candidates.py only replaces fallback scores.
+            "analysis_source": source,
+        }
+        if STORE_RESUME_TEXT:
+            doc["resume_text"] = text
+        if signature is not None:
+            doc.update(minhash=signature_bytes(signature), lsh_bands=stored_band_keys(signature))
+        database.save_candidate(doc)
+    if signature is not None and _near_dup_index is not None:
+        _near_dup_index.add(
+            {"analysis": summary, "candidate_id": candidate_id and str(candidate_id), "source": source}, signature
+        )
+
+
+async def _near_duplicate_of(text: str) -> tuple[Any, dict[str, Any] | None]:
+    if _near_dup_index is None:
+        return None, None
+    with stage("dedupe"):
+        return await _run_io(_find_near_duplicate, text)
+
+
+async def _remember(
+    filename: str,
+    text: str,
+    source: str,
+    signature: Any,
+    summary: dict[str, Any],
+    details: dict[str, str],
+    duplicate: dict[str, Any] | None,
+) -> None:
+    # Bookkeeping only: a failure here must not fail an analysis that already succeeded.
+    try:
+        with stage("store"):
+            await _run_io(_remember_analysis, filename, text, source, signature, summary, details, duplicate)
+    except Exception as exc:
+        _log(f"[dedupe] {type(exc).__name__}: {exc!r}")
+
+
+def _cacheable(source: str, duplicate: dict[str, Any] | None) -> bool:
+    """
+    False for a local fallback analysis, or a near-duplicate reusing one: Gemini just
+    failed (timeout, 429), and a cached copy would outlive the outage by the full TTL.
+    """
+    origin = duplicate.get("source") if duplicate is not None else source
+    return origin != "fallback"
+
+
+def _near_duplicate_field(duplicate: dict[str, Any]) -> dict[str, Any]:
+    return {"candidate_id": duplicate.get("candidate_id"), "similarity": round(duplicate["similarity"], 4)}
+
+
 def _extract_candidate_details(resume_text: str) -> dict[str, str]:
     lines = [ln.strip() for ln in resume_text.splitlines() if ln.strip()]
     email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", resume_text)
@@ -292,64 +719,291 @@ def _extract_candidate_details(resume_text: str) -> dict[str, str]:
     }
 
 
-def fetch_jsearch_jobs(predicted_role: str, limit: int = 5) -> list[dict[str, Any]]:
-    query = f"{predicted_role} in India"
-    out: list[dict[str, Any]] = []
-    if not RAPIDAPI_KEY:
-        return out
+# One keep-alive pool shared by every JSearch call, and a bounded executor for role fan-out.
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=JSEARCH_MAX_WORKERS)
+_http_session.mount("https://", _http_adapter)
+_http_session.mount("http://", _http_adapter)
+_jsearch_pool = ThreadPoolExecutor(max_workers=JSEARCH_MAX_WORKERS, thread_name_prefix="jsearch")
 
+
+_job_cache = (
+    JobListingCache(
+        JOB_CACHE_TTL,
+        JOB_CACHE_MAX_STALE,
+        JOB_CACHE_SIZE,
+        JOB_CACHE_MAX_BYTES,
+        JOB_CACHE_DB,
+        JOB_CACHE_DB_SIZE,
+        executor=_jsearch_pool,
+        empty_ttl=JOB_CACHE_EMPTY_TTL,
+        db_timeout=JOB_CACHE_DB_TIMEOUT,
+    )
+    if JOB_CACHE_ENABLED
+    else None
+)
+
+
+def _jsearch_request(predicted_role: str, timeout: float | None = None) -> list[dict[str, Any]]:
+    """One page of JSearch listings for the role; raises on any upstream failure."""
     try:
-        r = requests.get(
-            "https://jsearch.p.rapidapi.com/search",
+        r = _http_session.get(
+            JSEARCH_URL,
             headers={
                 "X-RapidAPI-Key": RAPIDAPI_KEY,
                 "X-RapidAPI-Host": RAPIDAPI_HOST,
             },
             params={
-                "query": query,
+                "query": f"{predicted_role} in {JSEARCH_LOCATION}",
                 "page": "1",
                 "num_pages": "1",
-                "country": "in",
+                "country": JSEARCH_COUNTRY,
             },
-            timeout=20,
+            timeout=timeout if timeout is not None else JSEARCH_TIMEOUT,
         )
         r.raise_for_status()
         payload = r.json()
-        jobs = payload.get("data") or []
-        for j in jobs:
-            if len(out) >= limit:
-                break
-            apply_link = j.get("job_apply_link") or j.get("job_google_link") or "#"
-            out.append(
-                {
-                    "employer_name": j.get("employer_name") or "Hiring Company",
-                    "job_title": j.get("job_title") or predicted_role,
-                    "job_apply_link": apply_link,
-                    "location": ", ".join(
-                        [x for x in [j.get("job_city"), j.get("job_country")] if x]
-                    )
-                    or "India",
-                    "job_employment_type": j.get("job_employment_type") or "Full-time",
-                }
-            )
     except Exception as exc:
+        JSEARCH_ERRORS.inc(reason="http")
         _log(f"[JSearch] {type(exc).__name__}: {exc!r}")
-    return out[:limit]
+        raise
+    out: list[dict[str, Any]] = []
+    for j in payload.get("data") or []:
+        apply_link = j.get("job_apply_link") or j.get("job_google_link") or "#"
+        out.append(
+            {
+                "employer_name": j.get("employer_name") or "Hiring Company",
+                "job_title": j.get("job_title") or predicted_role,
+                "job_apply_link": apply_link,
+                "location": ", ".join(
+                    [x for x in [j.get("job_city"), j.get("job_country")] if x]
+                )
+                or JSEARCH_LOCATION,
+                "job_employment_type": j.get("job_employment_type") or "Full-time",
+                "job_description": str(j.get("job_description") or "")[:JOB_DESCRIPTION_CHARS],
+            }
+        )
+    return out
 
 
-def fetch_jobs_for_roles(roles: list[str], per_role_limit: int = 5) -> dict[str, list[dict[str, Any]]]:
-    grouped: dict[str, list[dict[str, Any]]] = {}
+def fetch_jsearch_jobs(
+    predicted_role: str, limit: int = 5, timeout: float | None = None
+) -> list[dict[str, Any]]:
+    """Up to ``limit`` listings for the role, through the job listing cache when enabled."""
+    if not RAPIDAPI_KEY:
+        return []
+    try:
+        if _job_cache is None:
+            jobs = _jsearch_request(predicted_role, timeout)
+        else:
+            jobs = _job_cache.get(
+                predicted_role, JSEARCH_LOCATION, lambda: _jsearch_request(predicted_role, timeout)
+            )
+    except Exception:
+        return []
+    return jobs[:limit]
+
+
+def fetch_jobs_for_roles(
+    roles: list[str], per_role_limit: int = 5, deadline: float | None = None
+) -> dict[str, list[dict[str, Any]]]:
+    """Fetch jobs for all roles concurrently; roles still pending at the deadline get []."""
+    role_names: list[str] = []
     for role in roles:
         role_name = str(role).strip()
-        if not role_name:
-            continue
-        grouped[role_name] = fetch_jsearch_jobs(role_name, per_role_limit)
+        if role_name and role_name not in role_names:
+            role_names.append(role_name)
+    grouped: dict[str, list[dict[str, Any]]] = {name: [] for name in role_names}
+    if not role_names or not RAPIDAPI_KEY:
+        return grouped
+
+    budget = JSEARCH_DEADLINE if deadline is None else deadline
+    ends_at = time.monotonic() + budget
+    pending = {
+        _jsearch_pool.submit(fetch_jsearch_jobs, name, per_role_limit): name for name in role_names
+    }
+    while pending:
+        remaining = ends_at - time.monotonic()
+        if remaining <= 0:
+            break
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for fut in done:
+            name = pending.pop(fut)
+            try:
+                grouped[name] = fut.result()
+            except Exception as exc:
+                _log(f"[JSearch] {name}: {type(exc).__name__}: {exc!r}")
+    for fut, name in pending.items():
+        fut.cancel()
+        JSEARCH_ERRORS.inc(reason="deadline")
+        _log(f"[JSearch] deadline {budget:.1f}s exceeded for role {name!r}; returning partial results")
     return grouped
 
 
+# Consecutive matcher load failures and the monotonic time before which rerank is skipped.
+_rerank_failures = 0
+_rerank_retry_at = 0.0
+
+
+def _rerank_model_ready() -> bool:
+    """Load the embedding model (normally done by warmup); False while backing off after a failure."""
+    global _rerank_failures, _rerank_retry_at
+    if time.monotonic() < _rerank_retry_at:
+        return False
+    try:
+        import matcher
+
+        matcher.get_model()
+    except Exception as exc:
+        # Missing sentence-transformers or model files: back off instead of retrying the
+        # load on every request, but try again later in case the failure was transient.
+        _rerank_failures += 1
+        backoff = min(JOB_RERANK_RETRY_MAX, JOB_RERANK_RETRY_SECONDS * 2 ** (_rerank_failures - 1))
+        _rerank_retry_at = time.monotonic() + backoff
+        _log(f"[rerank] matcher unavailable, retrying in {backoff:.0f}s: {type(exc).__name__}: {exc!r}")
+        return False
+    _rerank_failures = 0
+    return True
+
+
+def rerank_jobs_for_resume(
+    resume_text: str, jobs_by_role: dict[str, list[dict[str, Any]]], top_k: int = JOBS_PER_ROLE
+) -> dict[str, list[dict[str, Any]]]:
+    """Order each role's listings by similarity to the resume; plain truncation if unavailable."""
+    truncated = {role: jobs[:top_k] for role, jobs in jobs_by_role.items()}
+    if not JOB_RERANK_ENABLED or not any(jobs_by_role.values()) or not _rerank_model_ready():
+        return truncated
+    try:
+        import matcher
+
+        return matcher.rank_jobs(resume_text, jobs_by_role, top_k)
+    except Exception as exc:
+        _log(f"[rerank] {type(exc).__name__}: {exc!r}")
+        return truncated
+
+
+def _warm(resource: str) -> str:
+    """Load ``resource``; returns its /ready state ("ready", or "degraded: ..." if optional and unavailable)."""
+    if resource == "gemini":
+        _get_genai_client()
+    elif resource == "pdf":
+        pool = _get_pdf_pool()
+        if isinstance(pool, ProcessPoolExecutor):
+            # Start the workers now so the first upload doesn't pay for it.
+            started = [pool.submit(pdf_extractor.split_pages, 0, 1, 1) for _ in range(PDF_PROCESS_WORKERS)]
+            for future in started:
+                future.result()
+    elif resource == "matcher":
+        import matcher
+
+        matcher.warmup()
+    elif resource == "rerank":
+        # Optional: without the model listings are only truncated, so a failed load
+        # (logged, and retried with backoff) must not hold /ready at 503.
+        if not _rerank_model_ready():
+            return "degraded: embedding model unavailable"
+        import matcher
+
+        # The first inference starts torch's thread pool; keep that off the first request too.
+        matcher.embed_texts(["warmup"])
+    elif resource == "database":
+        import database
+
+        if not database.ping():
+            raise ConnectionError("MongoDB ping failed")
+    return "ready"
+
+
+def _run_warmup() -> None:
+    for resource in sorted(WARMUP):
+        started = time.perf_counter()
+        try:
+            _warmup_state[resource] = _warm(resource)
+            _log(f"[warmup] {resource} {_warmup_state[resource]} in {time.perf_counter() - started:.2f}s")
+        except Exception as exc:
+            _warmup_state[resource] = f"failed: {type(exc).__name__}"
+            _log(f"[warmup] {resource} {type(exc).__name__}: {exc!r}")
+
+
+_warmup_state: dict[str, str] = {resource: "pending" for resource in WARMUP}
+
+
+def preload_for_fork() -> None:
+    """
+    Pre-fork server parent (gunicorn.conf.py): load read-only model state once so the
+    forked workers share it copy-on-write. Pools, clients and sockets stay per worker.
+    """
+    started = time.perf_counter()
+    try:
+        import matcher
+
+        matcher.preload()
+        _log(f"[preload] matcher ready in {time.perf_counter() - started:.2f}s")
+    except Exception as exc:
+        _log(f"[preload] matcher {type(exc).__name__}: {exc!r}")
+    # Move everything loaded so far out of the collector's reach: a GC pass in a worker
+    # would otherwise write to every object header and un-share the pages.
+    gc.freeze()
+
+
+def after_fork() -> None:
+    """Per-worker reset after fork: SQLite connections and locks are not fork-safe."""
+    analysis_cache.after_fork()
+    if _job_cache is not None:
+        _job_cache.after_fork()
+
+
+_index_setup: Future | None = None
+
+
+@app.on_event("startup")
+async def _start_warmup() -> None:
+    global _index_setup
+    if WARMUP:
+        # Don't hold up startup: /health answers at once, /ready flips when warmup ends.
+        asyncio.get_running_loop().run_in_executor(_io_pool, _run_warmup)
+    if MONGO_ENSURE_INDEXES:
+        _index_setup = _io_pool.submit(_ensure_candidate_indexes)
+
+
+def _ensure_candidate_indexes() -> None:
+    try:
+        import database
+
+        database.ensure_indexes()
+        _log("[DB] candidate search indexes ready")
+    except Exception as exc:
+        _log(f"[DB] index setup skipped: {type(exc).__name__}: {exc!r}")
+
+
+@app.on_event("shutdown")
+def _shutdown_pools() -> None:
+    # Index setup still in flight would race the client close below: drop it if it has
+    # not started, otherwise give it up to 10 s (past the client's selection timeout).
+    if _index_setup is not None and not _index_setup.cancel():
+        wait([_index_setup], timeout=10)
+    # Flush queued candidate writes first; only if the database module was ever used.
+    close_database = getattr(sys.modules.get("database"), "close", None)
+    if close_database is not None:
+        close_database()
+    _io_pool.shutdown(wait=False, cancel_futures=True)
+    _gemini_pool.shutdown(wait=False, cancel_futures=True)
+    _jsearch_pool.shutdown(wait=False, cancel_futures=True)
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+
+
 @app.get("/")
 def root():
-    return {"service": "ResumeAIX", "health": "/health", "analyze": "POST /analyze"}
+    return {
+        "service": "ResumeAIX",
+        "health": "/health",
+        "analyze": "POST /analyze",
+        "analyze_batch": "POST /analyze/batch",
+        "analyze_stream": "POST /analyze/stream",
+        "candidates": "GET /candidates",
+        "report": "POST /report",
+    }
 
 
 @app.get("/health")
@@ -357,6 +1011,123 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready():
+    """Report which heavy resources are loaded; 503 until requested warmups finish."""
+    resources: dict[str, bool] = {
+        "gemini_client": _genai_client is not None,
+        "pdf_pool": _pdf_pool is not None,
+    }
+    # Only inspect modules that are already imported (warmup may still be importing
+    # them, hence getattr): /ready must never trigger a load.
+    loaded_resources = getattr(sys.modules.get("matcher"), "loaded_resources", None)
+    if loaded_resources is not None:
+        resources.update(loaded_resources())
+    is_connected = getattr(sys.modules.get("database"), "is_connected", None)
+    resources["database"] = bool(is_connected and is_connected())
+    is_ready = all(state == "ready" or state.startswith("degraded") for state in _warmup_state.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "warmup": _warmup_state, "resources": resources},
+    )
+
+
+@app.get("/gemini/stats")
+def gemini_stats():
+    return gemini_gateway.snapshot()
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return analysis_cache.snapshot()
+
+
+@app.get("/jobs/cache/stats")
+def job_cache_stats():
+    if _job_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **_job_cache.snapshot()}
+
+
+@app.get("/admission/stats")
+def admission_stats():
+    if admission_controller is None:
+        return {"enabled": False}
+    return {"enabled": True, **admission_controller.snapshot()}
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of this worker process's counters and histograms."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/candidates")
+async def candidates_search(
+    skills: str | None = Query(None, description="Comma-separated; all must match"),
+    role: str | None = None,
+    ats_min: int | None = Query(None, ge=0, le=100),
+    ats_max: int | None = Query(None, ge=0, le=100),
+    uploaded_from: datetime | None = None,
+    uploaded_to: datetime | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+):
+    """Stored profiles, newest first; pass ``next_cursor`` back as ``cursor`` for the next page."""
+    import database
+    from pymongo.errors import PyMongoError
+
+    try:
+        return await _run_io(
+            lambda: database.search_candidates(
+                limit=limit,
+                skills=skills.split(",") if skills else None,
+                role=(role or "").strip() or None,
+                ats_min=ats_min,
+                ats_max=ats_max,
+                uploaded_from=uploaded_from,
+                uploaded_to=uploaded_to,
+                cursor=cursor,
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PyMongoError as e:
+        _log(f"[DB] search: {type(e).__name__}: {e!r}")
+        raise HTTPException(status_code=503, detail="Candidate store is unavailable.")
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match may list several tags, weak ones prefixed with W/, or be "*".
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+@app.post("/report")
+async def pdf_report(request: Request, analysis: dict[str, Any] = Body(..., description="An /analyze result")):
+    """Render the analysis as a downloadable PDF report (cached by analysis content)."""
+    from report_generator import cached_pdf_report, current_report_key
+
+    # The ETag comes from the report inputs, so a revalidation is answered before rendering.
+    key, generated_on = current_report_key(analysis)
+    etag = f'"{key.split(":", 1)[-1][:32]}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    with stage("report"):
+        pdf, _ = await _run_io(cached_pdf_report, analysis, generated_on)
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.splitext(str(analysis.get("filename") or "resume"))[0])
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="{stem or "resume"}-report.pdf"',
+            "ETag": etag,
+        },
+    )
+
+
 @app.get("/analyze")
 def analyze_get_info():
     return {
@@ -370,89 +1141,411 @@ def analyze_get_info_compat():
     return analyze_get_info()
 
 
-async def _analyze_impl(file: UploadFile) -> dict[str, Any]:
-    fname = (file.filename or "").lower()
-    if not fname.endswith(".pdf"):
+def _summarize_ai(ai: dict[str, Any]) -> dict[str, Any]:
+    """Normalize a Gemini / fallback payload into the analysis fields of the response."""
+    role = str(ai.get("predicted_role") or "Software Engineer").strip()
+    recommended_roles = [
+        str(x).strip()
+        for x in (ai.get("recommended_roles") or [])
+        if str(x).strip()
+    ]
+    if role and role not in recommended_roles:
+        recommended_roles.insert(0, role)
+    recommended_roles = recommended_roles[:5] if recommended_roles else [role]
+    try:
+        ats = int(ai.get("ats_score", 0))
+    except (TypeError, ValueError):
+        ats = 50
+    ats = max(0, min(100, ats))
+
+    matched = [str(s).strip() for s in (ai.get("matched_skills") or []) if s]
+    missing = [str(s).strip() for s in (ai.get("missing_skills") or []) if s]
+    # Top-k relative role scores from the local keyword scorer (softmax over keyword
+    # coverage, not calibrated probabilities); Gemini sends none.
+    role_scores = []
+    for item in ai.get("role_scores") or []:
+        try:
+            role_scores.append({"role": str(item["role"]), "score": float(item["score"])})
+        except (KeyError, TypeError, ValueError):
+            continue
+    return {
+        "ats_score": ats,
+        "predicted_role": role,
+        "recommended_roles": recommended_roles,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "learning_roadmap": ai.get("learning_roadmap") or [],
+        "custom_suggestion": str(ai.get("custom_suggestion") or "").strip(),
+        "keywords": matched[:15],
+        "role_scores": role_scores,
+    }
+
+
+def _build_result(
+    summary: dict[str, Any], jobs_by_role: dict[str, list[dict[str, Any]]], details: dict[str, str]
+) -> dict[str, Any]:
+    return {
+        **summary,
+        "jobs": jobs_by_role.get(summary["predicted_role"], []),
+        "jobs_by_role": jobs_by_role,
+        "candidate_name": details.get("candidate_name", "Not found"),
+        "candidate_email": details.get("candidate_email", "Not found"),
+        "candidate_phone": details.get("candidate_phone", "Not found"),
+        "candidate_college": details.get("candidate_college", "Not found"),
+    }
+
+
+def _job_pool_size() -> int:
+    return max(JOBS_PER_ROLE, JOB_RERANK_POOL) if JOB_RERANK_ENABLED else JOBS_PER_ROLE
+
+
+def _as_http_error(e: Exception) -> HTTPException:
+    """Map an unexpected pipeline error to the 500 the /analyze routes return."""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, UnicodeEncodeError):
+        _log(f"[analyze] UnicodeEncodeError: {e!r}")
+        return HTTPException(
+            status_code=500,
+            detail="Encoding error while processing the resume. Try saving the PDF as UTF-8 text or a simpler export.",
+        )
+    _log(f"[analyze] {type(e).__name__}: {e!r}")
+    safe_detail = str(e).encode("ascii", "backslashreplace").decode("ascii")
+    return HTTPException(
+        status_code=500,
+        detail=safe_detail[:800] if safe_detail else f"Analysis failed: {type(e).__name__}",
+    )
+
+
+def _require_pdf_name(filename: str) -> None:
+    if not (filename or "").lower().endswith(".pdf"):
         raise HTTPException(
             status_code=400,
             detail="Only PDF uploads are supported for /analyze.",
         )
-    internal = f"{uuid.uuid4().hex}.pdf"
-    path = os.path.join(UPLOAD_DIR, internal)
+
+
+async def _extract_text_or_cached(data: bytes) -> tuple[str, str, str, dict[str, Any] | None]:
+    """(text, upload_key, content_key, cached_result) — text is "" on a byte-level cache hit."""
+    with stage("cache"):
+        upload_key = bytes_key(data)
+        # A miss here is not final: the content key below is looked up for the same request.
+        cached = analysis_cache.get(upload_key, count_miss=False)
+    if cached is not None:
+        return "", upload_key, "", cached
+
+    with stage("pdf"):
+        text = await extract_pdf_text_async(data)
+    PDF_PAGES.inc(text.count("\f") + 1 if text else 0)
+    if not text:
+        raise HTTPException(
+            status_code=400,
+            detail="No extractable text in PDF (try a text-based PDF).",
+        )
+    with stage("cache"):
+        content_key = text_key(text)
+        cached = analysis_cache.get(content_key)
+        if cached is not None:
+            analysis_cache.set(cached, upload_key)
+    return text, upload_key, content_key, cached
+
+
+async def _analyze_pdf_bytes(filename: str, data: bytes) -> dict[str, Any]:
+    """Full /analyze pipeline for one in-memory PDF upload (shared by single and batch routes)."""
+    _require_pdf_name(filename)
+    try:
+        text, upload_key, content_key, cached = await _extract_text_or_cached(data)
+        if cached is not None:
+            return cached
+
+        # A lightly edited re-upload reuses the earlier analysis instead of calling Gemini.
+        signature, duplicate = await _near_duplicate_of(text)
+        if duplicate is not None:
+            summary, source = duplicate["analysis"], "near_duplicate"
+        else:
+            try:
+                with stage("gemini"):
+                    ai, source = await _run_gemini(text), "gemini"
+            except Exception:
+                GEMINI_FALLBACKS.inc()
+                with stage("fallback"):
+                    ai, source = await _fallback_batcher.submit(text), "fallback"
+            summary = _summarize_ai(ai)
+
+        with stage("jobs"):
+            jobs_by_role = await _run_io(fetch_jobs_for_roles, summary["recommended_roles"], _job_pool_size())
+        with stage("rerank"):
+            jobs_by_role = await _run_io(rerank_jobs_for_resume, text, jobs_by_role, JOBS_PER_ROLE)
+        with stage("response"):
+            details = _extract_candidate_details(text)
+            result = _build_result(summary, jobs_by_role, details)
+            if duplicate is not None:
+                result["near_duplicate"] = _near_duplicate_field(duplicate)
+            if _cacheable(source, duplicate):
+                analysis_cache.set(result, upload_key, content_key)
+        await _remember(filename, text, source, signature, summary, details, duplicate)
+        return result
+    except Exception as e:
+        raise _as_http_error(e)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _jobs_as_completed(text: str, roles: list[str]):
+    """Yield (role, ranked jobs) as each role's JSearch call resolves, within JSEARCH_DEADLINE."""
+    loop = asyncio.get_running_loop()
+    role_names = list(dict.fromkeys(str(r).strip() for r in roles if str(r).strip()))
+    pool_size = _job_pool_size()
+
+    async def one(role: str) -> tuple[str, list[dict[str, Any]]]:
+        jobs = await loop.run_in_executor(_jsearch_pool, fetch_jsearch_jobs, role, pool_size)
+        ranked = await _run_io(rerank_jobs_for_resume, text, {role: jobs}, JOBS_PER_ROLE)
+        return role, ranked[role]
+
+    tasks = [asyncio.ensure_future(one(role)) for role in role_names]
+    pending = set(role_names)
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=JSEARCH_DEADLINE):
+            role, jobs = await next_done
+            pending.discard(role)
+            yield role, jobs
+    except asyncio.TimeoutError:
+        JSEARCH_ERRORS.inc(len(pending), reason="deadline")
+        _log(f"[JSearch] deadline {JSEARCH_DEADLINE:.1f}s exceeded for roles {sorted(pending)!r}")
+    finally:
+        for task in tasks:
+            task.cancel()
+    for role in role_names:
+        if role in pending:
+            yield role, []
+
+
+async def _analyze_events(data: bytes, filename: str = ""):
+    """SSE stream: details + local fallback first, then Gemini, then jobs per role, then done."""
     try:
-        with open(path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        text, upload_key, content_key, cached = await _extract_text_or_cached(data)
+        if cached is not None:
+            yield _sse("details", {k: v for k, v in cached.items() if k.startswith("candidate_")})
+            yield _sse("analysis", {**_summarize_ai(cached), "source": "cache"})
+            for role, jobs in (cached.get("jobs_by_role") or {}).items():
+                yield _sse("jobs", {"role": role, "jobs": jobs})
+            yield _sse("done", cached)
+            return
+
+        details = _extract_candidate_details(text)
+        signature, duplicate = await _near_duplicate_of(text)
+        yield _sse("details", details)
+        if duplicate is not None:
+            summary, source = duplicate["analysis"], "near_duplicate"
+        else:
+            with stage("fallback"):
+                fallback = _summarize_ai(await _fallback_batcher.submit(text))
+            yield _sse("fallback", fallback)
+            try:
+                with stage("gemini"):
+                    summary, source = _summarize_ai(await _run_gemini(text)), "gemini"
+            except Exception:
+                GEMINI_FALLBACKS.inc()
+                summary, source = fallback, "fallback"
+        yield _sse("analysis", {**summary, "source": source})
+
+        jobs_by_role: dict[str, list[dict[str, Any]]] = {}
+        async for role, jobs in _jobs_as_completed(text, summary["recommended_roles"]):
+            jobs_by_role[role] = jobs
+            yield _sse("jobs", {"role": role, "jobs": jobs})
+        # Keep role order stable (as recommended), not completion order.
+        jobs_by_role = {role: jobs_by_role.get(role, []) for role in summary["recommended_roles"]}
+
+        result = _build_result(summary, jobs_by_role, details)
+        if duplicate is not None:
+            result["near_duplicate"] = _near_duplicate_field(duplicate)
+        if _cacheable(source, duplicate):
+            analysis_cache.set(result, upload_key, content_key)
+        await _remember(filename, text, source, signature, summary, details, duplicate)
+        yield _sse("done", result)
+    except Exception as e:
+        err = _as_http_error(e)
+        yield _sse("error", {"status_code": err.status_code, "detail": err.detail})
 
-        text = extract_pdf_text(path)
-        if not text:
+
+async def _analyze_impl(file: UploadFile) -> dict[str, Any]:
+    _require_pdf_name(file.filename or "")
+    return await _analyze_pdf_bytes(file.filename or "", await _read_upload(file, MAX_UPLOAD_BYTES))
+
+
+async def _read_upload(file: UploadFile, limit: int) -> bytes:
+    """Read an upload into memory in chunks, failing fast once it exceeds ``limit`` bytes."""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Upload too large; the limit is {limit:,} bytes.",
+    )
+    if file.size is not None and file.size > limit:
+        raise too_large
+    buf = bytearray()
+    with stage("upload"):
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            buf += chunk
+            if len(buf) > limit:
+                raise too_large
+    UPLOAD_BYTES.inc(len(buf))
+    return bytes(buf)
+
+
+def _expand_batch_upload(
+    filename: str, data: bytes, max_items: int = BATCH_MAX_FILES, max_bytes: int = MAX_BATCH_EXPANDED_BYTES
+) -> list[tuple[str, bytes | None, str]]:
+    """
+    Turn one batch upload into (name, pdf_bytes, error) items; ZIPs expand to their PDFs.
+    An archive with more than ``max_items`` entries, or whose PDFs would expand past
+    ``max_bytes``, is refused with 413 before anything is decompressed.
+    """
+    if not filename.lower().endswith(".zip"):
+        return [(filename, data, "")]
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        return [(filename, None, "Invalid ZIP archive.")]
+    items: list[tuple[str, bytes | None, str]] = []
+    with archive:
+        members = [
+            info
+            for info in archive.infolist()
+            if not (info.is_dir() or "__MACOSX" in info.filename or os.path.basename(info.filename).startswith("."))
+        ]
+        if len(members) > max_items:
             raise HTTPException(
-                status_code=400,
-                detail="No extractable text in PDF (try a text-based PDF).",
+                status_code=413,
+                detail=f"{filename} holds {len(members)} files; the batch has room for {max_items} more.",
             )
-
-        try:
-            ai = analyze_resume_with_gemini(text)
-        except Exception:
-            ai = analyze_resume_fallback(text)
-        role = str(ai.get("predicted_role") or "Software Engineer").strip()
-        recommended_roles = [
-            str(x).strip()
-            for x in (ai.get("recommended_roles") or [])
-            if str(x).strip()
+        wanted = [
+            info for info in members if info.filename.lower().endswith(".pdf") and info.file_size <= MAX_UPLOAD_BYTES
         ]
-        if role and role not in recommended_roles:
-            recommended_roles.insert(0, role)
-        recommended_roles = recommended_roles[:5] if recommended_roles else [role]
-        try:
-            ats = int(ai.get("ats_score", 0))
-        except (TypeError, ValueError):
-            ats = 50
-        ats = max(0, min(100, ats))
+        too_large = HTTPException(
+            status_code=413,
+            detail=f"{filename} expands past the {max_bytes:,} bytes left in the batch limit.",
+        )
+        if sum(info.file_size for info in wanted) > max_bytes:
+            raise too_large
+        expanded = 0
+        for info in members:
+            name = info.filename
+            if not name.lower().endswith(".pdf"):
+                items.append((name, None, "Only PDF files are analyzed inside ZIP archives."))
+                continue
+            if info.file_size > MAX_UPLOAD_BYTES:
+                items.append((name, None, "File inside ZIP exceeds the per-file size limit."))
+                continue
+            # Bounded read: a header that understates the size cannot get past the caps.
+            try:
+                with archive.open(info) as member:
+                    content = member.read(MAX_UPLOAD_BYTES + 1)
+            except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError):
+                items.append((name, None, "Could not read this file from the ZIP archive."))
+                continue
+            if len(content) > MAX_UPLOAD_BYTES:
+                items.append((name, None, "File inside ZIP exceeds the per-file size limit."))
+                continue
+            expanded += len(content)
+            if expanded > max_bytes:
+                raise too_large
+            items.append((name, content, ""))
+    return items
 
-        matched = [str(s).strip() for s in (ai.get("matched_skills") or []) if s]
-        missing = [str(s).strip() for s in (ai.get("missing_skills") or []) if s]
 
-        jobs_by_role = fetch_jobs_for_roles(recommended_roles, 5)
-        jobs = jobs_by_role.get(role, [])
-        details = _extract_candidate_details(text)
+def _batch_error(index: int, name: str, status_code: int, detail: Any) -> dict[str, Any]:
+    return {
+        "index": index,
+        "filename": name,
+        "status": "error",
+        "status_code": status_code,
+        "detail": detail,
+    }
 
-        return {
-            "ats_score": ats,
-            "predicted_role": role,
-            "recommended_roles": recommended_roles,
-            "matched_skills": matched,
-            "missing_skills": missing,
-            "learning_roadmap": ai.get("learning_roadmap") or [],
-            "custom_suggestion": str(ai.get("custom_suggestion") or "").strip(),
-            "keywords": matched[:15],
-            "jobs": jobs,
-            "jobs_by_role": jobs_by_role,
-            "candidate_name": details.get("candidate_name", "Not found"),
-            "candidate_email": details.get("candidate_email", "Not found"),
-            "candidate_phone": details.get("candidate_phone", "Not found"),
-            "candidate_college": details.get("candidate_college", "Not found"),
-        }
-    except HTTPException:
-        raise
-    except UnicodeEncodeError as e:
-        _log(f"[analyze] UnicodeEncodeError: {e!r}")
+
+async def _analyze_batch_item(index: int, name: str, data: bytes | None, error: str) -> dict[str, Any]:
+    if data is None:
+        return _batch_error(index, name, 400, error)
+    try:
+        result = await _analyze_pdf_bytes(name, data)
+        return {"index": index, "filename": name, "status": "ok", "result": result}
+    except HTTPException as e:
+        return _batch_error(index, name, e.status_code, e.detail)
+    except Exception as e:
+        _log(f"[batch] {name}: {type(e).__name__}: {e!r}")
+        return _batch_error(index, name, 500, f"Analysis failed: {type(e).__name__}")
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(files: list[UploadFile] = File(..., description="PDF resumes and/or ZIP archives of PDFs")):
+    """Analyze many resumes; streams one NDJSON line per resume in completion order."""
+    if len(files) > BATCH_MAX_FILES:
         raise HTTPException(
-            status_code=500,
-            detail="Encoding error while processing the resume. Try saving the PDF as UTF-8 text or a simpler export.",
+            status_code=413,
+            detail=f"Batch has {len(files)} files; the limit is {BATCH_MAX_FILES}.",
         )
-    except Exception as e:
-        _log(f"[analyze] {type(e).__name__}: {e!r}")
-        safe_detail = str(e).encode("ascii", "backslashreplace").decode("ascii")
+    items: list[tuple[str, bytes | None, str]] = []
+    # Content-Length is absent on chunked uploads, so the batch cap is also enforced here.
+    total = 0
+    for upload in files:
+        name = upload.filename or ""
+        limit = MAX_BATCH_UPLOAD_BYTES if name.lower().endswith(".zip") else MAX_UPLOAD_BYTES
+        remaining = MAX_BATCH_UPLOAD_BYTES - total
+        try:
+            data = await _read_upload(upload, min(limit, remaining))
+        except HTTPException as e:
+            if limit > remaining:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch upload too large; the limit is {MAX_BATCH_UPLOAD_BYTES:,} bytes.",
+                )
+            items.append((name, None, str(e.detail)))
+            continue
+        total += len(data)
+        expanded = sum(len(item[1]) for item in items if item[1] is not None)
+        items.extend(
+            _expand_batch_upload(name, data, BATCH_MAX_FILES - len(items), MAX_BATCH_EXPANDED_BYTES - expanded)
+        )
+    if len(items) > BATCH_MAX_FILES:
         raise HTTPException(
-            status_code=500,
-            detail=safe_detail[:800] if safe_detail else f"Analysis failed: {type(e).__name__}",
+            status_code=413,
+            detail=f"Batch has {len(items)} resumes; the limit is {BATCH_MAX_FILES}.",
         )
-    finally:
-        if os.path.isfile(path):
-            try:
-                os.remove(path)
-            except OSError:
-                pass
+
+    # No more than the admission slots the request holds (see _admit_analysis).
+    slots = asyncio.Semaphore(_batch_concurrency())
+
+    async def bounded(index: int, item: tuple[str, bytes | None, str]) -> dict[str, Any]:
+        async with slots:
+            return await _analyze_batch_item(index, *item)
+
+    async def stream():
+        tasks = [asyncio.create_task(bounded(i, item)) for i, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(file: UploadFile = File(..., description="PDF resume")):
+    """Progressive /analyze as Server-Sent Events (details, fallback, analysis, jobs, done)."""
+    _require_pdf_name(file.filename or "")
+    data = await _read_upload(file, MAX_UPLOAD_BYTES)
+    return StreamingResponse(
+        _analyze_events(data, file.filename or ""),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/analyze")
@@ -466,6 +1559,7 @@ async def analyze_compat(file: UploadFile = File(..., description="PDF resume"))
 
 
 if __name__ == "__main__":
+    # Development server. Production: gunicorn -c gunicorn.conf.py main:app
     import uvicorn
 
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,41 +1,152 @@
-from sentence_transformers import SentenceTransformer, util
 import numpy as np
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from skill_matcher import SkillMatcher, load_taxonomy
+
+# Heavy resources (SentenceTransformer, role pickles, skill matrix) load on first
+# use, not at import; call warmup() to pay the cost up front.
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+
+_model = None
+_model_lock = threading.Lock()
 
-# Load model once
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
-COMMON_SKILLS = [
+def get_model():
+    """Shared SentenceTransformer, loaded once on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+
+                _model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return _model
+
+# Skills compared between resume and job description: the shared taxonomy (with its
+# synonyms), or this short list if the data file is missing.
+_DEFAULT_COMMON_SKILLS = [
     "python", "java", "javascript", "html", "css",
     "sql", "mongodb", "aws", "docker", "react",
     "node", "c", "c++", "data analysis",
     "machine learning", "deep learning"
 ]
+COMMON_SKILLS = list(load_taxonomy()[0]) or _DEFAULT_COMMON_SKILLS
+_common_skill_matcher = SkillMatcher(COMMON_SKILLS)
+
+
+# ============================================
+# Embedding cache (resumes) + skill matrix
+# ============================================
+# Embeddings are L2-normalized, so cosine similarity is a plain dot product.
+# MiniLM is uncased, so resumes are encoded as given (not lowercased) and
+# calculate_similarity / skill_gap_analysis hit the same cache entry.
+
+RESUME_EMBEDDING_CACHE_SIZE = int(os.getenv("RESUME_EMBEDDING_CACHE_SIZE", "512"))
+
+_resume_embeddings = OrderedDict()
+_embedding_lock = threading.Lock()
+_skill_matrix_lock = threading.Lock()
+_skill_matrix = None
+_skill_index = {}
+
+
+def embed_texts(texts):
+    return get_model().encode(list(texts), batch_size=64, normalize_embeddings=True, convert_to_numpy=True)
+
+
+def embed_resume(resume_text):
+    """Normalized resume embedding, cached by text hash across calls."""
+    key = hashlib.sha256(resume_text.encode("utf-8", errors="replace")).hexdigest()
+    with _embedding_lock:
+        cached = _resume_embeddings.get(key)
+        if cached is not None:
+            _resume_embeddings.move_to_end(key)
+            return cached
+    embedding = embed_texts([resume_text])[0]
+    with _embedding_lock:
+        _resume_embeddings[key] = embedding
+        while len(_resume_embeddings) > RESUME_EMBEDDING_CACHE_SIZE:
+            _resume_embeddings.popitem(last=False)
+    return embedding
+
+
+def skill_embedding_matrix():
+    """(skill -> row index, matrix) for the whole taxonomy, encoded once in one batch."""
+    global _skill_matrix, _skill_index
+    # Own lock, checked twice like get_model: the encode takes a while and must not
+    # hold up embed_resume cache hits, which use _embedding_lock.
+    if _skill_matrix is None:
+        with _skill_matrix_lock:
+            if _skill_matrix is None:
+                skills = list(dict.fromkeys([*load_taxonomy()[0], *COMMON_SKILLS]))
+                matrix = embed_texts(skills)
+                # Index first: readers test _skill_matrix, then use both.
+                _skill_index = {skill: i for i, skill in enumerate(skills)}
+                _skill_matrix = matrix
+    return _skill_index, _skill_matrix
+
+
+def score_skills(resume_text, skills):
+    """Cosine similarity (0-100) of each skill against the resume, in one matrix product."""
+    if not skills:
+        return {}
+    index, matrix = skill_embedding_matrix()
+    known = [s for s in skills if s in index]
+    unknown = [s for s in skills if s not in index]
+    vectors = matrix[[index[s] for s in known]] if known else np.empty((0, matrix.shape[1]))
+    if unknown:
+        vectors = np.vstack([vectors, embed_texts(unknown)])
+    scores = vectors @ embed_resume(resume_text)
+    return {skill: round(float(score) * 100, 2) for skill, score in zip(known + unknown, scores)}
+
+
+def rank_jobs(resume_text, jobs_by_role, top_k=5, text_chars=600):
+    """
+    Rerank job listings per role against the resume.
+    All listings (across roles) are embedded in one batch and scored with one
+    matrix product; each job gets a 0-100 "match_score".
+    """
+    flat = [(role, job) for role, jobs in jobs_by_role.items() for job in jobs]
+    ranked = {role: [] for role in jobs_by_role}
+    if not flat:
+        return ranked
+
+    # The same listing often comes back for several roles; embed each text once.
+    texts = [
+        f"{job.get('job_title', '')}. {job.get('job_description', '')}"[:text_chars]
+        for _, job in flat
+    ]
+    unique = list(dict.fromkeys(texts))
+    row = {text: i for i, text in enumerate(unique)}
+    scores = embed_texts(unique) @ embed_resume(resume_text)
+
+    for (role, job), text in zip(flat, texts):
+        ranked[role].append({**job, "match_score": round(float(scores[row[text]]) * 100, 2)})
+    for role, jobs in ranked.items():
+        jobs.sort(key=lambda job: job["match_score"], reverse=True)
+        del jobs[top_k:]
+    return ranked
 
 
 def calculate_similarity(resume_text, job_description):
-    embeddings = model.encode([resume_text, job_description])
-    similarity = util.cos_sim(embeddings[0], embeddings[1])
-    return round(float(similarity[0][0]) * 100, 2)
+    resume_embedding = embed_resume(resume_text)
+    jd_embedding = embed_texts([job_description])[0]
+    return round(float(resume_embedding @ jd_embedding) * 100, 2)
 
 
 def skill_gap_analysis(resume_text, job_description):
-    resume_text = resume_text.lower()
-    job_description = job_description.lower()
-
     # Extract skills from resume & JD
-    resume_skills = [skill for skill in COMMON_SKILLS if skill in resume_text]
-    jd_skills = [skill for skill in COMMON_SKILLS if skill in job_description]
+    resume_skills = _common_skill_matcher.find(resume_text)
+    jd_skills = _common_skill_matcher.find(job_description)
 
     matched_skills = list(set(resume_skills) & set(jd_skills))
     missing_skills = list(set(jd_skills) - set(resume_skills))
 
-    # AI similarity per skill
-    skill_scores = {}
-    for skill in jd_skills:
-        skill_embedding = model.encode(skill)
-        resume_embedding = model.encode(resume_text)
-        score = util.cos_sim(skill_embedding, resume_embedding)
-        skill_scores[skill] = round(float(score[0][0]) * 100, 2)
+    # AI similarity per skill: one resume encode (cached) + one matrix product
+    skill_scores = score_skills(resume_text, jd_skills)
 
     return {
         "matched_skills": matched_skills,
@@ -70,34 +181,35 @@ def generate_learning_roadmap(missing_skills):
 # AI-Based Skill Weighting System
 # ============================================
 
+# Define skill weights (you can expand this)
+SKILL_WEIGHTS = {
+    "machine learning": 2.0,
+    "deep learning": 2.0,
+    "python": 1.5,
+    "aws": 1.3,
+    "docker": 1.2,
+    "react": 1.0,
+    "node": 1.0,
+    "mongodb": 1.0,
+    "sql": 1.2,
+    "data analysis": 1.4,
+}
+_weighted_skill_matcher = SkillMatcher(SKILL_WEIGHTS)
+
+
 def weighted_skill_match(resume_skills, job_description):
     """
     Calculate weighted skill matching score.
     """
-
-    # Define skill weights (you can expand this)
-    skill_weights = {
-        "machine learning": 2.0,
-        "deep learning": 2.0,
-        "python": 1.5,
-        "aws": 1.3,
-        "docker": 1.2,
-        "react": 1.0,
-        "node": 1.0,
-        "mongodb": 1.0,
-        "sql": 1.2,
-        "data analysis": 1.4,
-    }
-
-    jd_lower = job_description.lower()
+    jd_skills = set(_weighted_skill_matcher.find(job_description))
     resume_lower = [skill.lower() for skill in resume_skills]
 
     total_weight = 0
     matched_weight = 0
     matched_skills = []
 
-    for skill, weight in skill_weights.items():
-        if skill in jd_lower:
+    for skill, weight in SKILL_WEIGHTS.items():
+        if skill in jd_skills:
             total_weight += weight
             if skill in resume_lower:
                 matched_weight += weight
@@ -113,25 +225,113 @@ def weighted_skill_match(resume_skills, job_description):
 # Job Role Prediction
 # ============================================
 
-import joblib
-import os
-
-MODEL_PATH = "role_model.pkl"
-VECTORIZER_PATH = "role_vectorizer.pkl"
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(_BASE_DIR, "role_model.pkl")
+VECTORIZER_PATH = os.path.join(_BASE_DIR, "role_vectorizer.pkl")
+# Versioned artifacts written by train_role_model.py (role_model-v0001.joblib, ...) win
+# over the legacy pickles above. ROLE_MODEL_VERSION pins one; empty = the newest.
+ROLE_MODEL_DIR = os.getenv("ROLE_MODEL_DIR", os.path.join(_BASE_DIR, "models"))
+ROLE_MODEL_VERSION = os.getenv("ROLE_MODEL_VERSION", "").strip()
 
 role_model = None
 role_vectorizer = None
+role_model_info = {}
+_role_model_loaded = False
 
-if os.path.exists(MODEL_PATH) and os.path.exists(VECTORIZER_PATH):
-    role_model = joblib.load(MODEL_PATH)
-    role_vectorizer = joblib.load(VECTORIZER_PATH)
 
+def role_artifact_path(version, directory=None):
+    return os.path.join(directory or ROLE_MODEL_DIR, f"role_model-v{int(version):04d}.joblib")
 
-def predict_job_role(resume_text):
+
+def role_artifact_versions(directory=None):
+    """Versions of the role-model artifacts in ``directory``, oldest first."""
+    directory = directory or ROLE_MODEL_DIR
+    if not os.path.isdir(directory):
+        return []
+    versions = []
+    for name in os.listdir(directory):
+        stem, ext = os.path.splitext(name)
+        if ext == ".joblib" and stem.startswith("role_model-v") and stem[12:].isdigit():
+            versions.append(int(stem[12:]))
+    return sorted(versions)
+
+
+def load_role_model():
+    """Load the role classifier once; returns (model, vectorizer) or (None, None)."""
+    global role_model, role_vectorizer, role_model_info, _role_model_loaded
+    if not _role_model_loaded:
+        with _model_lock:
+            if not _role_model_loaded:
+                import joblib
+
+                versions = [int(ROLE_MODEL_VERSION)] if ROLE_MODEL_VERSION else role_artifact_versions()[-1:]
+                if versions and os.path.exists(role_artifact_path(versions[0])):
+                    artifact = joblib.load(role_artifact_path(versions[0]))
+                    role_model = artifact["model"]
+                    role_vectorizer = artifact["vectorizer"]
+                    role_model_info = {k: v for k, v in artifact.items() if k not in ("model", "vectorizer")}
+                elif os.path.exists(MODEL_PATH) and os.path.exists(VECTORIZER_PATH):
+                    role_model = joblib.load(MODEL_PATH)
+                    role_vectorizer = joblib.load(VECTORIZER_PATH)
+                    role_model_info = {"version": 0, "source": "legacy pickles"}
+                _role_model_loaded = True
+    return role_model, role_vectorizer
+
+
+def loaded_resources():
+    """Which heavy resources this process has loaded (for /ready)."""
+    return {
+        "embedding_model": _model is not None,
+        "skill_matrix": _skill_matrix is not None,
+        "role_model": role_model is not None,
+    }
+
+
+def warmup():
+    """Load every heavy resource now instead of on the first request."""
+    load_role_model()
+    skill_embedding_matrix()
+    embed_texts(["warmup"])
+
+
+def preload():
+    """
+    Load the model weights and role classifier without running inference, for a parent
+    process that forks workers: the weights are then shared copy-on-write, and torch's
+    thread pool is never started in the parent (it does not survive a fork).
+    """
+    load_role_model()
+    get_model()
+
+
+def predict_job_roles(resume_texts, k=3):
+    """
+    Top-k roles with probabilities for many resumes: one vectorizer call and one
+    sparse product with the classifier weights. [] per resume if no model is trained.
+    """
+    role_model, role_vectorizer = load_role_model()
     if not role_model or not role_vectorizer:
-        return "Model Not Trained"
+        return [[] for _ in resume_texts]
+    from role_scoring import softmax, top_k_indices
 
-    X = role_vectorizer.transform([resume_text])
-    prediction = role_model.predict(X)
+    X = role_vectorizer.transform(list(resume_texts))
+    if hasattr(role_model, "predict_proba"):
+        probs = role_model.predict_proba(X)
+    else:
+        scores = role_model.decision_function(X)
+        if scores.ndim == 1:
+            # Binary classifier: one margin per resume, positive for classes_[1].
+            scores = np.column_stack([-scores, scores])
+        probs = softmax(scores)
+    classes = role_model.classes_
+    return [
+        [{"role": str(classes[j]), "probability": round(float(probs[i, j]), 4)} for j in row]
+        for i, row in enumerate(top_k_indices(probs, k))
+    ]
 
-    return prediction[0]
+
+def predict_job_role(resume_text):
+    ranked = predict_job_roles([resume_text], k=1)[0]
+    if not ranked:
+        return "Model Not Trained"
+    return ranked[0]["role"]
@@ -0,0 +1,174 @@
+"""
+Minimal in-process metrics: counters and histograms rendered in the Prometheus text
+format, plus per-request stage timings for the ``Server-Timing`` response header.
+
+Metrics are per process; with several workers, scrape each one (or aggregate upstream).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_lock = threading.Lock()
+_registry: list["_Metric"] = []
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        with _lock:
+            _registry.append(self)
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        return tuple(_escape(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with _lock:
+            items = list(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        for key, value in items:
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (per-bucket counts, sum, count)
+        self._series: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with _lock:
+            counts, total, n = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._series[key] = (counts, total + value, n + 1)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with _lock:
+            series = [(k, list(c), s, n) for k, (c, s, n) in self._series.items()]
+        for key, counts, total, n in series:
+            for bound, count in zip(self.buckets, counts):
+                le = _label_str(self.labelnames, key, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{le} {count}")
+            inf = _label_str(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {n}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {n}")
+        return lines
+
+
+def render_prometheus() -> str:
+    with _lock:
+        metrics = list(_registry)
+    return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+
+# ======================================================
+# Backend metrics
+# ======================================================
+STAGE_SECONDS = Histogram(
+    "resumeaix_stage_seconds",
+    "Time spent per /analyze pipeline stage.",
+    ("stage",),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "resumeaix_http_request_seconds",
+    "HTTP request latency by route template, method and status.",
+    ("route", "method", "status"),
+)
+GEMINI_FALLBACKS = Counter(
+    "resumeaix_gemini_fallbacks_total",
+    "Analyses that fell back to the local heuristic because Gemini failed.",
+)
+JSEARCH_ERRORS = Counter(
+    "resumeaix_jsearch_errors_total",
+    "JSearch calls that failed or missed the fan-out deadline.",
+    ("reason",),
+)
+UPLOAD_BYTES = Counter("resumeaix_upload_bytes_total", "Bytes of resume uploads read.")
+PDF_PAGES = Counter("resumeaix_pdf_pages_parsed_total", "PDF pages parsed by pdfminer.")
+
+
+# ======================================================
+# Per-request stage timings (Server-Timing)
+# ======================================================
+_request_timings: ContextVar[dict[str, float] | None] = ContextVar("request_timings", default=None)
+
+
+def begin_request_timings() -> dict[str, float]:
+    """Start collecting stage timings for the current request (call from middleware)."""
+    timings: dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage into STAGE_SECONDS and the current request's timings."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def server_timing_header(timings: dict[str, float], total: float | None = None) -> str:
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
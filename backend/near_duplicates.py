@@ -0,0 +1,228 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+A resume's normalized text becomes a set of word shingles; its MinHash signature keeps,
+for each of MINHASH_PERMUTATIONS hash functions, the minimum over the set, so the share
+of equal positions between two signatures estimates the Jaccard similarity of the
+texts. The signature is cut into LSH_BANDS bands: two resumes become candidates when any
+band matches exactly, which finds pairs above roughly (1/bands)^(1/rows) similarity
+without comparing against every stored signature; candidates are then confirmed
+against NEAR_DUP_THRESHOLD.
+
+Hashes are seeded constants (crc32 + fixed permutations), so signatures and band keys
+are stable across processes and can be stored with the candidate in MongoDB.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import zlib
+from typing import Any
+
+import numpy as np
+
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+# Estimated Jaccard similarity (0..1) from which an upload counts as a near-duplicate.
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.85"))
+# Signatures kept in each worker's in-memory index (oldest dropped first).
+NEAR_DUP_INDEX_SIZE = int(os.getenv("NEAR_DUP_INDEX_SIZE", "10000"))
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "128"))
+LSH_BANDS = int(os.getenv("LSH_BANDS", "16"))
+SHINGLE_WORDS = int(os.getenv("NEAR_DUP_SHINGLE_WORDS", "3"))
+
+# Largest prime below 2**32: (a * x + b) % P stays exact in uint64 for 32-bit x, a, b.
+_PRIME = np.uint64(4294967291)
+_MAX_PERMUTATIONS = 1024
+_rng = np.random.default_rng(20240611)
+_A = _rng.integers(1, int(_PRIME), size=_MAX_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=_MAX_PERMUTATIONS, dtype=np.uint64)
+# Odd multipliers folding one band's rows into a 64-bit key (uint64 arithmetic wraps).
+_FOLD = _rng.integers(1, 2**63, size=_MAX_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def shingles(text: str, words: int = SHINGLE_WORDS) -> set[str]:
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) <= words:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + words]) for i in range(len(tokens) - words + 1)}
+
+
+def minhash_signature(text: str, permutations: int = MINHASH_PERMUTATIONS) -> np.ndarray | None:
+    """uint32 MinHash signature of the text's shingles (None for text without words)."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    a, b = _A[:permutations], _B[:permutations]
+    signature = np.full(permutations, np.iinfo(np.uint64).max, dtype=np.uint64)
+    # Chunked so a very long resume never materializes a huge (shingles x permutations) matrix.
+    for start in range(0, len(hashes), 2048):
+        block = hashes[start : start + 2048, None]
+        np.minimum(signature, ((block * a + b) % _PRIME).min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def signature_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype="<u4").astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray, bands: int = LSH_BANDS) -> np.ndarray:
+    """(n, bands) uint64 keys, one per band of each (n, permutations) signature row."""
+    signatures = np.atleast_2d(signatures)
+    rows = signatures.shape[1] // bands
+    banded = signatures[:, : bands * rows].astype(np.uint64).reshape(len(signatures), bands, rows)
+    keys = (banded * _FOLD[:rows]).sum(axis=2, dtype=np.uint64)
+    # xorshift finalizer so keys that differ in a few bits spread over the whole range.
+    keys ^= keys >> np.uint64(29)
+    return keys * np.uint64(0xBF58476D1CE4E5B9)
+
+
+def stored_band_keys(signature: np.ndarray, bands: int = LSH_BANDS) -> list[int]:
+    """Band keys for a MongoDB multikey index: signed 64-bit, band number in the low byte."""
+    keys = (band_keys(signature, bands)[0] & ~np.uint64(0xFF)) | np.arange(bands, dtype=np.uint64)
+    return [int(k) for k in keys.view(np.int64)]
+
+
+class LSHIndex:
+    """
+    In-memory LSH index. Each band keeps its keys in a sorted array searched with
+    binary search, plus a small unsorted tail of recent additions that is merged in
+    when full; memory is one signature row and ``bands`` keys per entry.
+    """
+
+    TAIL = 4096
+
+    def __init__(self, bands: int = LSH_BANDS, permutations: int = MINHASH_PERMUTATIONS, max_entries: int = 0):
+        self.bands = bands
+        self.permutations = permutations
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._signatures = np.empty((1024, permutations), dtype=np.uint32)
+        self._payloads: list[Any] = []
+        self._first = 0  # rows before this one were evicted
+        self._sorted_keys = np.empty((bands, 0), dtype=np.uint64)
+        self._sorted_rows = np.empty((bands, 0), dtype=np.int64)
+        self._tail_keys = np.empty((self.TAIL, bands), dtype=np.uint64)
+        self._tail_rows = np.empty(self.TAIL, dtype=np.int64)
+        self._tail_len = 0
+
+    def __len__(self) -> int:
+        return len(self._payloads) - self._first
+
+    def add(self, payload: Any, signature: np.ndarray) -> None:
+        keys = band_keys(signature, self.bands)[0]
+        with self._lock:
+            row = len(self._payloads)
+            if row >= len(self._signatures):
+                grown = np.empty((2 * len(self._signatures), self.permutations), dtype=np.uint32)
+                grown[:row] = self._signatures
+                self._signatures = grown
+            self._signatures[row] = signature
+            self._payloads.append(payload)
+            self._tail_keys[self._tail_len] = keys
+            self._tail_rows[self._tail_len] = row
+            self._tail_len += 1
+            if self._tail_len == self.TAIL:
+                self._merge()
+            if self.max_entries and len(self) > self.max_entries:
+                self._evict(len(self) - self.max_entries + self.max_entries // 10)
+
+    def add_many(self, payloads: list[Any], signatures: np.ndarray) -> None:
+        """Bulk load (e.g. signatures read back from MongoDB): one sort per band."""
+        if not len(payloads):
+            return
+        keys = band_keys(signatures, self.bands)
+        with self._lock:
+            self._merge()
+            start = len(self._payloads)
+            end = start + len(payloads)
+            if end > len(self._signatures):
+                grown = np.empty((max(end, 2 * len(self._signatures)), self.permutations), dtype=np.uint32)
+                grown[:start] = self._signatures[:start]
+                self._signatures = grown
+            self._signatures[start:end] = signatures
+            self._payloads.extend(payloads)
+            all_keys = np.concatenate([self._sorted_keys, keys.T], axis=1)
+            all_rows = np.concatenate(
+                [self._sorted_rows, np.broadcast_to(np.arange(start, end, dtype=np.int64), (self.bands, end - start))],
+                axis=1,
+            )
+            order = np.argsort(all_keys, axis=1, kind="stable")
+            self._sorted_keys = np.take_along_axis(all_keys, order, axis=1)
+            self._sorted_rows = np.take_along_axis(all_rows, order, axis=1)
+            if self.max_entries and len(self) > self.max_entries:
+                self._evict(len(self) - self.max_entries)
+
+    def _merge(self) -> None:
+        """Insert the tail into the sorted arrays: O(entries) per band, once per TAIL adds."""
+        n = self._tail_len
+        if not n:
+            return
+        keys, rows = [], []
+        for band in range(self.bands):
+            tail = self._tail_keys[:n, band]
+            order = np.argsort(tail, kind="stable")
+            at = np.searchsorted(self._sorted_keys[band], tail[order], side="right")
+            keys.append(np.insert(self._sorted_keys[band], at, tail[order]))
+            rows.append(np.insert(self._sorted_rows[band], at, self._tail_rows[:n][order]))
+        self._sorted_keys, self._sorted_rows = np.stack(keys), np.stack(rows)
+        self._tail_len = 0
+
+    def _evict(self, count: int) -> None:
+        """Drop the ``count`` oldest entries (amortized: runs once per max_entries / 10 adds)."""
+        self._merge()
+        for i in range(self._first, self._first + count):
+            self._payloads[i] = None
+        self._first += count
+        # Every live row appears once per band, so each band keeps the same count.
+        live = self._sorted_rows >= self._first
+        self._sorted_keys = np.stack([keys[mask] for keys, mask in zip(self._sorted_keys, live)])
+        self._sorted_rows = np.stack([rows[mask] for rows, mask in zip(self._sorted_rows, live)])
+        if self._first > len(self._payloads) // 2:
+            # Compact storage so evicted rows do not pin memory forever.
+            shift, kept = self._first, len(self._payloads) - self._first
+            self._signatures[:kept] = self._signatures[shift : shift + kept]
+            self._payloads = self._payloads[shift:]
+            self._sorted_rows -= shift
+            self._first = 0
+
+    def _candidates(self, keys: np.ndarray) -> list[int]:
+        found: set[int] = set()
+        if self._sorted_keys.shape[1]:
+            for band, key in enumerate(keys):
+                lo = np.searchsorted(self._sorted_keys[band], key, side="left")
+                hi = np.searchsorted(self._sorted_keys[band], key, side="right")
+                found.update(self._sorted_rows[band, lo:hi].tolist())
+        if self._tail_len:
+            hits = np.nonzero((self._tail_keys[: self._tail_len] == keys).any(axis=1))[0]
+            found.update(self._tail_rows[hits].tolist())
+        return sorted(row for row in found if row >= self._first)
+
+    def candidates(self, signature: np.ndarray) -> list[Any]:
+        """Payloads of the entries sharing at least one band with ``signature``."""
+        keys = band_keys(signature, self.bands)[0]
+        with self._lock:
+            return [self._payloads[row] for row in self._candidates(keys)]
+
+    def best_match(self, signature: np.ndarray, threshold: float = NEAR_DUP_THRESHOLD) -> tuple[Any, float] | None:
+        """(payload, estimated similarity) of the closest entry at or above ``threshold``."""
+        keys = band_keys(signature, self.bands)[0]
+        with self._lock:
+            rows = self._candidates(keys)
+            if not rows:
+                return None
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            best = int(np.argmax(similarity))
+            if similarity[best] < threshold:
+                return None
+            return self._payloads[rows[best]], float(similarity[best])
@@ -2,11 +2,15 @@ import re
 from pdfminer.high_level import extract_text
 from docx import Document
 
+from skill_matcher import SkillMatcher, load_taxonomy
+
 
 # ---------------------------
 # SKILL LIST (customizable)
 # ---------------------------
-SKILLS_DB = [
+# The shared taxonomy (skills_taxonomy.json, with its synonyms); this short list is
+# only used if the data file is missing.
+_DEFAULT_SKILLS = [
     "python", "java", "c", "c++", "javascript",
     "react", "node", "mongodb", "sql",
     "aws", "docker", "html", "css",
@@ -14,6 +18,8 @@ SKILLS_DB = [
     "data analysis", "pandas", "numpy",
     "tensorflow", "pytorch"
 ]
+SKILLS_DB = list(load_taxonomy()[0]) or _DEFAULT_SKILLS
+_skill_matcher = SkillMatcher(SKILLS_DB)
 
 
 # ---------------------------
@@ -45,14 +51,7 @@ def extract_resume_text(file_path):
 # SKILL EXTRACTION
 # ---------------------------
 def extract_skills(text):
-    text_lower = text.lower()
-    found_skills = []
-
-    for skill in SKILLS_DB:
-        if skill in text_lower:
-            found_skills.append(skill)
-
-    return list(set(found_skills))
+    return _skill_matcher.find(text)
 
 
 # ---------------------------
@@ -0,0 +1,167 @@
+"""
+Configurable pdfminer text extraction for resumes.
+
+pdfminer's ``extract_text`` runs full layout analysis on every page. Most of that cost
+is the hierarchical text-box grouping (``boxes_flow``), which resumes rarely need. This
+module drives pdfminer page by page instead, so extraction can:
+- use a cheaper layout mode ("fast" skips box grouping, "none" skips layout analysis),
+- stop after PDF_MAX_PAGES pages or once PDF_TARGET_CHARS characters are collected,
+- extract page ranges separately, so long documents can be split across workers and
+  joined with join_pages, which applies the same PDF_TARGET_CHARS cut-off page by page.
+"""
+from __future__ import annotations
+
+import io
+import os
+from typing import BinaryIO
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams, LTChar, LTContainer, LTItem, LTPage, LTText
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+# "full" = pdfminer defaults (what extract_text does), "fast" = line/box detection
+# without box grouping (boxes read top to bottom), "none" = content-stream order with
+# a line break wherever the baseline moves.
+PDF_LAYOUT = os.getenv("PDF_LAYOUT", "fast").strip().lower()
+# 0 = no limit for either.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_TARGET_CHARS = int(os.getenv("PDF_TARGET_CHARS", "40000"))
+# Documents longer than this many pages get their remaining pages split across workers
+# (0 = always extract in one call).
+PDF_PARALLEL_PAGES = int(os.getenv("PDF_PARALLEL_PAGES", "4"))
+
+LAYOUT_MODES: dict[str, LAParams | None] = {
+    "full": LAParams(),
+    "fast": LAParams(boxes_flow=None),
+    "none": None,
+}
+
+
+class _BaselineTextConverter(TextConverter):
+    """
+    TextConverter for layout "none". Without layout analysis there are no text lines,
+    so pdfminer writes each page as one run of characters; this ends a line wherever
+    the baseline moves by more than half a character height.
+    """
+
+    def receive_layout(self, ltpage: LTPage) -> None:
+        last_y: float | None = None
+
+        def render(item: LTItem) -> None:
+            nonlocal last_y
+            if isinstance(item, LTContainer):
+                for child in item:
+                    render(child)
+            elif isinstance(item, LTChar):
+                if last_y is not None and abs(item.y0 - last_y) > item.height / 2:
+                    self.write_text("\n")
+                last_y = item.y0
+                self.write_text(item.get_text())
+            elif isinstance(item, LTText):
+                self.write_text(item.get_text())
+
+        render(ltpage)
+        self.write_text("\n\f")
+
+
+def _open(source: str | bytes | BinaryIO) -> tuple[BinaryIO, bool]:
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source), True
+    if isinstance(source, str):
+        return open(source, "rb"), True
+    return source, False
+
+
+def _page_total(doc: PDFDocument) -> int:
+    try:
+        return int(resolve1(resolve1(doc.catalog["Pages"])["Count"]))
+    except Exception:
+        return sum(1 for _ in PDFPage.create_pages(doc))
+
+
+def extract_page_range(
+    source: str | bytes | BinaryIO,
+    first: int = 0,
+    last: int | None = None,
+    layout: str | None = None,
+    target_chars: int | None = None,
+) -> tuple[str, int]:
+    """
+    Text of pages ``first`` to ``last`` (exclusive, 0-based) and the document's page count.
+    Stops early once ``target_chars`` characters are collected (0 = never). Pages end
+    with a form feed, as with pdfminer's extract_text. None = the PDF_* setting.
+    """
+    layout = PDF_LAYOUT if layout is None else layout
+    target_chars = PDF_TARGET_CHARS if target_chars is None else target_chars
+    if layout not in LAYOUT_MODES:
+        raise ValueError(f"Unknown PDF layout mode {layout!r}; use one of {sorted(LAYOUT_MODES)}.")
+    fp, owned = _open(source)
+    try:
+        doc = PDFDocument(PDFParser(fp))
+        total = _page_total(doc)
+        last = total if last is None else min(last, total)
+        out = io.StringIO()
+        rsrcmgr = PDFResourceManager(caching=True)
+        laparams = LAYOUT_MODES[layout]
+        converter = TextConverter if laparams is not None else _BaselineTextConverter
+        device = converter(rsrcmgr, out, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for pageno, page in enumerate(PDFPage.create_pages(doc)):
+            if pageno >= last:
+                break
+            if pageno < first:
+                continue
+            interpreter.process_page(page)
+            if target_chars and out.tell() >= target_chars:
+                break
+        device.close()
+        return out.getvalue(), total
+    finally:
+        if owned:
+            fp.close()
+
+
+def extract_text(
+    source: str | bytes | BinaryIO,
+    layout: str | None = None,
+    max_pages: int | None = None,
+    target_chars: int | None = None,
+) -> str:
+    """Single-call extraction of the first ``max_pages`` pages (0 = all)."""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    return extract_page_range(source, 0, max_pages or None, layout, target_chars)[0]
+
+
+def split_pages(first: int, last: int, parts: int) -> list[tuple[int, int]]:
+    """Split pages [first, last) into at most ``parts`` contiguous, near-equal ranges."""
+    count = max(0, last - first)
+    parts = max(1, min(parts, count))
+    ranges = []
+    start = first
+    for i in range(parts):
+        size = count // parts + (1 if i < count % parts else 0)
+        if size:
+            ranges.append((start, start + size))
+        start += size
+    return ranges
+
+
+def join_pages(parts: list[str], target_chars: int | None = None) -> str:
+    """
+    Join the texts of consecutive page ranges, stopping at the first page where the
+    total reaches ``target_chars``: the same cut-off a single extract_page_range call
+    over all the pages applies. Pages end with a form feed.
+    """
+    target_chars = PDF_TARGET_CHARS if target_chars is None else target_chars
+    text = ""
+    for part in parts:
+        pages = part.split("\f")
+        for i, page in enumerate(pages):
+            if target_chars and len(text) >= target_chars:
+                return text
+            text += page if i == len(pages) - 1 else page + "\f"
+    return text
@@ -0,0 +1,137 @@
+"""
+Section-aware compaction of resume text before it is sent to Gemini.
+
+pdfminer output carries whitespace runs, page headers/footers repeated on every page
+(pages are separated by form feeds) and long tails of low-value text. Instead of
+cutting the raw text at a fixed character count, this keeps the highest-value
+sections (skills, experience, projects, ...) within a token budget and emits them in
+their original order.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections import Counter
+
+GEMINI_PROMPT_TOKEN_BUDGET = int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", "7000"))
+
+# Rough chars-per-token for English resume text; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+
+SECTION_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    ("skills", re.compile(r"(technical |core |key )?(skills|technologies|tech stack|tools)( & tools)?")),
+    ("experience", re.compile(r"(work |professional )?experience|employment( history)?|internships?")),
+    ("projects", re.compile(r"(academic |personal |key )?projects")),
+    ("summary", re.compile(r"(professional )?summary|profile|objective|about me")),
+    ("education", re.compile(r"education|academics?|qualifications?")),
+    ("certifications", re.compile(r"certifications?|courses|licen[cs]es")),
+    ("achievements", re.compile(r"achievements|awards|honou?rs|publications|activities")),
+    ("boilerplate", re.compile(r"declaration|references|hobbies|interests|personal (details|information)")),
+]
+# Lower index = kept first when the budget is tight. "header" is the text above the
+# first heading (name / contact); unrecognised headings stay inside the section above.
+SECTION_PRIORITY = [
+    "header", "skills", "experience", "projects", "summary",
+    "education", "certifications", "achievements", "boilerplate",
+]
+
+_WS_RE = re.compile(r"[ \t\u00a0\u200b]+")
+_DIGITS_RE = re.compile(r"\d+")
+_PAGE_NO_RE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _section_of(line: str) -> str | None:
+    """Canonical section name if ``line`` looks like a heading, else None."""
+    candidate = line.strip().rstrip(":").strip().lower()
+    if not candidate or len(candidate.split()) > 4:
+        return None
+    for name, pattern in SECTION_PATTERNS:
+        if pattern.fullmatch(candidate):
+            return name
+    return None
+
+
+def _repeated_edge_lines(pages: list[list[str]], edge: int = 3) -> set[str]:
+    """Lines (digits masked) seen at the top/bottom of at least half of the pages."""
+    if len(pages) < 2:
+        return set()
+    seen: Counter[str] = Counter()
+    for lines in pages:
+        edges = lines[:edge] + lines[-edge:]
+        seen.update({_DIGITS_RE.sub("#", ln.lower()) for ln in edges})
+    threshold = max(2, math.ceil(len(pages) / 2))
+    return {key for key, count in seen.items() if count >= threshold}
+
+
+def clean_lines(text: str) -> list[str]:
+    """Collapse whitespace, drop page numbers and repeated page headers/footers."""
+    pages = []
+    for page in text.split("\f"):
+        lines = [_WS_RE.sub(" ", ln).strip() for ln in page.splitlines()]
+        pages.append([ln for ln in lines if ln and not _PAGE_NO_RE.match(ln)])
+    repeated = _repeated_edge_lines(pages)
+    out: list[str] = []
+    for lines in pages:
+        for i, ln in enumerate(lines):
+            at_edge = i < 3 or i >= len(lines) - 3
+            if at_edge and _DIGITS_RE.sub("#", ln.lower()) in repeated:
+                continue
+            out.append(ln)
+    # Keep the first occurrence of the repeated header (it is usually the name line).
+    if repeated and pages and pages[0]:
+        first = pages[0][0]
+        if _DIGITS_RE.sub("#", first.lower()) in repeated:
+            out.insert(0, first)
+    return out
+
+
+def split_sections(lines: list[str]) -> list[tuple[str, list[str]]]:
+    sections: list[tuple[str, list[str]]] = [("header", [])]
+    for ln in lines:
+        name = _section_of(ln)
+        if name is not None:
+            sections.append((name, [ln]))
+        else:
+            sections[-1][1].append(ln)
+    return [(name, body) for name, body in sections if body]
+
+
+def compact_resume_text(text: str, token_budget: int = GEMINI_PROMPT_TOKEN_BUDGET) -> str:
+    """Cleaned resume text holding the most valuable sections within ``token_budget``."""
+    sections = split_sections(clean_lines(text))
+    if not sections:
+        return ""
+    rank = {name: i for i, name in enumerate(SECTION_PRIORITY)}
+    order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i][0], len(rank)), i))
+    budget = token_budget * CHARS_PER_TOKEN
+    kept: dict[int, list[str]] = {}
+    for i in order:
+        if budget <= 0:
+            break
+        body: list[str] = []
+        for ln in sections[i][1]:
+            cost = len(ln) + 1
+            if cost > budget:
+                # Keep what fits of the line rather than dropping it: text extracted
+                # without layout can be one very long line.
+                room = budget - 1
+                if room > 0:
+                    cut = ln[:room]
+                    if " " in cut:
+                        cut = cut.rsplit(" ", 1)[0]
+                    body.append(cut)
+                budget = 0
+                break
+            body.append(ln)
+            budget -= cost
+        # A heading alone carries nothing; drop it (and refund it) if none of its body fit.
+        if len(body) > 1 or (body and sections[i][0] == "header"):
+            kept[i] = body
+        elif body:
+            budget += len(body[0]) + 1
+    return "\n".join(ln for i in sorted(kept) for ln in kept[i])
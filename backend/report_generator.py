@@ -1,7 +1,85 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from fpdf import FPDF
 from datetime import datetime
 
+from analysis_cache import text_key
+
+# Rendered PDFs are cached in memory by a hash of the fields that appear in the report
+# and the generation date printed in its footer.
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "128"))
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "3600"))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+REPORT_FIELDS = ("filename", "predicted_role", "ats_score", "extracted_skills", "missing_skills")
+
+
+class ReportCache:
+    """In-memory LRU of rendered PDF bytes, capped by entry count, total size and TTL."""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 3600.0, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.max_bytes = max(1, max_bytes)
+        self._mem: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None and self.ttl > 0 and time.time() - item[0] > self.ttl:
+                del self._mem[key]
+                self._bytes -= len(item[1])
+                item = None
+            if item is None:
+                self.stats["misses"] += 1
+                return None
+            self._mem.move_to_end(key)
+            self.stats["hits"] += 1
+            return item[1]
+
+    def set(self, key: str, pdf: bytes) -> None:
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._mem[key] = (time.time(), pdf)
+            self._bytes += len(pdf)
+            self.stats["sets"] += 1
+            while len(self._mem) > 1 and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._mem.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._mem),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+
+report_cache = ReportCache(REPORT_CACHE_SIZE, REPORT_CACHE_TTL, REPORT_CACHE_MAX_BYTES)
+
+
+def _latin1(value) -> str:
+    # The built-in Arial font only covers Latin-1; replace anything else instead of failing.
+    return str(value).encode("latin-1", errors="replace").decode("latin-1")
+
 class PDFReport(FPDF):
+    # Shown in the footer; a date (not a time) so cached reports stay accurate all day.
+    generated_on = ""
+
     def header(self):
         # Logo or Header Text
         self.set_font('Arial', 'B', 15)
@@ -15,21 +93,42 @@ class PDFReport(FPDF):
         self.set_y(-15)
         self.set_font('Arial', 'I', 8)
         self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f'Page {self.page_no()} | Generated on {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 0, 'C')
+        self.cell(0, 10, f'Page {self.page_no()} | Generated on {self.generated_on or _today()}', 0, 0, 'C')
 
-def generate_pdf_report(data: dict, output_filepath: str):
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def report_fields(data: dict) -> dict:
+    """The report inputs from a payload; /analyze results name the found skills matched_skills."""
+    try:
+        ats_score = int(data.get("ats_score") or 0)
+    except (TypeError, ValueError):
+        ats_score = 0
+    return {
+        "filename": _latin1(data.get("filename") or "Resume"),
+        "predicted_role": _latin1(data.get("predicted_role") or "Unknown Role"),
+        "ats_score": ats_score,
+        "extracted_skills": [_latin1(s) for s in data.get("extracted_skills") or data.get("matched_skills") or []],
+        "missing_skills": [_latin1(s) for s in data.get("missing_skills") or []],
+    }
+
+
+def render_pdf_report(data: dict, generated_on: str | None = None) -> bytes:
     """
-    Generates a PDF report based on the parsed resume data and role analysis.
+    Builds the PDF report based on the parsed resume data and role analysis, in memory.
     """
     pdf = PDFReport()
+    pdf.generated_on = generated_on or _today()
     pdf.add_page()
 
     # Extract data from the payload sent by React
-    filename = data.get("filename", "Resume")
-    predicted_role = data.get("predicted_role", "Unknown Role")
-    ats_score = data.get("ats_score", 0)
-    extracted_skills = data.get("extracted_skills", [])
-    missing_skills = data.get("missing_skills", [])
+    fields = report_fields(data)
+    filename = fields["filename"]
+    predicted_role = fields["predicted_role"]
+    ats_score = fields["ats_score"]
+    extracted_skills = fields["extracted_skills"]
+    missing_skills = fields["missing_skills"]
 
     # Title Section
     pdf.set_font('Arial', 'B', 12)
@@ -98,5 +197,36 @@ def generate_pdf_report(data: dict, output_filepath: str):
     )
     pdf.multi_cell(0, 8, recommendation)
 
-    # Output the PDF
-    pdf.output(output_filepath)
\ No newline at end of file
+    # fpdf 1.x returns a latin-1 str for dest="S"; fpdf2 returns a bytearray.
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+def generate_pdf_report(data: dict, output_filepath: str):
+    """
+    Generates a PDF report based on the parsed resume data and role analysis.
+    """
+    with open(output_filepath, "wb") as fh:
+        fh.write(render_pdf_report(data))
+
+
+def report_key(data: dict, generated_on: str) -> str:
+    fields = {**report_fields(data), "generated_on": generated_on}
+    return text_key(json.dumps(fields, sort_keys=True, ensure_ascii=False))
+
+
+def current_report_key(data: dict) -> tuple[str, str]:
+    """(key, generated_on) of the report that would be rendered today; cheap, renders nothing."""
+    generated_on = _today()
+    return report_key(data, generated_on), generated_on
+
+
+def cached_pdf_report(data: dict, generated_on: str | None = None) -> tuple[bytes, str]:
+    """(PDF bytes, key); identical report inputs render once per day and REPORT_CACHE_TTL."""
+    generated_on = generated_on or _today()
+    key = report_key(data, generated_on)
+    pdf = report_cache.get(key)
+    if pdf is None:
+        pdf = render_pdf_report(data, generated_on)
+        report_cache.set(key, pdf)
+    return pdf, key
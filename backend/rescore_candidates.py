@@ -0,0 +1,273 @@
+"""
+Re-score stored candidates after a change to the skill lists or weights, without the PDFs.
+
+Profiles saved with SAVE_CANDIDATES keep their extracted text (resume_text). This job
+streams them in _id order, recomputes skills (parser.SKILLS_DB + matcher.COMMON_SKILLS),
+role and ATS score (role_scoring.ROLE_KEYWORDS, the same heuristic as the local
+fallback analysis) and the weighted skill match (matcher.SKILL_WEIGHTS) in a process
+pool, and writes each batch back with one unordered bulk_write.
+
+The new values always go to the ``scoring`` subdocument. The indexed top-level fields
+(skills, predicted_role, ats_score) that /candidates filters on are replaced only for
+profiles whose analysis came from the local fallback (analysis_source "fallback"):
+Gemini's scores, and those of profiles stored before the source was recorded, stay
+as they are, and ``analysis`` is never touched.
+
+Each scored profile records SCORING_VERSION, a hash of the skill tables, so a rerun
+only touches profiles scored with older tables (--force rescans everything). After
+every batch the last _id and the counters go to a JSON checkpoint; --resume continues
+from it instead of scanning the already finished prefix again.
+
+Usage (from backend/):
+    python rescore_candidates.py                       # every profile not yet on the current tables
+    python rescore_candidates.py --resume              # continue an interrupted run
+    python rescore_candidates.py --dry-run --limit 5000
+    python rescore_candidates.py --force --workers 8 --batch-size 2000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator
+
+from matcher import COMMON_SKILLS, SKILL_WEIGHTS, weighted_skill_match
+from parser import SKILLS_DB, extract_skills
+from role_scoring import ROLE_KEYWORDS, RoleScorer, keyword_ats_score
+from skill_matcher import SkillMatcher
+
+# Bump when the scoring code below changes in a way the table hash cannot see.
+SCORING_REVISION = 2
+SCORING_VERSION = hashlib.sha1(
+    json.dumps(
+        [SCORING_REVISION, SKILLS_DB, COMMON_SKILLS, SKILL_WEIGHTS, ROLE_KEYWORDS], sort_keys=True
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+DEFAULT_CHECKPOINT = "rescore_checkpoint.json"
+PROJECTION = {"resume_text": 1, "predicted_role": 1, "ats_score": 1, "analysis_source": 1}
+# Profiles whose top-level scores came from the heuristic re-scoring recomputes.
+REPLACEABLE_SOURCES = ("fallback",)
+
+_role_scorer = RoleScorer(ROLE_KEYWORDS)
+_common_skill_matcher = SkillMatcher(COMMON_SKILLS)
+
+
+def score_resumes(texts: list[str]) -> list[dict[str, Any]]:
+    """Fresh scores for a batch of stored resume texts (runs in the worker processes)."""
+    lowered = [str(text or "").lower() for text in texts]
+    results = []
+    for text, ranking in zip(lowered, _role_scorer.top_k(lowered, k=4)):
+        role, matched = ranking[0]["role"], ranking[0]["matched"]
+        skills = sorted(set(extract_skills(text)) | set(_common_skill_matcher.find(text)) | set(matched))
+        weighted, weighted_skills = weighted_skill_match(skills, " ".join(ROLE_KEYWORDS[role]))
+        results.append(
+            {
+                "skills": skills,
+                "predicted_role": role,
+                "ats_score": keyword_ats_score(len(matched), len(ROLE_KEYWORDS[role])),
+                "recommended_roles": [r["role"] for r in ranking],
+                "role_scores": [{"role": r["role"], "score": r["score"]} for r in ranking],
+                "weighted_skill_score": weighted,
+                "weighted_skills": weighted_skills,
+            }
+        )
+    return results
+
+
+def update_for(scores: dict[str, Any], rescored_at: datetime, replace_fields: bool) -> dict[str, Any]:
+    fields: dict[str, Any] = {
+        "scoring": {
+            "version": SCORING_VERSION,
+            "rescored_at": rescored_at,
+            **scores,
+        }
+    }
+    if replace_fields:
+        fields.update(
+            skills=scores["skills"],
+            predicted_role=scores["predicted_role"],
+            ats_score=scores["ats_score"],
+        )
+    return {"$set": fields}
+
+
+def load_checkpoint(path: str) -> dict[str, Any] | None:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(path: str, state: dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=2)
+    os.replace(tmp, path)
+
+
+def batches(cursor: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(cursor)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def _split(items: list, parts: int) -> list[list]:
+    step = -(-len(items) // max(1, parts))
+    return [items[i : i + step] for i in range(0, len(items), step)]
+
+
+def rescore(
+    collection,
+    batch_size: int = 1000,
+    workers: int = 1,
+    checkpoint: str | None = DEFAULT_CHECKPOINT,
+    resume: bool = False,
+    force: bool = False,
+    dry_run: bool = False,
+    limit: int = 0,
+    report: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Re-score ``collection`` batch by batch; returns the final counters. The next batch
+    is scored by the pool while the previous one is written, and the checkpoint is
+    saved only after a batch's bulk_write succeeded, so an interrupted run redoes at
+    most one batch (re-scoring is idempotent).
+    """
+    from bson import ObjectId
+    from pymongo import UpdateOne
+
+    state = {
+        "version": SCORING_VERSION,
+        "force": force,
+        "last_id": None,
+        "processed": 0,
+        "updated": 0,
+        "fields_replaced": 0,
+        "role_changed": 0,
+        "ats_changed": 0,
+        "seconds": 0.0,
+    }
+    if resume and checkpoint:
+        saved = load_checkpoint(checkpoint)
+        if saved and saved.get("version") == SCORING_VERSION and saved.get("force") == force:
+            state.update(saved)
+        elif saved:
+            print(f"[rescore] {checkpoint} is for another scoring version or mode; starting over.")
+
+    query: dict[str, Any] = {"resume_text": {"$type": "string"}}
+    if not force:
+        query["scoring.version"] = {"$ne": SCORING_VERSION}
+    if state["last_id"]:
+        query["_id"] = {"$gt": ObjectId(state["last_id"])}
+    # Metadata count: cheap on any collection size, an upper bound for the ETA.
+    total = collection.estimated_document_count()
+    if limit:
+        total = min(total, state["processed"] + limit)
+    cursor = collection.find(query, PROJECTION).sort("_id", 1).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    started = time.perf_counter() - state["seconds"]
+
+    def submit(docs: list[dict]) -> list[Future]:
+        texts = [doc.get("resume_text") or "" for doc in docs]
+        if pool is not None:
+            return [pool.submit(score_resumes, part) for part in _split(texts, workers)]
+        done: Future = Future()
+        done.set_result(score_resumes(texts))
+        return [done]
+
+    def write(docs: list[dict], futures: list[Future]) -> None:
+        scores = [s for future in futures for s in future.result()]
+        now = datetime.now(timezone.utc)
+        replace = [doc.get("analysis_source") in REPLACEABLE_SOURCES for doc in docs]
+        for doc, new, replaced in zip(docs, scores, replace):
+            if replaced:
+                state["fields_replaced"] += 1
+                state["role_changed"] += doc.get("predicted_role") != new["predicted_role"]
+                state["ats_changed"] += doc.get("ats_score") != new["ats_score"]
+        if not dry_run:
+            ops = [
+                UpdateOne({"_id": doc["_id"]}, update_for(new, now, replaced))
+                for doc, new, replaced in zip(docs, scores, replace)
+            ]
+            result = collection.bulk_write(ops, ordered=False)
+            state["updated"] += result.modified_count
+        state["processed"] += len(docs)
+        state["last_id"] = str(docs[-1]["_id"])
+        state["seconds"] = round(time.perf_counter() - started, 2)
+        if checkpoint and not dry_run:
+            save_checkpoint(checkpoint, state)
+        if report:
+            report({**state, "total": max(total, state["processed"])})
+
+    try:
+        pending = None
+        for docs in batches(cursor, batch_size):
+            futures = submit(docs)
+            if pending is not None:
+                write(*pending)
+            pending = (docs, futures)
+        if pending is not None:
+            write(*pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    state["seconds"] = round(time.perf_counter() - started, 2)
+    return state
+
+
+def print_progress(state: dict[str, Any]) -> None:
+    done, total, seconds = state["processed"], state["total"], state["seconds"]
+    rate = done / seconds if seconds else 0.0
+    eta = (total - done) / rate if rate else 0.0
+    print(
+        f"[rescore] {done:,}/{total:,} ({done / max(1, total):.1%})  {rate:,.0f} docs/s  "
+        f"ETA {eta:,.0f}s  updated {state['updated']:,}  fallback fields replaced {state['fields_replaced']:,}  "
+        f"role changed {state['role_changed']:,}  "
+        f"ats changed {state['ats_changed']:,}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score stored candidates from their saved resume text.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="profiles per read, score and bulk_write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes (1 = inline)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file ('' disables it)")
+    parser.add_argument("--resume", action="store_true", help="continue from --checkpoint")
+    parser.add_argument("--force", action="store_true", help="re-score profiles already on the current tables")
+    parser.add_argument("--dry-run", action="store_true", help="score and report, write nothing")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many profiles")
+    args = parser.parse_args()
+
+    import database
+
+    if not database.ping():
+        sys.exit("[rescore] MongoDB is not reachable (MONGO_URI).")
+    print(f"[rescore] scoring version {SCORING_VERSION}, {args.workers} worker(s), batches of {args.batch_size}")
+    state = rescore(
+        database.get_collection(),
+        batch_size=max(1, args.batch_size),
+        workers=max(1, args.workers),
+        checkpoint=args.checkpoint or None,
+        resume=args.resume,
+        force=args.force,
+        dry_run=args.dry_run,
+        limit=max(0, args.limit),
+        report=print_progress,
+    )
+    print(json.dumps({k: v for k, v in state.items() if k != "force"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Vectorized role scoring for batches of resumes.
+
+Resumes become a (resumes x keywords) presence matrix in one pass; a single matrix
+product with the (keywords x roles) weight matrix scores every resume against every
+role. Scores are matched-keyword counts, so the ranking is the same as counting per
+role in Python. The per-role scores are a temperature softmax over keyword coverage:
+they sum to 1 and rank like the counts, but they are not calibrated probabilities
+(nothing fits them to labelled outcomes). The keyword table
+has a few dozen columns, so both matrices are dense: at that width scipy.sparse only
+adds constructor overhead (the hashed role classifier in matcher.py is the sparse one).
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Iterable
+
+import numpy as np
+
+from skill_matcher import SkillMatcher
+
+# Softmax temperature over coverage (matched / role keywords, 0..1): lower = peakier.
+ROLE_SCORE_TEMPERATURE = float(os.getenv("ROLE_SCORE_TEMPERATURE", "0.1"))
+
+
+# Keywords per role for the local (non-Gemini) analysis and bulk re-scoring.
+ROLE_KEYWORDS: dict[str, list[str]] = {
+    "Data Scientist": [
+        "python",
+        "pandas",
+        "numpy",
+        "scikit",
+        "machine learning",
+        "tensorflow",
+        "pytorch",
+        "sql",
+        "statistics",
+        "power bi",
+    ],
+    "Backend Developer": [
+        "python",
+        "fastapi",
+        "django",
+        "flask",
+        "api",
+        "sql",
+        "postgresql",
+        "redis",
+        "docker",
+        "aws",
+    ],
+    "Frontend Developer": [
+        "javascript",
+        "typescript",
+        "react",
+        "next.js",
+        "html",
+        "css",
+        "redux",
+        "tailwind",
+        "webpack",
+        "api",
+    ],
+    "DevOps Engineer": [
+        "docker",
+        "kubernetes",
+        "jenkins",
+        "github actions",
+        "terraform",
+        "aws",
+        "azure",
+        "gcp",
+        "linux",
+        "monitoring",
+    ],
+}
+
+
+def keyword_ats_score(matched: int, total: int) -> int:
+    """Heuristic ATS score (35..95) from the share of a role's keywords a resume mentions."""
+    ratio = (matched / max(1, total)) * 100
+    return int(max(35, min(95, round(40 + ratio * 0.55))))
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k best scores per row, best first (ties keep column order)."""
+    k = max(1, min(k, scores.shape[1]))
+    # Stable sort on the negated scores keeps earlier roles first on ties.
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+class RoleScorer:
+    """Scores many resumes against a role -> keywords table with one dense matrix product."""
+
+    def __init__(self, role_keywords: dict[str, list[str]], temperature: float = ROLE_SCORE_TEMPERATURE):
+        self.roles = list(role_keywords)
+        self.role_keywords = {role: list(keywords) for role, keywords in role_keywords.items()}
+        self.keywords = list(dict.fromkeys(kw for keywords in role_keywords.values() for kw in keywords))
+        self.temperature = max(1e-6, temperature)
+        self._matcher = SkillMatcher(self.keywords)
+        self._column = {kw: i for i, kw in enumerate(self.keywords)}
+        self._weights = np.zeros((len(self.keywords), len(self.roles)), dtype=np.float32)
+        for j, role in enumerate(self.roles):
+            for kw in self.role_keywords[role]:
+                self._weights[self._column[kw], j] = 1.0
+        self._role_sizes = self._weights.sum(axis=0)
+
+    def _vectorize(self, texts: Iterable[str]) -> tuple[np.ndarray, list[set[str]]]:
+        found = [set(self._matcher.find(text)) for text in texts]
+        rows = [i for i, keywords in enumerate(found) for _ in keywords]
+        cols = [self._column[kw] for keywords in found for kw in keywords]
+        X = np.zeros((len(found), len(self.keywords)), dtype=np.float32)
+        X[rows, cols] = 1.0
+        return X, found
+
+    def vectorize(self, texts: Iterable[str]) -> np.ndarray:
+        """(resumes x keywords) 0/1 matrix of keyword presence."""
+        return self._vectorize(texts)[0]
+
+    def score(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(matched counts, softmax scores), both (resumes x roles), for a presence matrix."""
+        counts = X @ self._weights
+        coverage = counts / np.maximum(self._role_sizes, 1)
+        return counts, softmax(coverage / self.temperature)
+
+    def top_k(self, texts: list[str], k: int = 3) -> list[list[dict[str, Any]]]:
+        """Per resume, the k best roles (most matched keywords) with score and matches."""
+        X, found = self._vectorize(texts)
+        counts, scores = self.score(X)
+        best = top_k_indices(counts, k)
+        results = []
+        for i, row in enumerate(best):
+            present = found[i]
+            results.append(
+                [
+                    {
+                        "role": self.roles[j],
+                        "score": round(float(scores[i, j]), 4),
+                        "matched": [kw for kw in self.role_keywords[self.roles[j]] if kw in present],
+                    }
+                    for j in row
+                ]
+            )
+        return results
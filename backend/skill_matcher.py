@@ -0,0 +1,106 @@
+"""
+Shared skill matcher: finds every skill of a list in one pass over the text.
+
+Text and skill phrases go through the same tokenizer, so matches respect token
+boundaries ("java" does not match "javascript", "c" does not match "react") and
+punctuation variants line up ("scikit-learn" == "scikit learn"). A plural token
+matches its singular when only the singular is a skill token ("APIs" -> "api",
+"LLMs" -> "llm"; "aws" and "pandas" stay as they are). Lookup is a hash probe per
+n-gram, so cost is O(tokens x longest phrase) regardless of taxonomy size.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Iterable
+
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json"),
+)
+
+# A token is alphanumerics with inner dots ("next.js", "asp.net"), an optional leading
+# dot (".net") and trailing +/# ("c++", "c#"). Anything else is a separator.
+_TOKEN_RE = re.compile(r"\.?[a-z0-9](?:[a-z0-9]|\.(?=[a-z0-9]))*[+#]*")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=4)
+def load_taxonomy(path: str = SKILL_TAXONOMY_PATH) -> tuple[tuple[str, ...], dict[str, str]]:
+    """Return (skills, alias -> canonical synonyms) from the taxonomy JSON file."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return (), {}
+    skills = tuple(str(s).strip().lower() for s in data.get("skills") or [] if str(s).strip())
+    synonyms = {
+        str(alias).strip().lower(): str(canonical).strip().lower()
+        for alias, canonical in (data.get("synonyms") or {}).items()
+    }
+    return skills, synonyms
+
+
+class SkillMatcher:
+    """Single-pass, boundary-aware matcher over a fixed skill list."""
+
+    def __init__(self, skills: Iterable[str], synonyms: dict[str, str] | None = None):
+        if synonyms is None:
+            synonyms = load_taxonomy()[1]
+        unique = dict.fromkeys(s for s in (str(k).strip().lower() for k in skills) if s)
+        self.skills: list[str] = list(unique)
+        self._phrases: dict[tuple[str, ...], str] = {}
+        # Longest phrase starting with each token; positions whose token starts no phrase
+        # are skipped with a single dict probe.
+        self._span: dict[str, int] = {}
+        # Every token of every phrase, for the plural check in find().
+        self._vocab: set[str] = set()
+        for canonical in self.skills:
+            self._add(canonical, canonical)
+        for alias, canonical in synonyms.items():
+            if canonical in unique:
+                self._add(alias, canonical)
+
+    def _add(self, phrase: str, canonical: str) -> None:
+        tokens = tuple(tokenize(phrase))
+        if tokens:
+            self._phrases.setdefault(tokens, canonical)
+            self._span[tokens[0]] = max(self._span.get(tokens[0], 0), len(tokens))
+            self._vocab.update(tokens)
+
+    def _singular(self, token: str) -> str:
+        # Plain "-s" plurals only, and never down to one or two letters ("cs" is not "c").
+        vocab = self._vocab
+        if len(token) > 3 and token[-1] == "s" and token not in vocab and token[:-1] in vocab:
+            return token[:-1]
+        return token
+
+    def find(self, text: str) -> list[str]:
+        """Canonical skills present in ``text``, unique, in order of first appearance."""
+        tokens = [self._singular(token) for token in tokenize(text or "")]
+        phrases, span = self._phrases, self._span
+        seen: dict[str, None] = {}
+        for i, token in enumerate(tokens):
+            longest = span.get(token)
+            if longest is None:
+                continue
+            for n in range(1, longest + 1):
+                hit = phrases.get(tuple(tokens[i : i + n]))
+                if hit is not None:
+                    seen.setdefault(hit, None)
+        return list(seen)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+@lru_cache(maxsize=1)
+def taxonomy_matcher() -> SkillMatcher:
+    """Matcher over the whole data-file taxonomy (built once per process)."""
+    skills, synonyms = load_taxonomy()
+    return SkillMatcher(skills, synonyms)
@@ -0,0 +1,28 @@
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+# Local fallback analysis only: no Gemini, JSearch, reranking model or disk caches.
+# Set before any test imports main, which reads them at import time.
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["RAPIDAPI_KEY"] = ""
+os.environ["JOB_RERANK_ENABLED"] = "0"
+os.environ["JOB_CACHE_ENABLED"] = "0"
+os.environ["ANALYSIS_CACHE_DB"] = ""
+os.environ["WARMUP"] = ""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One app lifetime per session: shutdown closes the process-wide worker pools.
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import main
+from admission import AdmissionController
+from corpus import make_text_pdf, synthetic_resume_text
+
+
+def test_multi_slot_request_counts_against_the_lane_and_the_worker():
+    async def scenario():
+        controller = AdmissionController(max_inflight=4, batch_max_inflight=2, queue_timeout=5)
+        assert controller.slots_for("batch", 4) == 2
+        batch = await controller.acquire("batch", 2)
+        # The batch lane is full; interactive requests still get the rest of the worker.
+        second_batch = asyncio.ensure_future(controller.acquire("batch", 2))
+        first = await controller.acquire("interactive")
+        second = await controller.acquire("interactive")
+        await asyncio.sleep(0)
+        assert not second_batch.done()
+        assert controller.snapshot()["lanes"]["batch"]["running"] == 2
+        controller.release("batch", batch, 2)
+        await asyncio.wait_for(second_batch, 1)
+        assert sum(lane["running"] for lane in controller.snapshot()["lanes"].values()) == 4
+        for granted_at in (first, second):
+            controller.release("interactive", granted_at)
+        controller.release("batch", second_batch.result(), 2)
+        assert all(lane["running"] == 0 for lane in controller.snapshot()["lanes"].values())
+
+    asyncio.run(scenario())
+
+
+def test_batch_runs_no_more_analyses_than_its_admission_slots(client, monkeypatch):
+    controller = AdmissionController(max_inflight=8, batch_max_inflight=2)
+    monkeypatch.setattr(main, "admission_controller", controller)
+    monkeypatch.setattr(main, "BATCH_CONCURRENCY", 4)
+    running, peak = 0, 0
+    analyze_item = main._analyze_batch_item
+
+    async def counting(*args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.05)
+            return await analyze_item(*args)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(main, "_analyze_batch_item", counting)
+    files = [
+        ("files", (f"r{i}.pdf", make_text_pdf(synthetic_resume_text(100 + i, 10)), "application/pdf"))
+        for i in range(6)
+    ]
+    response = client.post("/analyze/batch", files=files)
+    assert response.status_code == 200
+    assert len([json.loads(line) for line in response.text.splitlines() if line]) == 6
+    assert peak == 2
+    assert controller.snapshot()["lanes"]["batch"]["running"] == 0
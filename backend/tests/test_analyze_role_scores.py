@@ -0,0 +1,43 @@
+import json
+
+from corpus import make_text_pdf
+
+
+RESUME = "Jane Doe\nSKILLS\npython fastapi django docker aws sql redis api\n"
+
+
+def _check_role_scores(payload):
+    scores = payload["role_scores"]
+    assert scores, "fallback analysis must return role scores"
+    assert scores[0]["role"] == payload["predicted_role"]
+    assert all(set(s) == {"role", "score"} for s in scores)
+    assert all(0.0 <= s["score"] <= 1.0 for s in scores)
+    assert [s["score"] for s in scores] == sorted((s["score"] for s in scores), reverse=True)
+
+
+def test_analyze_returns_role_scores(client):
+    response = client.post("/analyze", files={"file": ("jane.pdf", make_text_pdf(RESUME), "application/pdf")})
+    assert response.status_code == 200
+    _check_role_scores(response.json())
+
+
+def test_analyze_batch_returns_role_scores(client):
+    pdf = make_text_pdf(RESUME.replace("Jane", "John"))
+    response = client.post("/analyze/batch", files=[("files", ("john.pdf", pdf, "application/pdf"))])
+    assert response.status_code == 200
+    (line,) = [l for l in response.text.splitlines() if l]
+    item = json.loads(line)
+    assert item["status"] == "ok"
+    _check_role_scores(item["result"])
+
+
+def test_fallback_results_are_not_cached(client):
+    # No GEMINI_API_KEY in the tests: every analysis is a local fallback.
+    import main
+
+    pdf = make_text_pdf(RESUME.replace("Jane", "June"))
+    sets = main.analysis_cache.stats["sets"]
+    for _ in range(2):
+        response = client.post("/analyze", files={"file": ("june.pdf", pdf, "application/pdf")})
+        assert response.status_code == 200
+    assert main.analysis_cache.stats["sets"] == sets
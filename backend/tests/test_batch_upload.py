@@ -0,0 +1,28 @@
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_archive_limits_report_the_remaining_room():
+    data = _zip({f"r{i}.pdf": b"%PDF-1.4 " + b"x" * 100 for i in range(3)})
+    with pytest.raises(HTTPException) as exc:
+        main._expand_batch_upload("a.zip", data, max_items=2)
+    assert exc.value.status_code == 413
+    assert "room for 2 more" in exc.value.detail
+
+    with pytest.raises(HTTPException) as exc:
+        main._expand_batch_upload("a.zip", data, max_bytes=150)
+    assert exc.value.status_code == 413
+    assert "150 bytes" in exc.value.detail
@@ -0,0 +1,60 @@
+"""
+explain() checks for the /candidates query shapes. They need a real mongod (mongomock
+has no query planner): set TEST_MONGO_URI (default MONGO_URI); skipped when unreachable.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import database
+from bench_candidate_search import plan_stages
+from seed_candidates import synthetic_candidates
+
+pymongo = pytest.importorskip("pymongo")
+
+MONTH_AGO = datetime.now(timezone.utc) - timedelta(days=30)
+# One entry per filter / sort shape /candidates can issue (every page sorts newest first).
+QUERY_SHAPES = {
+    "newest": {},
+    "role": {"role": "Data Scientist"},
+    "skill": {"skills": ["kubernetes"]},
+    "skills+role": {"skills": ["python", "aws"], "role": "Backend Developer"},
+    "ats": {"ats_min": 60},
+    "role+ats": {"role": "DevOps Engineer", "ats_min": 60, "ats_max": 95},
+    "skill+date": {"skills": ["react"], "uploaded_from": MONTH_AGO},
+    "date range": {"uploaded_from": MONTH_AGO, "uploaded_to": datetime.now(timezone.utc)},
+}
+
+
+@pytest.fixture(scope="module")
+def collection():
+    client = pymongo.MongoClient(os.getenv("TEST_MONGO_URI", database.MONGO_URI), serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError:
+        pytest.skip("no mongod reachable")
+    db_name = f"resumeaix_test_{uuid.uuid4().hex[:8]}"
+    collection = client[db_name]["candidates"]
+    collection.insert_many(list(synthetic_candidates(5000, days=120)))
+    database.ensure_indexes(collection)
+    yield collection
+    client.drop_database(db_name)
+    client.close()
+
+
+@pytest.mark.parametrize("page", ["first", "next"])
+@pytest.mark.parametrize("shape", list(QUERY_SHAPES))
+def test_search_uses_index_without_in_memory_sort(collection, shape, page):
+    filters = QUERY_SHAPES[shape]
+    if page == "next":
+        cursor = database.search_candidates(5, target=collection, **filters)["next_cursor"]
+        assert cursor, f"{shape}: seed data too small for a second page"
+        filters = {**filters, "cursor": cursor}
+    stages = plan_stages(
+        database.search_candidates(20, target=collection, explain=True, **filters)["queryPlanner"]["winningPlan"]
+    )
+    assert "IXSCAN" in stages, stages
+    assert "COLLSCAN" not in stages, stages
+    assert "SORT" not in stages, stages
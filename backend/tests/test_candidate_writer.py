@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+from bson import ObjectId
+
+import database
+from database import CandidateWriter
+
+mongomock = pytest.importorskip("mongomock")
+
+
+class GatedCollection:
+    """mongomock collection whose insert_many waits for ``gate`` (a stalled mongod)."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.gate = threading.Event()
+        self.batch_sizes = []
+
+    def insert_many(self, docs, ordered=True):
+        self.gate.wait()
+        self.batch_sizes.append(len(docs))
+        return self.collection.insert_many(docs, ordered=ordered)
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.candidates
+
+
+def test_documents_are_written_in_batches(collection):
+    target = GatedCollection(collection)
+    writer = CandidateWriter(lambda: target, batch_size=10, flush_seconds=5, max_queue=100)
+    for i in range(25):
+        assert writer.put({"n": i})
+    target.gate.set()
+    # Two full batches go out at once; the last 5 only after flush_seconds or on close.
+    assert writer.close(timeout=10)
+    assert collection.count_documents({}) == 25
+    assert target.batch_sizes == [10, 10, 5]
+    stats = writer.snapshot()
+    assert stats["written"] == 25 and stats["failed"] == 0 and stats["pending"] == 0
+
+
+def test_flush_waits_for_queued_documents(collection):
+    writer = CandidateWriter(lambda: collection, batch_size=50, flush_seconds=0.05)
+    for i in range(7):
+        writer.put({"n": i})
+    assert writer.flush(timeout=5)
+    assert collection.count_documents({}) == 7
+    writer.close(timeout=5)
+
+
+def test_full_queue_drops_after_blocking_and_close_is_bounded(collection):
+    target = GatedCollection(collection)
+    writer = CandidateWriter(lambda: target, batch_size=1, flush_seconds=0, max_queue=2, block_seconds=0.05)
+    assert writer.put({"n": 0})
+    time.sleep(0.1)  # the writer thread now holds doc 0 and waits on the gate
+    assert writer.put({"n": 1}) and writer.put({"n": 2})
+    assert not writer.put({"n": 3})
+    assert writer.snapshot()["dropped"] == 1
+
+    assert not writer.flush(timeout=0.05)
+    started = time.monotonic()
+    assert not writer.close(timeout=0.2)
+    assert time.monotonic() - started < 1
+    assert not writer.put({"n": 4})
+
+    target.gate.set()
+    assert writer.flush(timeout=5)
+    assert collection.count_documents({}) == 3
+
+
+def test_link_duplicate_does_not_wait_on_a_stalled_writer(collection, monkeypatch):
+    target = GatedCollection(collection)
+    writer = CandidateWriter(lambda: target, batch_size=1, flush_seconds=0)
+    monkeypatch.setattr(database, "_writer", writer)
+    monkeypatch.setattr(database, "DB_BULK_WRITES", True)
+    monkeypatch.setattr(database, "DB_WRITE_BLOCK_SECONDS", 0.1)
+    original = ObjectId()
+    writer.put({"_id": original})
+
+    started = time.monotonic()
+    assert not database.link_duplicate(original, "copy.pdf", 0.9, target=collection)
+    assert time.monotonic() - started < 1
+
+    target.gate.set()
+    assert database.link_duplicate(original, "copy.pdf", 0.9, target=collection)
+    assert collection.find_one({"_id": original})["duplicate_uploads"] == 1
+    writer.close(timeout=5)
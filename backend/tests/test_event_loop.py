@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import main
+from admission import AdmissionController
+from corpus import make_text_pdf, synthetic_resume_text
+from stubs import start_jsearch_stub
+
+INFLIGHT = 20
+# /health latency bounds while the analyses run. A blocked loop would show up as whole
+# seconds (a 0.5 s Gemini stub call or a pdfminer run per analysis); the max allows for
+# GIL hand-offs between ~20 busy threads on a one-CPU CI box.
+HEALTH_P95_MS = 50
+HEALTH_MAX_MS = 500
+
+
+@pytest.fixture
+def slow_services(monkeypatch):
+    """Stub Gemini (0.5 s per call) and JSearch (0.2 s per role), both off the event loop."""
+    server = start_jsearch_stub(delay=0.2)
+
+    def slow_gemini(resume_text):
+        time.sleep(0.5)
+        return main.analyze_resume_fallback(resume_text)
+
+    monkeypatch.setattr(main, "analyze_resume_with_gemini", slow_gemini)
+    monkeypatch.setattr(main, "JSEARCH_URL", f"http://127.0.0.1:{server.server_port}/search")
+    monkeypatch.setattr(main, "RAPIDAPI_KEY", "test")
+    # Admit all of them at once, so every analysis is in flight together.
+    monkeypatch.setattr(main, "admission_controller", AdmissionController(max_inflight=INFLIGHT))
+    # Start the PDF workers first, as WARMUP=pdf does in production.
+    main._warm("pdf")
+    yield
+    server.shutdown()
+
+
+async def _health_while_analyzing(pdfs):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+
+        async def analyze(i):
+            files = {"file": (f"load-{i}.pdf", pdfs[i], "application/pdf")}
+            return await client.post("/analyze", files=files)
+
+        jobs = [asyncio.create_task(analyze(i)) for i in range(len(pdfs))]
+        await asyncio.sleep(0.1)
+        health_ms = []
+        while not all(job.done() for job in jobs):
+            started = time.perf_counter()
+            response = await client.get("/health")
+            health_ms.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+            await asyncio.sleep(0.02)
+        return [job.result() for job in jobs], health_ms
+
+
+def test_health_answers_while_analyses_are_in_flight(slow_services):
+    pdfs = [make_text_pdf(synthetic_resume_text(seed, 40)) for seed in range(INFLIGHT)]
+    responses, health_ms = asyncio.run(_health_while_analyzing(pdfs))
+    assert [r.status_code for r in responses] == [200] * INFLIGHT
+    assert all(r.json()["jobs"] for r in responses)
+    # The analyses take seconds (stub latency alone is 0.7 s), so /health was sampled throughout.
+    assert len(health_ms) >= 10
+    health_ms.sort()
+    assert health_ms[int(len(health_ms) * 0.95)] < HEALTH_P95_MS, health_ms[-5:]
+    assert health_ms[-1] < HEALTH_MAX_MS, health_ms[-5:]
@@ -0,0 +1,45 @@
+import os
+
+from job_cache import JobListingCache
+
+JOBS = [{"title": "Backend Developer", "company": "Stub Co"}]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unusable_database_degrades_to_memory_only(tmp_path):
+    cache = JobListingCache(db_path=os.path.join(tmp_path, "missing", "cache.sqlite3"))
+    assert cache.get("Backend Developer", "India", lambda: JOBS) == JOBS
+    assert cache.get("backend  developer", "india", lambda: []) == JOBS
+    snapshot = cache.snapshot()
+    assert snapshot["disk_tier"] is False
+    assert snapshot["hits"] == 1 and snapshot["store_failures"] == 0
+
+
+def test_database_is_opened_lazily_and_survives_restart(tmp_path):
+    path = os.path.join(tmp_path, "cache.sqlite3")
+    cache = JobListingCache(db_path=path)
+    assert not os.path.exists(path)
+    cache.get("Data Scientist", "India", lambda: JOBS)
+    restarted = JobListingCache(db_path=path)
+    assert restarted.get("Data Scientist", "India", lambda: []) == JOBS
+    assert restarted.snapshot()["disk_hits"] == 1
+
+
+def test_empty_listings_expire_quickly_and_are_never_served_stale():
+    clock = Clock()
+    cache = JobListingCache(ttl=3600, max_stale=86400, empty_ttl=60, clock=clock)
+    assert cache.get("QA Engineer", "India", lambda: []) == []
+    clock.now += 30
+    assert cache.get("QA Engineer", "India", lambda: JOBS) == []
+    clock.now += 60
+    # Past empty_ttl the caller waits for the upstream instead of getting [] again.
+    assert cache.get("QA Engineer", "India", lambda: JOBS) == JOBS
+    clock.now += 600
+    assert cache.get("QA Engineer", "India", lambda: []) == JOBS
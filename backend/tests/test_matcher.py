@@ -0,0 +1,55 @@
+import threading
+
+import numpy as np
+import pytest
+
+import matcher
+
+sklearn = pytest.importorskip("sklearn")
+
+
+def test_binary_classifier_without_predict_proba_ranks_both_classes(monkeypatch):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.svm import LinearSVC
+
+    texts = ["python pandas numpy statistics", "react css html javascript"] * 5
+    labels = ["Data Scientist", "Frontend Developer"] * 5
+    vectorizer = TfidfVectorizer().fit(texts)
+    model = LinearSVC().fit(vectorizer.transform(texts), labels)
+    assert not hasattr(model, "predict_proba")
+    monkeypatch.setattr(matcher, "load_role_model", lambda: (model, vectorizer))
+
+    ranked = matcher.predict_job_roles(["numpy pandas python", "html css react"], k=2)
+    assert [r[0]["role"] for r in ranked] == ["Data Scientist", "Frontend Developer"]
+    for roles in ranked:
+        assert roles[0]["probability"] > 0.5 > roles[1]["probability"]
+        assert sum(r["probability"] for r in roles) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_skill_matrix_encode_does_not_block_cached_resume_embeddings(monkeypatch):
+    release = threading.Event()
+    encoding = threading.Event()
+
+    def slow_embed(texts):
+        texts = list(texts)
+        if len(texts) > 1:  # the taxonomy
+            encoding.set()
+            release.wait(5)
+        return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+    monkeypatch.setattr(matcher, "embed_texts", slow_embed)
+    monkeypatch.setattr(matcher, "_skill_matrix", None)
+    monkeypatch.setattr(matcher, "_resume_embeddings", type(matcher._resume_embeddings)())
+    matcher.embed_resume("cached resume")
+
+    builder = threading.Thread(target=matcher.skill_embedding_matrix)
+    builder.start()
+    assert encoding.wait(5)
+    hit = threading.Thread(target=matcher.embed_resume, args=("cached resume",))
+    hit.start()
+    hit.join(1)
+    finished_during_encode = not hit.is_alive()
+    release.set()
+    builder.join(5)
+    assert finished_during_encode
+    assert matcher.skill_embedding_matrix()[1].shape[1] == 4
@@ -0,0 +1,38 @@
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+import pdf_extractor
+from corpus import make_text_pdf, synthetic_paginated_resume
+from prompt_compactor import compact_resume_text
+
+LONG_PDF = make_text_pdf(synthetic_paginated_resume(seed=3, pages=12, filler_lines=15), lines_per_page=20)
+
+
+def _split_extraction(data, target, head_pages=4, workers=3):
+    """What main._extract_pages_in_parallel does, without the process pool."""
+    head, total = pdf_extractor.extract_page_range(data, 0, head_pages, target_chars=target)
+    ranges = pdf_extractor.split_pages(head_pages, total, workers)
+    parts = [pdf_extractor.extract_page_range(data, first, end, target_chars=target)[0] for first, end in ranges]
+    return pdf_extractor.join_pages([head, *parts], target)
+
+
+def test_split_extraction_stops_where_sequential_does():
+    full = pdf_extractor.extract_text(LONG_PDF, max_pages=0, target_chars=0)
+    pages = full.count("\f")
+    assert pages > 8  # a head of 4 pages plus three split ranges
+    # Cut-offs inside the head, inside each split range, and none at all.
+    for target in (100, len(full) // 3, len(full) // 2, 2 * len(full) // 3, 0):
+        sequential = pdf_extractor.extract_text(LONG_PDF, max_pages=0, target_chars=target)
+        assert _split_extraction(LONG_PDF, target) == sequential
+        assert sequential.count("\f") < pages if target else sequential == full
+
+
+def test_layout_none_keeps_line_breaks():
+    data = make_text_pdf("Jane Doe\nSKILLS\npython sql docker\nEXPERIENCE\nBuilt APIs")
+    text = pdf_extractor.extract_text(data, layout="none")
+    assert text.split("\n")[:5] == ["Jane Doe", "SKILLS", "python sql docker", "EXPERIENCE", "Built APIs"]
+    assert "python sql docker" in compact_resume_text(text)
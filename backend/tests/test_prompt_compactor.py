@@ -0,0 +1,20 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_compactor import CHARS_PER_TOKEN, compact_resume_text
+
+
+def test_single_long_line_is_truncated_not_dropped():
+    out = compact_resume_text("x" * 40000, token_budget=1000)
+    assert out == "x" * (1000 * CHARS_PER_TOKEN - 1)
+
+
+def test_long_section_line_keeps_the_words_that_fit():
+    out = compact_resume_text("Name\nSKILLS\n" + "python " * 8000, token_budget=100)
+    lines = out.split("\n")
+    assert lines[:2] == ["Name", "SKILLS"]
+    assert lines[2].startswith("python python")
+    assert lines[2].split(" ")[-1] == "python"
+    assert len(out) <= 100 * CHARS_PER_TOKEN
@@ -0,0 +1,30 @@
+import report_generator
+
+ANALYSIS = {
+    "filename": "jane.pdf",
+    "predicted_role": "Data Scientist",
+    "ats_score": 72,
+    "matched_skills": ["python", "sql"],
+    "missing_skills": ["spark"],
+}
+
+
+def test_report_revalidation_returns_304_without_rendering(client, monkeypatch):
+    first = client.post("/report", json=ANALYSIS)
+    assert first.status_code == 200
+    assert first.content.startswith(b"%PDF")
+    etag = first.headers["etag"]
+
+    def no_render(*args, **kwargs):
+        raise AssertionError("a matching If-None-Match must not render the report")
+
+    monkeypatch.setattr(report_generator, "cached_pdf_report", no_render)
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        again = client.post("/report", json=ANALYSIS, headers={"If-None-Match": header})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+    monkeypatch.undo()
+
+    changed = client.post("/report", json={**ANALYSIS, "ats_score": 40}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
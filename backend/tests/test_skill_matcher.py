@@ -0,0 +1,29 @@
+"""Skill matching: token boundaries, synonyms and plural forms."""
+import matcher
+import parser as resume_parser
+from skill_matcher import SkillMatcher, taxonomy_matcher
+
+
+def test_plurals_match_their_singular_skill():
+    found = taxonomy_matcher().find("Designed REST APIs and fine-tuned LLMs on Docker containers")
+    assert {"rest", "api", "llm", "docker"} <= set(found)
+
+
+def test_skills_ending_in_s_are_not_singularized():
+    found = taxonomy_matcher().find("Deployed on AWS with Pandas and Kubernetes")
+    assert {"aws", "pandas", "kubernetes"} <= set(found)
+
+
+def test_token_boundaries_still_hold():
+    m = SkillMatcher(["java", "c", "api"])
+    assert m.find("JavaScript and React, CS degree") == []
+    assert m.find("Java and C") == ["java", "c"]
+
+
+def test_synonyms_map_to_canonical_skill():
+    assert "node" in taxonomy_matcher().find("Backend in Node.js / NodeJS")
+
+
+def test_parser_and_matcher_use_the_taxonomy():
+    assert "kubernetes" in resume_parser.extract_skills("Ran services on k8s clusters")
+    assert {"kubernetes", "microservices", "api"} <= set(matcher.COMMON_SKILLS)
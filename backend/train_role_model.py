@@ -1,6 +1,40 @@
+"""
+Train the role classifier behind matcher.predict_job_role.
+
+Labeled resumes are streamed in chunks, vectorized with a stateless HashingVectorizer
+and fed to SGDClassifier.partial_fit, so memory stays flat however large the corpus.
+Each run writes a new versioned artifact (models/role_model-vNNNN.joblib) bundling
+the model, the vectorizer and training metadata; --update continues training the
+newest artifact on new data instead of starting over.
+
+Usage (from backend/):
+    python train_role_model.py                                  # built-in examples
+    python train_role_model.py --jsonl labeled.jsonl            # {"text": ..., "role": ...} per line
+    python train_role_model.py --mongo --text-field resume_text --label-field predicted_role
+    python train_role_model.py --jsonl new.jsonl --update
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator
+
 import joblib
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from matcher import ROLE_MODEL_DIR, role_artifact_path, role_artifact_versions
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 # Simple training dataset (you can expand this)
 training_data = [
@@ -21,17 +55,176 @@ training_data = [
     ("cloud deployment terraform aws pipeline monitoring", "DevOps Engineer"),
 ]
 
-texts = [x[0] for x in training_data]
-labels = [x[1] for x in training_data]
+Example = tuple[str, str]
+
+
+def make_vectorizer(n_features: int = 2**20) -> HashingVectorizer:
+    # Stateless: nothing is fitted, so chunks (and workers) never share a vocabulary.
+    return HashingVectorizer(
+        n_features=n_features,
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm="l2",
+        dtype=np.float32,
+    )
+
+
+def iter_jsonl(path: str, text_field: str = "text", label_field: str = "role") -> Iterator[Example]:
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            text, label = row.get(text_field), row.get(label_field)
+            if text and label:
+                yield str(text), str(label)
+
+
+def iter_mongo(text_field: str = "resume_text", label_field: str = "predicted_role", batch_size: int = 10_000) -> Iterator[Example]:
+    import database
+
+    query = {text_field: {"$exists": True, "$ne": ""}, label_field: {"$exists": True, "$ne": ""}}
+    cursor = database.get_collection().find(query, {text_field: 1, label_field: 1, "_id": 0}).batch_size(batch_size)
+    for row in cursor:
+        yield str(row[text_field]), str(row[label_field])
+
+
+def chunked(examples: Iterable[Example], size: int) -> Iterator[list[Example]]:
+    it = iter(examples)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def collect_labels(examples: Iterable[Example]) -> list[str]:
+    """One streaming pass for the label set (partial_fit needs every class up front)."""
+    return sorted({label for _, label in examples})
+
+
+def train(
+    source: Callable[[], Iterable[Example]],
+    classes: list[str],
+    model: SGDClassifier | None = None,
+    vectorizer: HashingVectorizer | None = None,
+    chunk_size: int = 10_000,
+    epochs: int = 1,
+    seed: int = 0,
+) -> tuple[SGDClassifier, HashingVectorizer, dict]:
+    """Stream ``source()`` through partial_fit ``epochs`` times; returns (model, vectorizer, stats)."""
+    vectorizer = vectorizer or make_vectorizer()
+    if model is None:
+        model = SGDClassifier(loss="log_loss", alpha=1e-6, random_state=seed)
+        fit_classes = np.array(classes)
+    else:
+        unknown = set(classes) - set(model.classes_)
+        if unknown:
+            raise ValueError(f"--update cannot add new roles {sorted(unknown)}; retrain from scratch.")
+        fit_classes = None
+    rng = np.random.default_rng(seed)
+    docs = correct = scored = 0
+    started = time.perf_counter()
+    for _ in range(epochs):
+        for chunk in chunked(source(), chunk_size):
+            # Streams are often grouped by role; shuffle within the chunk for SGD.
+            order = rng.permutation(len(chunk))
+            texts = [chunk[i][0] for i in order]
+            labels = np.array([chunk[i][1] for i in order])
+            X = vectorizer.transform(texts)
+            if hasattr(model, "classes_"):
+                # Progressive validation: score each chunk before learning from it.
+                correct += int((model.predict(X) == labels).sum())
+                scored += len(labels)
+            model.partial_fit(X, labels, classes=fit_classes)
+            fit_classes = None
+            docs += len(labels)
+    elapsed = time.perf_counter() - started
+    stats = {
+        "docs": docs,
+        "seconds": round(elapsed, 2),
+        "docs_per_second": round(docs / elapsed) if elapsed else 0,
+        "progressive_accuracy": round(correct / scored, 4) if scored else None,
+    }
+    return model, vectorizer, stats
+
+
+def save_artifact(model, vectorizer, metadata: dict, directory: str = ROLE_MODEL_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    versions = role_artifact_versions(directory)
+    version = (versions[-1] if versions else 0) + 1
+    path = role_artifact_path(version, directory)
+    artifact = {
+        **metadata,
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "classes": [str(c) for c in model.classes_],
+        "model": model,
+        "vectorizer": vectorizer,
+    }
+    tmp = path + ".tmp"
+    joblib.dump(artifact, tmp, compress=3)
+    os.replace(tmp, path)
+    return path
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the role classifier (streaming, incremental).")
+    parser.add_argument("--jsonl", help="labeled resumes, one JSON object per line")
+    parser.add_argument("--mongo", action="store_true", help="stream labeled profiles from the candidates collection")
+    parser.add_argument("--text-field", default=None, help="default: text (JSONL) / resume_text (Mongo)")
+    parser.add_argument("--label-field", default=None, help="default: role (JSONL) / predicted_role (Mongo)")
+    parser.add_argument("--classes", help="comma-separated roles; skips the label pass")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--epochs", type=int, default=None)
+    parser.add_argument("--update", action="store_true", help="continue training the newest artifact")
+    parser.add_argument("--out-dir", default=ROLE_MODEL_DIR)
+    args = parser.parse_args()
+
+    if args.jsonl:
+        text_field, label_field = args.text_field or "text", args.label_field or "role"
+        source = lambda: iter_jsonl(args.jsonl, text_field, label_field)
+        origin = f"jsonl:{os.path.basename(args.jsonl)}"
+    elif args.mongo:
+        text_field, label_field = args.text_field or "resume_text", args.label_field or "predicted_role"
+        source = lambda: iter_mongo(text_field, label_field, args.chunk_size)
+        origin = "mongo:candidates"
+    else:
+        source = lambda: iter(training_data)
+        origin = "built-in examples"
+    # Eight built-in examples need many passes; real corpora need one or a few.
+    epochs = args.epochs or (1 if args.jsonl or args.mongo else 50)
 
-vectorizer = TfidfVectorizer()
-X = vectorizer.fit_transform(texts)
+    model = vectorizer = None
+    parent = None
+    if args.update:
+        versions = role_artifact_versions(args.out_dir)
+        if not versions:
+            parser.error(f"--update: no role_model-v*.joblib in {args.out_dir}")
+        base = joblib.load(role_artifact_path(versions[-1], args.out_dir))
+        model, vectorizer, parent = base["model"], base["vectorizer"], base["version"]
 
-model = LogisticRegression()
-model.fit(X, labels)
+    classes = [c.strip() for c in args.classes.split(",") if c.strip()] if args.classes else collect_labels(source())
+    if not classes:
+        parser.error("no labeled examples found")
+    model, vectorizer, stats = train(source, classes, model, vectorizer, args.chunk_size, epochs)
+    path = save_artifact(
+        model,
+        vectorizer,
+        {"parent": parent, "source": origin, "epochs": epochs, "training": stats},
+        args.out_dir,
+    )
+    print(
+        f"✅ Role prediction model trained and saved: {path}\n"
+        f"   {stats['docs']:,} docs in {stats['seconds']}s ({stats['docs_per_second']:,} docs/s), "
+        f"progressive accuracy {stats['progressive_accuracy']}, peak RSS {peak_rss_mb()} MB"
+    )
 
-# Save model and vectorizer
-joblib.dump(model, "role_model.pkl")
-joblib.dump(vectorizer, "role_vectorizer.pkl")
 
-print("✅ Role prediction model trained and saved!")
+if __name__ == "__main__":
+    main()